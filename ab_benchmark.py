@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Interleaved A/B Benchmark for AI Food Ordering Deployments
+Compares two deployments (e.g. production and a preview) in one run. Each
+step of the suite's read-only request plan is sent to both base URLs back
+to back, in random order, so network drift hits both sides equally. Each
+pair yields a latency difference; the report gives per-route mean
+differences and B/A latency ratios with 95% confidence intervals, plus
+any status code mismatches between the deployments.
+
+Usage:
+    python3 ab_benchmark.py https://ai-food-ordering-poc.vercel.app https://preview.vercel.app
+    python3 ab_benchmark.py A_URL B_URL --rounds 10 --by endpoint
+"""
+
+import argparse
+import json
+import math
+import random
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from comprehensive_test_suite import (DEFAULT_DEADLINE, RUN_ID, Colors, build_request_plan, print_header,
+                                      route_key, send_request)
+from transports import make_client
+
+RESULTS_FILE = f"ab_benchmark_{RUN_ID}.json"
+
+# Two-sided 95% Student t quantiles by degrees of freedom; larger samples use the normal value
+T_95 = (12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+        2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+        2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042)
+Z_95 = 1.96
+
+def t_quantile(df: int) -> float:
+    return T_95[df - 1] if df <= len(T_95) else Z_95
+
+def mean_ci(values: List[float]) -> Tuple[float, Optional[float], Optional[float]]:
+    """Mean and its 95% t confidence interval (None bounds below two samples)"""
+    mean = statistics.fmean(values)
+    if len(values) < 2:
+        return mean, None, None
+    margin = t_quantile(len(values) - 1) * statistics.stdev(values) / math.sqrt(len(values))
+    return mean, mean - margin, mean + margin
+
+def timed_request(client, url: str, timeout: float) -> Tuple[float, int, bool]:
+    """GET url; return (latency, status code, ok)"""
+    start_time = time.perf_counter()
+    status_code, _, error = send_request("GET", url, timeout=timeout, session=client)
+    return time.perf_counter() - start_time, status_code, error is None and status_code == 200
+
+def run_pair(clients: Dict[str, object], bases: Dict[str, str], endpoint: str, timeout: float) -> Dict:
+    """Send one plan step to both deployments back to back, in random order"""
+    order = ['A', 'B']
+    random.shuffle(order)
+    sample = {'endpoint': endpoint, 'first': order[0]}
+    for side in order:
+        latency, status_code, ok = timed_request(clients[side], f"{bases[side]}{endpoint}", timeout)
+        sample[side] = {'latency': latency, 'status_code': status_code, 'ok': ok}
+    return sample
+
+def compare(samples: List[Dict], by: str) -> Dict[str, Dict]:
+    """Paired differences (B - A) and B/A ratios per route or endpoint"""
+    groups = {}
+    for sample in samples:
+        key = route_key(sample['endpoint']) if by == 'route' else sample['endpoint']
+        groups.setdefault(key, []).append(sample)
+    comparison = {}
+    for key, group in sorted(groups.items()):
+        paired = [s for s in group if s['A']['ok'] and s['B']['ok']]
+        row = {
+            'pairs': len(group),
+            'paired': len(paired),
+            'errors_a': sum(not s['A']['ok'] for s in group),
+            'errors_b': sum(not s['B']['ok'] for s in group),
+            'status_mismatches': sum(s['A']['status_code'] != s['B']['status_code'] for s in group),
+        }
+        if paired:
+            diffs = [s['B']['latency'] - s['A']['latency'] for s in paired]
+            # Latency is skewed, so the ratio is estimated on the log scale (geometric mean)
+            log_ratios = [math.log(s['B']['latency'] / s['A']['latency']) for s in paired]
+            diff, diff_low, diff_high = mean_ci(diffs)
+            log_ratio, log_low, log_high = mean_ci(log_ratios)
+            row.update({
+                'median_a': statistics.median(s['A']['latency'] for s in paired),
+                'median_b': statistics.median(s['B']['latency'] for s in paired),
+                'mean_diff': diff,
+                'diff_ci': [diff_low, diff_high],
+                'ratio': math.exp(log_ratio),
+                'ratio_ci': [math.exp(log_low), math.exp(log_high)] if log_low is not None else [None, None],
+            })
+            row['verdict'] = verdict(row['ratio_ci'])
+        comparison[key] = row
+    return comparison
+
+def verdict(ratio_ci: List[Optional[float]]) -> str:
+    low, high = ratio_ci
+    if low is None:
+        return 'too few pairs'
+    if low > 1:
+        return 'B slower'
+    if high < 1:
+        return 'B faster'
+    return 'no difference'
+
+def _ms(value) -> str:
+    return f"{value * 1000:+.0f}" if value is not None else "N/A"
+
+def print_report(comparison: Dict[str, Dict], totals: Dict):
+    print_header("A/B COMPARISON (B vs A, 95% CI)", Colors.MAGENTA)
+    print(f"  {'route / endpoint':40} {'pairs':>5} {'A p50':>8} {'B p50':>8} "
+          f"{'Δ mean ms [CI]':>20} {'B/A [CI]':>20}  verdict")
+    for key, row in comparison.items():
+        if 'ratio' not in row:
+            print(f"  {key[:40]:40} {row['pairs']:>5} {Colors.RED}no successful pairs{Colors.NC}")
+            continue
+        low, high = row['ratio_ci']
+        ratio = f"{row['ratio']:.2f} [{low:.2f}, {high:.2f}]" if low is not None else f"{row['ratio']:.2f}"
+        diff = f"{_ms(row['mean_diff'])} [{_ms(row['diff_ci'][0])}, {_ms(row['diff_ci'][1])}]"
+        color = {'B slower': Colors.RED, 'B faster': Colors.GREEN}.get(row['verdict'], "")
+        print(f"  {key[:40]:40} {row['paired']:>5} {row['median_a'] * 1000:>6.0f}ms {row['median_b'] * 1000:>6.0f}ms "
+              f"{diff:>20} {ratio:>20}  {color}{row['verdict']}{Colors.NC if color else ''}")
+    print()
+    overall = totals.get('ratio')
+    if overall is not None:
+        low, high = totals['ratio_ci']
+        print(f"{Colors.BOLD}Overall B/A latency ratio: {overall:.3f} [{low:.3f}, {high:.3f}] "
+              f"over {totals['paired']} pairs ({totals['verdict']}){Colors.NC}")
+    print(f"Errors: A {totals['errors_a']}, B {totals['errors_b']}")
+    if totals['status_mismatches']:
+        print(f"{Colors.YELLOW}⚠️  {totals['status_mismatches']} pairs returned different status codes{Colors.NC}")
+
+def main(argv: List[str] = None):
+    """Compare two deployments with interleaved, paired requests"""
+    parser = argparse.ArgumentParser(description="Interleaved A/B latency comparison of two deployments")
+    parser.add_argument("base_a", help="Baseline base URL (A), e.g. production")
+    parser.add_argument("base_b", help="Candidate base URL (B), e.g. a preview deployment")
+    parser.add_argument("--rounds", type=int, default=5, help="Passes over the request plan (default: 5)")
+    parser.add_argument("--warmup", type=int, default=1,
+                        help="Unrecorded warm-up passes, so cold starts do not count (default: 1)")
+    parser.add_argument("--workers", type=int, default=4, help="Pairs in flight at once (default: 4)")
+    parser.add_argument("--by", choices=("route", "endpoint"), default="route",
+                        help="Group paired differences by route template or full endpoint (default: route)")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_DEADLINE,
+                        help=f"Per-request timeout (default: {DEFAULT_DEADLINE})")
+    args = parser.parse_args(argv)
+
+    bases = {'A': args.base_a.rstrip("/"), 'B': args.base_b.rstrip("/")}
+    clients = {side: make_client('http1', args.workers) for side in bases}
+    plan = [endpoint for _, endpoint in build_request_plan()]
+
+    print(f"{Colors.BOLD}{Colors.MAGENTA}")
+    print("=" * 70)
+    print("AI FOOD ORDERING - A/B DEPLOYMENT BENCHMARK".center(70))
+    print("=" * 70)
+    print(f"{Colors.NC}")
+    print(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"A: {bases['A']}")
+    print(f"B: {bases['B']}")
+    print(f"Plan: {len(plan)} requests x {args.rounds} rounds per deployment ({args.warmup} warm-up)")
+
+    samples = []
+    try:
+        with ThreadPoolExecutor(max_workers=args.workers) as pool:
+            for round_num in range(args.warmup + args.rounds):
+                steps = list(plan)
+                random.shuffle(steps)
+                results = list(pool.map(lambda endpoint: run_pair(clients, bases, endpoint, args.timeout), steps))
+                warmup = round_num < args.warmup
+                if not warmup:
+                    samples.extend(results)
+                failed = sum(not r['A']['ok'] for r in results), sum(not r['B']['ok'] for r in results)
+                label = "Warm-up" if warmup else f"Round {round_num - args.warmup + 1}"
+                print(f"  {label}: {len(results)} pairs, errors A {failed[0]} / B {failed[1]}")
+    except KeyboardInterrupt:
+        print(f"\n{Colors.YELLOW}⚠️  Benchmark interrupted by user{Colors.NC}")
+    finally:
+        for client in clients.values():
+            client.close()
+    if not samples:
+        return 2
+
+    comparison = compare(samples, args.by)
+    totals = compare([dict(s, endpoint='all') for s in samples], 'endpoint')['all']
+    print_report(comparison, totals)
+    with open(RESULTS_FILE, 'w') as f:
+        json.dump({"base_a": bases['A'], "base_b": bases['B'], "rounds": args.rounds, "by": args.by,
+                   "overall": totals, "comparison": comparison, "samples": samples}, f, indent=2)
+    print(f"\n{Colors.GREEN}✅ Results saved to: {RESULTS_FILE}{Colors.NC}\n")
+    return 1 if totals.get('verdict') == 'B slower' or totals['errors_b'] > totals['errors_a'] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
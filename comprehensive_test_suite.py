@@ -6,20 +6,105 @@ Can also serve as E2E demo scripts
 """
 
 import requests
+import argparse
+import cProfile
+import hashlib
+import io
 import json
+import os
+import pstats
+import random
+import re
+import threading
 import time
+import tracemalloc
+from array import array
+from collections import Counter
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 import sys
 
+from resource_sampler import ResourceSampler
+from tracing import Tracer, new_span_id, new_trace_id, record_http, traceparent
+from transports import TIMEOUT_ERRORS, TRANSPORTS, DeadlineExceeded, ProtocolStats, fetch, make_client
+
+# Optional fast JSON decoders; the stdlib json module is always available
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import simdjson
+except ImportError:
+    simdjson = None
+
 # Configuration
 API_BASE = "https://ai-food-ordering-poc.vercel.app"
-RESULTS_FILE = f"test_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-SUMMARY_FILE = f"test_summary_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
+RUN_ID = datetime.now().strftime('%Y%m%d_%H%M%S')
+RESULTS_FILE = f"test_results_{RUN_ID}.json"
+SUMMARY_FILE = f"test_summary_{RUN_ID}.txt"
+PAYLOADS_FILE = f"test_payloads_{RUN_ID}.jsonl"
+PROFILE_FILE = f"test_profile_{RUN_ID}.pstats"
+PROFILE_SUMMARY_FILE = f"test_profile_{RUN_ID}.txt"
+TRACES_FILE = f"test_traces_{RUN_ID}.json"
 
 # Test data
 CITIES = ["San Francisco", "New York", "Los Angeles", "Chicago", "Bangalore"]
 CUISINES = ["Chinese", "Indian", "Italian", "Japanese", "Korean", "Mediterranean", "Mexican", "Thai"]
+# Key restaurants for menu tests (one from each city)
+MENU_RESTAURANTS = [
+    ("rest_001", "Taj Palace (San Francisco)"),
+    ("rest_012", "Manhattan Tandoor (New York)"),
+    ("rest_016", "Chicago Deep Dish Co (Chicago)"),
+    ("rest_014", "LA Sushi Bar (Los Angeles)"),
+    ("rest_009", "Spice Garden (Bangalore)"),
+    ("rest_020", "Bangalore Wok (Bangalore)"),
+    ("rest_032", "Bollywood Bites LA (Los Angeles)"),
+]
+DISH_QUERIES = [
+    "Chicken Tikka Masala",
+    "Pad Thai",
+    "Sushi",
+    "Pizza",
+    "Tacos",
+    "Biryani",
+    "Dumplings",
+    "Noodles",
+    "Curry",
+    "Burger"
+]
+
+# Per-endpoint deadlines (seconds), keyed by route template (see route_key);
+# each is a total wall-clock budget for the request, body included
+DEFAULT_DEADLINE = 120
+ENDPOINT_DEADLINES = {
+    "/api/v1/search/intelligent": 30,
+}
+
+# Hedged requests: routes eligible for a duplicate request once the first
+# attempt has been outstanding longer than the route's observed p95
+HEDGE_ROUTES = {"/api/v1/search/intelligent"}
+HEDGE_PERCENTILE = 95
+HEDGE_MIN_SAMPLES = 10
+
+# JSON decoding: backend name -> loads function (bytes in, Python objects out)
+JSON_BACKENDS = {'json': json.loads}
+if simdjson:
+    JSON_BACKENDS['simdjson'] = simdjson.loads
+if orjson:
+    JSON_BACKENDS['orjson'] = orjson.loads
+JSON_BACKEND = 'orjson' if orjson else 'simdjson' if simdjson else 'json'
+# Lazy mode only materializes the top-level fields a validator declares (needs simdjson);
+# error fields are always kept so failures show the server's message
+LAZY_JSON = False
+LAZY_ERROR_FIELDS = ('error', 'detail')
+
+# Pooled HTTP client from transports.make_client(); None opens a new connection per request
+TRANSPORT = None
+CLIENT = None
+POOL_SIZE = 10
 
 # Colors for terminal output
 class Colors:
@@ -32,22 +117,98 @@ class Colors:
     NC = '\033[0m'  # No Color
     BOLD = '\033[1m'
 
+class TestRecord:
+    """Compact result of one test; the response payload is stored out of line"""
+    __slots__ = ('test_num', 'test_name', 'category', 'method', 'endpoint', 'status', 'http_status',
+                 'started_at', 'response_time', 'decode_time', 'response_bytes', 'result_count', 'order_id',
+                 'spec_hash', 'carried_from', 'trace_id')
+
+    def __init__(self, test_num: int, test_name: str, category: str, method: str, endpoint: str,
+                 status: str, http_status: int, started_at: float, response_time: float,
+                 decode_time: float, response_bytes: int,
+                 result_count: Optional[int] = None, order_id: Optional[str] = None,
+                 spec_hash: Optional[str] = None, carried_from: Optional[str] = None,
+                 trace_id: Optional[str] = None):
+        self.test_num = test_num
+        # Names and endpoints repeat across soak iterations, so share one copy
+        self.test_name = sys.intern(test_name)
+        self.category = sys.intern(category)
+        self.method = sys.intern(method)
+        self.endpoint = sys.intern(endpoint)
+        self.status = sys.intern(status)
+        self.started_at = started_at
+        self.http_status = http_status
+        self.response_time = response_time
+        self.decode_time = decode_time
+        self.response_bytes = response_bytes
+        self.result_count = result_count
+        self.order_id = order_id
+        self.spec_hash = spec_hash
+        # Run id a carried-forward result was measured in (None when measured in this run)
+        self.carried_from = carried_from
+        # W3C trace id sent in the traceparent header, for joining with server logs
+        self.trace_id = trace_id
+
+    def to_dict(self) -> Dict:
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+class PayloadStore:
+    """Keeps response payloads out of line: in memory, streamed to a JSONL file, or dropped"""
+    MODES = ('memory', 'file', 'none')
+
+    def __init__(self, mode: str = 'memory', path: str = PAYLOADS_FILE):
+        self.mode = mode
+        self.path = path
+        self._payloads = {}
+        self._file = None
+
+    def put(self, test_num: int, payload):
+        if self.mode == 'memory':
+            self._payloads[test_num] = payload
+        elif self.mode == 'file':
+            if self._file is None:
+                self._file = open(self.path, 'w')
+            self._file.write(json.dumps({'test_num': test_num, 'response_data': payload}) + '\n')
+
+    def get(self, test_num: int):
+        return self._payloads.get(test_num)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
 class TestResults:
     def __init__(self):
         self.tests = []
         self.total = 0
         self.passed = 0
         self.failed = 0
-        self.response_times = []
+        self.category = ""
+        self.response_times = array('d')
+        self.decode_times = array('d')
+        self.payloads = PayloadStore()
         
-    def add_test(self, test_data: Dict):
-        self.tests.append(test_data)
+    def add_test(self, record: TestRecord, response_data=None):
+        self.tests.append(record)
         self.total += 1
-        if test_data['status'] == 'PASS':
+        if record.status == 'PASS':
             self.passed += 1
         else:
             self.failed += 1
-        self.response_times.append(test_data['response_time'])
+        # Carried-forward results were timed in an earlier run
+        if record.carried_from is None:
+            self.response_times.append(record.response_time)
+            self.decode_times.append(record.decode_time)
+        self.payloads.put(record.test_num, response_data)
+    
+    def test_dicts(self):
+        """Yield each test as a dict, with its payload when kept in memory"""
+        for record in self.tests:
+            test_data = record.to_dict()
+            if self.payloads.mode == 'memory':
+                test_data['response_data'] = self.payloads.get(record.test_num)
+            yield test_data
     
     def get_summary(self) -> Dict:
         return {
@@ -57,10 +218,275 @@ class TestResults:
             'pass_rate': f"{(self.passed/self.total*100):.2f}%" if self.total > 0 else "0%",
             'avg_response_time': f"{sum(self.response_times)/len(self.response_times):.3f}s" if self.response_times else "N/A",
             'min_response_time': f"{min(self.response_times):.3f}s" if self.response_times else "N/A",
-            'max_response_time': f"{max(self.response_times):.3f}s" if self.response_times else "N/A"
+            'max_response_time': f"{max(self.response_times):.3f}s" if self.response_times else "N/A",
+            'json_backend': json_decoder_label(),
+            'total_decode_time': f"{sum(self.decode_times)*1000:.2f}ms",
+            'avg_decode_time': f"{sum(self.decode_times)/len(self.decode_times)*1000:.3f}ms" if self.decode_times else "N/A"
         }
 
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Return the pct-th percentile (linear interpolation) of values"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+class Hedger:
+    """Sends a duplicate request when the first attempt exceeds the route's p95"""
+
+    def __init__(self):
+        self.enabled = False
+        self.latencies = {}  # route -> observed latencies (the winning attempt's)
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.primary_latencies = {}  # route -> latency the first attempt took
+        self.saved = []
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="hedge")
+
+    def observe(self, route: str, latency: float, hedgeable: bool = False):
+        """Record a request's latency; send() records primary attempts of hedgeable ones itself"""
+        with self._lock:
+            self.latencies.setdefault(route, []).append(latency)
+            if not hedgeable:
+                self.primary_latencies.setdefault(route, []).append(latency)
+
+    def hedge_delay(self, route: str) -> Optional[float]:
+        """Delay before hedging, or None while the route is still warming up
+        
+        Based on primary attempts only: hedge wins are faster by design and
+        would pull the threshold down, making hedging ever more aggressive.
+        """
+        with self._lock:
+            samples = self.primary_latencies.get(route, [])
+            if len(samples) < HEDGE_MIN_SAMPLES:
+                return None
+            return percentile(samples, HEDGE_PERCENTILE)
+
+    def send(self, route: str, delay: float, deadline: float, attempt):
+        """Run attempt(budget), hedging after delay, within deadline seconds overall
+        
+        The first successful response wins; an error or 5xx is returned only
+        when both attempts fail. Primaries that run out of time are recorded
+        at the deadline, so the route's p95 is not biased low by dropping them.
+        """
+        start_time = time.time()
+        primary = self._pool.submit(self._timed, attempt, deadline, start_time)
+        with self._lock:
+            self.requests += 1
+        done, _ = wait([primary], timeout=min(delay, deadline))
+        if done or delay >= deadline:
+            # No time left to hedge; the attempt enforces its own deadline
+            elapsed, result = primary.result()
+            self._record_primary(route, elapsed, deadline)
+            return result
+
+        hedge = self._pool.submit(self._timed, attempt, deadline - (time.time() - start_time), start_time)
+        with self._lock:
+            self.hedged += 1
+        finished, pending, winner = [], {primary, hedge}, None
+        while pending and winner is None:
+            remaining = deadline - (time.time() - start_time)
+            done, pending = wait(pending, timeout=max(remaining, 0), return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            finished.extend(f for f in (primary, hedge) if f in done)
+            winner = next((f for f in finished if self._succeeded(f.result()[1])), None)
+        if winner is None and finished:
+            winner = finished[0]
+        hedge_won = winner is hedge and self._succeeded(hedge.result()[1])
+        if hedge_won:
+            with self._lock:
+                self.hedge_wins += 1
+        # Runs now if the primary is done, otherwise when it finishes (by its deadline)
+        primary.add_done_callback(lambda f: self._record_primary(
+            route, f.result()[0], deadline, hedge.result()[0] if hedge_won else None))
+        if winner is None:
+            return 504, b'', {"error": "Deadline exceeded"}
+        return winner.result()[1]
+
+    @staticmethod
+    def _timed(attempt, budget: float, start_time: float) -> Tuple[float, Tuple]:
+        result = attempt(budget)
+        return time.time() - start_time, result
+
+    @staticmethod
+    def _succeeded(result: Tuple) -> bool:
+        status_code, _, error = result
+        return error is None and status_code < 500
+
+    def _record_primary(self, route: str, latency: float, deadline: float, winner_time: float = None):
+        # A primary that timed out is censored at the deadline
+        latency = min(latency, deadline)
+        with self._lock:
+            self.primary_latencies.setdefault(route, []).append(latency)
+            if winner_time is not None:
+                self.saved.append(latency - winner_time)
+
+    def get_summary(self) -> Dict:
+        with self._lock:
+            summary = {
+                'hedged_requests': self.requests,
+                'hedges_sent': self.hedged,
+                'hedge_rate': f"{(self.hedged/self.requests*100):.2f}%" if self.requests else "0%",
+                'hedge_wins': self.hedge_wins,
+                'avg_latency_saved': f"{sum(self.saved)/len(self.saved):.3f}s" if self.saved else "N/A",
+                'routes': {}
+            }
+            for route, observed in self.latencies.items():
+                unhedged = self.primary_latencies.get(route, [])
+                route_summary = {}
+                for pct in (95, 99):
+                    hedged_p = percentile(observed, pct)
+                    unhedged_p = percentile(unhedged, pct)
+                    route_summary[f'p{pct}'] = f"{hedged_p:.3f}s"
+                    route_summary[f'p{pct}_unhedged'] = f"{unhedged_p:.3f}s" if unhedged_p is not None else "N/A"
+                summary['routes'][route] = route_summary
+            return summary
+
+class PhaseProfiler:
+    """Attributes client wall time, CPU and allocations to the phases of run_test()"""
+    PHASES = ('request', 'decode', 'validate', 'record', 'print')
+
+    def __init__(self):
+        self.enabled = False
+        self.stats = {name: {'calls': 0, 'wall': 0.0, 'cpu': 0.0, 'net_alloc': 0, 'peak_alloc': 0}
+                      for name in self.PHASES}
+        self.profile = None
+        self.start_snapshot = None
+        self.started = None
+
+    @contextmanager
+    def phase(self, name: str):
+        if not self.enabled:
+            yield
+            return
+        # CPU is the calling thread's; hedged attempts run on pool threads
+        tracemalloc.reset_peak()
+        alloc_start = tracemalloc.get_traced_memory()[0]
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            yield
+        finally:
+            cpu = time.thread_time() - cpu_start
+            wall = time.perf_counter() - wall_start
+            current, peak = tracemalloc.get_traced_memory()
+            stats = self.stats[name]
+            stats['calls'] += 1
+            stats['wall'] += wall
+            stats['cpu'] += cpu
+            stats['net_alloc'] += current - alloc_start
+            stats['peak_alloc'] = max(stats['peak_alloc'], peak - alloc_start)
+
+    def start(self):
+        self.enabled = True
+        tracemalloc.start()
+        self.start_snapshot = tracemalloc.take_snapshot()
+        self.started = (time.perf_counter(), time.process_time())
+        self.profile = cProfile.Profile()
+        self.profile.enable()
+
+    def finish(self, top_n: int) -> str:
+        """Stop profiling, write the pstats file and return the text summary"""
+        self.profile.disable()
+        wall = time.perf_counter() - self.started[0]
+        cpu = time.process_time() - self.started[1]
+        end_snapshot = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        self.enabled = False
+        self.profile.dump_stats(PROFILE_FILE)
+
+        out = io.StringIO()
+        out.write(f"Run: {wall:.2f}s wall, {cpu:.2f}s client CPU ({cpu/wall*100 if wall else 0:.1f}% of one core)\n\n")
+        out.write(f"{'phase':10} {'calls':>6} {'wall':>10} {'cpu':>10} {'cpu %':>7} {'net alloc':>11} {'peak alloc':>11}\n")
+        for name, stats in self.stats.items():
+            out.write(f"{name:10} {stats['calls']:6d} {stats['wall']:9.3f}s {stats['cpu']:9.3f}s "
+                      f"{stats['cpu']/cpu*100 if cpu else 0:6.1f}% {stats['net_alloc']/1024:9.1f}KB "
+                      f"{stats['peak_alloc']/1024:9.1f}KB\n")
+        out.write(f"\nTop {top_n} functions by cumulative time (main thread):\n")
+        pstats.Stats(self.profile, stream=out).sort_stats('cumulative').print_stats(top_n)
+        out.write(f"Top {top_n} allocation sites (retained since start):\n")
+        for stat in end_snapshot.compare_to(self.start_snapshot, 'lineno')[:top_n]:
+            out.write(f"  {stat}\n")
+        return out.getvalue()
+
+def spec_hash(method: str, endpoint: str, data: Dict = None, expected_status: int = 200,
+              validate_func=None) -> str:
+    """Short hash of a test definition; a different hash means the test changed"""
+    spec = [method, endpoint, data, expected_status, getattr(validate_func, '__name__', None)]
+    return hashlib.sha1(json.dumps(spec, sort_keys=True).encode()).hexdigest()[:12]
+
+class Rerun:
+    """Incremental re-run: carries unchanged passing tests forward from a previous results file"""
+    REASONS = ('new', 'failed', 'changed', 'sample', 'carried')
+
+    def __init__(self):
+        self.source = None
+        self.run_id = None
+        self.sample_rate = 0.0
+        self.previous = {}   # (category, test name) -> test dict from the previous run
+        self.decisions = {}  # (category, test name) -> reason
+
+    @property
+    def enabled(self) -> bool:
+        return self.source is not None
+
+    def load(self, path: str, sample_rate: float):
+        with open(path) as f:
+            tests = json.load(f)['tests']
+        self.previous = {(test.get('category'), test['test_name']): test for test in tests}
+        self.source = path
+        match = re.search(r'(\d{8}_\d{6})', os.path.basename(path))
+        self.run_id = match.group(1) if match else path
+        self.sample_rate = sample_rate
+
+    def reason(self, category: str, test_name: str, spec: str) -> str:
+        """Why a test runs again ('new', 'failed', 'changed', 'sample'), or 'carried' if it does not"""
+        key = (category, test_name)
+        if key not in self.decisions:
+            previous = self.previous.get(key)
+            if previous is None:
+                reason = 'new'
+            elif previous['status'] != 'PASS':
+                reason = 'failed'
+            elif previous.get('spec_hash') != spec:
+                reason = 'changed'
+            elif random.random() < self.sample_rate:
+                # Re-check a share of passing tests so drift in the API is still noticed
+                reason = 'sample'
+            else:
+                reason = 'carried'
+            self.decisions[key] = reason
+        return self.decisions[key]
+
+    def carry(self, test_num: int, category: str, test_name: str) -> Tuple[TestRecord, object]:
+        """Rebuild a previous passing result under a new test number"""
+        previous = self.previous[(category, test_name)]
+        record = TestRecord(test_num, test_name, category, previous['method'], previous['endpoint'],
+                            'PASS', previous['http_status'], previous.get('started_at'),
+                            previous['response_time'], previous.get('decode_time', 0.0),
+                            previous.get('response_bytes', 0), previous.get('result_count'),
+                            previous.get('order_id'), previous['spec_hash'],
+                            previous.get('carried_from') or self.run_id, previous.get('trace_id'))
+        return record, previous.get('response_data')
+
+    def get_summary(self) -> Dict:
+        counts = Counter(self.decisions.values())
+        return {'from': self.source, 'sample_rate': self.sample_rate,
+                **{reason: counts[reason] for reason in self.REASONS}}
+
 results = TestResults()
+hedger = Hedger()
+profiler = PhaseProfiler()
+sampler = ResourceSampler()
+rerun = Rerun()
+tracer = Tracer("comprehensive-test-suite")
+protocol_stats = ProtocolStats()
 
 def print_header(text: str, color=Colors.YELLOW):
     """Print a formatted header"""
@@ -68,98 +494,248 @@ def print_header(text: str, color=Colors.YELLOW):
     print(f"{color}{text.center(70)}{Colors.NC}")
     print(f"{color}{'='*70}{Colors.NC}\n")
 
+def start_category(title: str):
+    """Print a category header and tag the following tests with it"""
+    print_header(title)
+    results.category = title.split(': ', 1)[-1]
+
 def print_test(test_num: int, test_name: str):
     """Print test information"""
     print(f"{Colors.BLUE}Test #{test_num}: {test_name}{Colors.NC}")
 
-def make_request(method: str, endpoint: str, data: Dict = None) -> Tuple[Dict, float, int]:
-    """Make HTTP request and return response, time, and status code"""
-    url = f"{API_BASE}{endpoint}"
+def route_key(endpoint: str) -> str:
+    """Reduce an endpoint to its route template, e.g. /api/v1/orders/{id}"""
+    path = endpoint.split('?', 1)[0]
+    path = re.sub(r'^/api/v1/restaurants/[^/]+/menu$', '/api/v1/restaurants/{id}/menu', path)
+    if path.startswith('/api/v1/orders/') and path != '/api/v1/orders/create':
+        path = '/api/v1/orders/{id}'
+    return path
+
+def deadline_for(route: str) -> float:
+    """Return the deadline budget (seconds) for a route"""
+    return ENDPOINT_DEADLINES.get(route, DEFAULT_DEADLINE)
+
+_simdjson_local = threading.local()
+
+def _decode_lazy(body: bytes, fields: Tuple[str, ...]):
+    """Materialize only the given top-level fields of an object payload"""
+    parser = getattr(_simdjson_local, 'parser', None)
+    if parser is None:
+        parser = _simdjson_local.parser = simdjson.Parser()
+    doc = parser.parse(body)
+    if not isinstance(doc, simdjson.Object):
+        return doc.as_list() if isinstance(doc, simdjson.Array) else doc
+    decoded = {}
+    for field in dict.fromkeys(fields + LAZY_ERROR_FIELDS):
+        if field in doc:
+            value = doc[field]
+            if isinstance(value, simdjson.Object):
+                value = value.as_dict()
+            elif isinstance(value, simdjson.Array):
+                value = value.as_list()
+            decoded[field] = value
+    return decoded
+
+def json_decoder_label() -> str:
+    """Decoder actually in use; lazy decoding always parses with simdjson"""
+    if not LAZY_JSON:
+        return JSON_BACKEND
+    if JSON_BACKEND == 'simdjson':
+        return 'simdjson (lazy)'
+    # Responses without declared fields are still decoded in full
+    return f"simdjson (lazy), {JSON_BACKEND} for full decodes"
+
+def decode_body(body: bytes, fields: Tuple[str, ...] = None):
+    """Decode a JSON response body with the configured backend"""
+    try:
+        if LAZY_JSON and fields:
+            return _decode_lazy(body, fields)
+        return JSON_BACKENDS[JSON_BACKEND](body)
+    except ValueError:
+        return {"error": "Invalid JSON", "text": body[:200].decode('utf-8', 'replace')}
+
+def send_request(method: str, url: str, data: Dict = None, timeout: float = DEFAULT_DEADLINE,
+                 headers: Dict = None, session: requests.Session = None,
+                 timings: Dict = None) -> Tuple[int, bytes, Optional[Dict]]:
+    """Send a single HTTP request and return status code, raw body and any transport error
     
-    start_time = time.time()
+    timeout is a total wall-clock budget, response body included.
+    Pass a session to reuse pooled keep-alive connections across requests;
+    without one the --transport client (if any) is used.
+    If timings is given, 'elapsed' (send until response headers) is stored in it.
+    """
+    client = session or CLIENT or requests
     try:
-        if method == "GET":
-            response = requests.get(url, timeout=120)
-        elif method == "POST":
-            response = requests.post(url, json=data, timeout=120)
-        else:
+        if method not in ("GET", "POST"):
             raise ValueError(f"Unsupported method: {method}")
+        response, body = fetch(client, method, url, json=data if method == "POST" else None,
+                               headers=headers, budget=timeout)
         
-        response_time = time.time() - start_time
+        protocol_stats.observe(response)
+        if timings is not None:
+            timings['elapsed'] = response.elapsed.total_seconds()
+        return response.status_code, body, None
+    
+    except DeadlineExceeded:
+        return 504, b'', {"error": "Deadline exceeded"}
+    except TIMEOUT_ERRORS:
+        return 504, b'', {"error": "Request timeout"}
+    except Exception as e:
+        return 500, b'', {"error": str(e)}
+
+def make_request(method: str, endpoint: str, data: Dict = None, fields: Tuple[str, ...] = None,
+                 trace_id: str = None, parent_id: str = None) -> Tuple[Dict, float, int, Dict]:
+    """Make HTTP request and return response, network time, status code and metrics
+    
+    fields lists the top-level response fields the caller will read; with
+    lazy JSON enabled only those are decoded. Metrics hold the decode time
+    and response size, kept separate from the network time. With a trace_id
+    the request carries a traceparent header and its spans are recorded
+    under parent_id.
+    """
+    url = f"{API_BASE}{endpoint}"
+    route = route_key(endpoint)
+    deadline = deadline_for(route)
+    span_id = new_span_id()
+    headers = {'traceparent': traceparent(trace_id, span_id)} if trace_id else None
+    
+    with profiler.phase('request'):
+        start_time = time.time()
+        delay = None
+        if hedger.enabled and method == "GET" and route in HEDGE_ROUTES:
+            delay = hedger.hedge_delay(route)
         
-        try:
-            response_data = response.json()
-        except:
-            response_data = {"error": "Invalid JSON", "text": response.text[:200]}
+        # Hedged attempts race each other, so their send/read split is not recorded
+        timings = {}
+        if delay is not None:
+            status_code, body, error = hedger.send(
+                route, delay, deadline, lambda budget: send_request(method, url, data, budget, headers))
+        else:
+            status_code, body, error = send_request(method, url, data, deadline, headers, timings=timings)
         
-        return response_data, response_time, response.status_code
+        end_time = time.time()
+        response_time = end_time - start_time
+        if hedger.enabled and route in HEDGE_ROUTES:
+            hedger.observe(route, response_time, hedgeable=delay is not None)
     
-    except requests.exceptions.Timeout:
-        response_time = time.time() - start_time
-        return {"error": "Request timeout"}, response_time, 504
-    except Exception as e:
-        response_time = time.time() - start_time
-        return {"error": str(e)}, response_time, 500
+    with profiler.phase('decode'):
+        decode_start = time.perf_counter()
+        response_data = error if error is not None else decode_body(body, fields)
+        metrics = {
+            'decode_time': time.perf_counter() - decode_start,
+            'response_bytes': len(body)
+        }
+    
+    if trace_id:
+        record_http(tracer, trace_id, span_id, parent_id, method, url, start_time, end_time,
+                    status_code, timings.get('elapsed'), len(body), error is not None)
+        tracer.record("decode", trace_id, new_span_id(), parent_id,
+                      end_time, end_time + metrics['decode_time'], {'json.backend': 'simdjson (lazy)' if LAZY_JSON and fields else JSON_BACKEND})
+    
+    return response_data, response_time, status_code, metrics
 
 def run_test(test_name: str, method: str, endpoint: str, data: Dict = None, 
-             expected_status: int = 200, validate_func = None) -> Dict:
+             expected_status: int = 200, validate_func = None) -> TestRecord:
     """Run a single test and return results"""
     test_num = results.total + 1
-    print_test(test_num, test_name)
-    print(f"  Endpoint: {method} {endpoint}")
+    with profiler.phase('print'):
+        print_test(test_num, test_name)
+        print(f"  Endpoint: {method} {endpoint}")
     
-    response_data, response_time, status_code = make_request(method, endpoint, data)
+    spec = spec_hash(method, endpoint, data, expected_status, validate_func)
+    if rerun.enabled and rerun.reason(results.category, test_name, spec) == 'carried':
+        with profiler.phase('record'):
+            record, response_data = rerun.carry(test_num, results.category, test_name)
+            results.add_test(record, response_data)
+        with profiler.phase('print'):
+            print(f"  Status: {Colors.GREEN}PASS{Colors.NC} (carried forward from {record.carried_from})")
+        return record
     
-    # Determine if test passed
-    status = "PASS" if status_code == expected_status else "FAIL"
+    sampler.before_request()
+    trace_id = new_trace_id()
+    root_id = new_span_id()
+    started_at = time.time()
+    response_data, response_time, status_code, metrics = make_request(
+        method, endpoint, data, fields=getattr(validate_func, 'fields', None),
+        trace_id=trace_id, parent_id=root_id)
     
-    # Additional validation
-    validation_msg = ""
-    if status == "PASS" and validate_func:
-        is_valid, msg = validate_func(response_data)
-        if not is_valid:
-            status = "FAIL"
-            validation_msg = f" - {msg}"
+    validate_start = time.time()
+    with profiler.phase('validate'):
+        # Determine if test passed
+        status = "PASS" if status_code == expected_status else "FAIL"
+        
+        # Additional validation
+        validation_msg = ""
+        if status == "PASS" and validate_func:
+            is_valid, msg = validate_func(response_data)
+            if not is_valid:
+                status = "FAIL"
+                validation_msg = f" - {msg}"
     
-    # Print results
-    status_color = Colors.GREEN if status == "PASS" else Colors.RED
-    print(f"  Status: {status_color}{status}{Colors.NC} (HTTP {status_code})")
-    print(f"  Response Time: {Colors.CYAN}{response_time:.3f}s{Colors.NC}")
+    validate_end = time.time()
+    tracer.record("validate", trace_id, new_span_id(), root_id, validate_start, validate_end,
+                  {'test.validator': getattr(validate_func, '__name__', None)})
+    tracer.record(f"test: {test_name}", trace_id, root_id, None, started_at, validate_end, {
+        'test.num': test_num,
+        'test.category': results.category,
+        'test.status': status,
+    }, error=status != "PASS")
     
-    # Show result count or error
-    if status == "PASS":
+    with profiler.phase('record'):
+        # Keep the few payload facts later stages need on the record itself
+        result_count = None
+        order_id = None
         if isinstance(response_data, list):
-            print(f"  Results: {len(response_data)} items")
+            result_count = len(response_data)
         elif isinstance(response_data, dict):
-            if 'restaurants' in response_data:
-                print(f"  Results: {len(response_data['restaurants'])} restaurants")
-            elif 'order_id' in response_data:
-                print(f"  Order ID: {response_data['order_id']}")
-            elif 'message' in response_data:
-                print(f"  Message: {response_data.get('message', 'N/A')}")
-    else:
-        error_msg = response_data.get('error', response_data.get('detail', 'Unknown error'))
-        print(f"  {Colors.RED}Error: {error_msg}{validation_msg}{Colors.NC}")
-    
-    # Store results
-    test_data = {
-        'test_num': test_num,
-        'test_name': test_name,
-        'method': method,
-        'endpoint': endpoint,
-        'status': status,
-        'http_status': status_code,
-        'response_time': response_time,
-        'response_data': response_data
-    }
-    results.add_test(test_data)
-    
-    return test_data
+            if isinstance(response_data.get('restaurants'), list):
+                result_count = len(response_data['restaurants'])
+            order_id = response_data.get('order_id')
+        
+        # Store results
+        record = TestRecord(test_num, test_name, results.category, method, endpoint, status,
+                            status_code, started_at, response_time, metrics['decode_time'],
+                            metrics['response_bytes'], result_count, order_id, spec,
+                            trace_id=trace_id)
+        results.add_test(record, response_data)
+    
+    with profiler.phase('print'):
+        # Print results
+        status_color = Colors.GREEN if status == "PASS" else Colors.RED
+        print(f"  Status: {status_color}{status}{Colors.NC} (HTTP {status_code})")
+        print(f"  Response Time: {Colors.CYAN}{response_time:.3f}s{Colors.NC} "
+              f"(decode {metrics['decode_time']*1000:.2f}ms, {metrics['response_bytes']} bytes)")
+        
+        # Show result count or error
+        if status == "PASS":
+            if isinstance(response_data, list):
+                print(f"  Results: {result_count} items")
+            elif isinstance(response_data, dict):
+                if 'restaurants' in response_data:
+                    print(f"  Results: {result_count} restaurants")
+                elif 'order_id' in response_data:
+                    print(f"  Order ID: {order_id}")
+                elif 'message' in response_data:
+                    print(f"  Message: {response_data.get('message', 'N/A')}")
+        else:
+            error_msg = 'Unknown error'
+            if isinstance(response_data, dict):
+                error_msg = response_data.get('error', response_data.get('detail', error_msg))
+            print(f"  {Colors.RED}Error: {error_msg}{validation_msg}{Colors.NC}")
+    
+    return record
 
 # =============================================================================
 # VALIDATION FUNCTIONS
 # =============================================================================
 
+def touches(*fields: str):
+    """Declare the top-level response fields a validator reads (used by lazy JSON)"""
+    def decorator(func):
+        func.fields = fields
+        return func
+    return decorator
+
 def validate_list_not_empty(data):
     """Validate that response is a non-empty list"""
     if not isinstance(data, list):
@@ -168,6 +744,7 @@ def validate_list_not_empty(data):
         return False, "Response list is empty"
     return True, "Valid"
 
+@touches('restaurants')
 def validate_has_restaurants(data):
     """Validate that response has restaurants array"""
     if not isinstance(data, dict):
@@ -176,6 +753,7 @@ def validate_has_restaurants(data):
         return False, "No 'restaurants' key in response"
     return True, "Valid"
 
+@touches('categories')
 def validate_has_categories(data):
     """Validate that menu has categories"""
     if not isinstance(data, dict):
@@ -186,6 +764,7 @@ def validate_has_categories(data):
         return False, "Categories list is empty"
     return True, "Valid"
 
+@touches('order_id')
 def validate_order_created(data):
     """Validate that order was created"""
     if not isinstance(data, dict):
@@ -200,7 +779,7 @@ def validate_order_created(data):
 
 def test_basic_endpoints():
     """Test basic endpoints"""
-    print_header("CATEGORY 1: BASIC ENDPOINTS")
+    start_category("CATEGORY 1: BASIC ENDPOINTS")
     
     # Test get cities
     run_test("Get All Cities", "GET", "/api/v1/cities", 
@@ -214,7 +793,7 @@ def test_basic_endpoints():
 
 def test_restaurant_search_by_city():
     """Test restaurant search by city"""
-    print_header("CATEGORY 2: RESTAURANT SEARCH - BY CITY")
+    start_category("CATEGORY 2: RESTAURANT SEARCH - BY CITY")
     
     for city in CITIES:
         run_test(f"Search Restaurants in {city}", "GET",
@@ -223,7 +802,7 @@ def test_restaurant_search_by_city():
 
 def test_restaurant_search_by_city_and_cuisine():
     """Test restaurant search by city and cuisine combinations"""
-    print_header("CATEGORY 3: RESTAURANT SEARCH - ALL CITY & CUISINE COMBINATIONS")
+    start_category("CATEGORY 3: RESTAURANT SEARCH - ALL CITY & CUISINE COMBINATIONS")
     
     print(f"{Colors.CYAN}Testing {len(CITIES)} cities × {len(CUISINES)} cuisines = {len(CITIES) * len(CUISINES)} combinations{Colors.NC}\n")
     
@@ -235,49 +814,25 @@ def test_restaurant_search_by_city_and_cuisine():
 
 def test_menu_retrieval():
     """Test menu retrieval for key restaurants"""
-    print_header("CATEGORY 4: MENU RETRIEVAL")
-    
-    # Key restaurants to test (one from each city)
-    test_restaurants = [
-        ("rest_001", "Taj Palace (San Francisco)"),
-        ("rest_012", "Manhattan Tandoor (New York)"),
-        ("rest_016", "Chicago Deep Dish Co (Chicago)"),
-        ("rest_014", "LA Sushi Bar (Los Angeles)"),
-        ("rest_009", "Spice Garden (Bangalore)"),
-        ("rest_020", "Bangalore Wok (Bangalore)"),
-        ("rest_032", "Bollywood Bites LA (Los Angeles)"),
-    ]
+    start_category("CATEGORY 4: MENU RETRIEVAL")
     
-    for rest_id, rest_name in test_restaurants:
+    for rest_id, rest_name in MENU_RESTAURANTS:
         run_test(f"Get Menu - {rest_name}", "GET",
                 f"/api/v1/restaurants/{rest_id}/menu",
                 validate_func=validate_has_categories)
 
 def test_intelligent_search_dishes():
     """Test intelligent search with dish queries"""
-    print_header("CATEGORY 5: INTELLIGENT SEARCH - DISH QUERIES")
-    
-    dish_queries = [
-        "Chicken Tikka Masala",
-        "Pad Thai",
-        "Sushi",
-        "Pizza",
-        "Tacos",
-        "Biryani",
-        "Dumplings",
-        "Noodles",
-        "Curry",
-        "Burger"
-    ]
+    start_category("CATEGORY 5: INTELLIGENT SEARCH - DISH QUERIES")
     
-    for query in dish_queries:
+    for query in DISH_QUERIES:
         run_test(f"Intelligent: {query}", "GET",
                 f"/api/v1/search/intelligent?query={query.replace(' ', '%20')}",
                 validate_func=validate_has_restaurants)
 
 def test_intelligent_search_with_location():
     """Test intelligent search with location"""
-    print_header("CATEGORY 6: INTELLIGENT SEARCH - DISH + LOCATION")
+    start_category("CATEGORY 6: INTELLIGENT SEARCH - DISH + LOCATION")
     
     test_cases = [
         ("Chicken Tikka Masala in New York", "New York"),
@@ -294,7 +849,7 @@ def test_intelligent_search_with_location():
 
 def test_intelligent_search_price_constraints():
     """Test intelligent search with price constraints"""
-    print_header("CATEGORY 7: INTELLIGENT SEARCH - PRICE CONSTRAINTS")
+    start_category("CATEGORY 7: INTELLIGENT SEARCH - PRICE CONSTRAINTS")
     
     price_queries = [
         "food under $10",
@@ -313,7 +868,7 @@ def test_intelligent_search_price_constraints():
 
 def test_intelligent_search_time_constraints():
     """Test intelligent search with time constraints"""
-    print_header("CATEGORY 8: INTELLIGENT SEARCH - TIME CONSTRAINTS")
+    start_category("CATEGORY 8: INTELLIGENT SEARCH - TIME CONSTRAINTS")
     
     time_queries = [
         "food in 20 minutes",
@@ -332,7 +887,7 @@ def test_intelligent_search_time_constraints():
 
 def test_intelligent_search_preferences():
     """Test intelligent search with preferences"""
-    print_header("CATEGORY 9: INTELLIGENT SEARCH - PREFERENCES")
+    start_category("CATEGORY 9: INTELLIGENT SEARCH - PREFERENCES")
     
     preference_queries = [
         "spicy food",
@@ -349,7 +904,7 @@ def test_intelligent_search_preferences():
 
 def test_intelligent_search_complex():
     """Test intelligent search with complex queries"""
-    print_header("CATEGORY 10: INTELLIGENT SEARCH - COMPLEX QUERIES")
+    start_category("CATEGORY 10: INTELLIGENT SEARCH - COMPLEX QUERIES")
     
     complex_queries = [
         "spicy Indian food under $20",
@@ -376,7 +931,7 @@ def test_intelligent_search_complex():
 
 def test_intelligent_search_edge_cases():
     """Test intelligent search edge cases"""
-    print_header("CATEGORY 11: INTELLIGENT SEARCH - EDGE CASES")
+    start_category("CATEGORY 11: INTELLIGENT SEARCH - EDGE CASES")
     
     edge_cases = [
         ("Ethiopian food (not available)", "Ethiopian%20food"),
@@ -387,21 +942,16 @@ def test_intelligent_search_edge_cases():
     
     for test_name, query in edge_cases:
         # These might return empty results, which is OK
-        test_data = run_test(f"Intelligent: {test_name}", "GET",
-                            f"/api/v1/search/intelligent?query={query}")
+        record = run_test(f"Intelligent: {test_name}", "GET",
+                          f"/api/v1/search/intelligent?query={query}")
         # Check if it returned empty results gracefully
-        if test_data['status'] == 'PASS':
-            response = test_data['response_data']
-            if isinstance(response, dict) and 'restaurants' in response:
-                if len(response['restaurants']) == 0:
-                    print(f"  {Colors.CYAN}✓ Correctly returned 0 results{Colors.NC}")
+        if record.status == 'PASS' and record.result_count == 0:
+            print(f"  {Colors.CYAN}✓ Correctly returned 0 results{Colors.NC}")
 
-def test_order_creation():
-    """Test order creation"""
-    print_header("CATEGORY 12: ORDER CREATION (POST)")
-    
-    # Test 1: Simple order
-    order1 = {
+# Sample orders used by the order tests and benchmarks: (test name, order body)
+SAMPLE_ORDERS = [
+    # Simple order
+    ("Create Order - Chicken Tikka Masala (NYC)", {
         "restaurant_id": "rest_012",
         "items": [
             {
@@ -418,14 +968,9 @@ def test_order_creation():
             "zip": "10001"
         },
         "special_instructions": "Extra spicy please"
-    }
-    
-    test1 = run_test("Create Order - Chicken Tikka Masala (NYC)", "POST",
-                     "/api/v1/orders/create", data=order1,
-                     validate_func=validate_order_created)
-    
-    # Test 2: Multiple items
-    order2 = {
+    }),
+    # Multiple items
+    ("Create Order - Multiple Items (SF)", {
         "restaurant_id": "rest_001",
         "items": [
             {
@@ -448,14 +993,9 @@ def test_order_creation():
             "zip": "94102"
         },
         "special_instructions": ""
-    }
-    
-    test2 = run_test("Create Order - Multiple Items (SF)", "POST",
-                     "/api/v1/orders/create", data=order2,
-                     validate_func=validate_order_created)
-    
-    # Test 3: Chicago Deep Dish
-    order3 = {
+    }),
+    # Chicago Deep Dish
+    ("Create Order - Chicago Deep Dish", {
         "restaurant_id": "rest_016",
         "items": [
             {
@@ -472,45 +1012,156 @@ def test_order_creation():
             "zip": "60611"
         },
         "special_instructions": "Call when arriving"
-    }
-    
-    test3 = run_test("Create Order - Chicago Deep Dish", "POST",
-                     "/api/v1/orders/create", data=order3,
-                     validate_func=validate_order_created)
+    }),
+]
+
+def test_order_creation():
+    """Test order creation"""
+    start_category("CATEGORY 12: ORDER CREATION (POST)")
     
     # Return order IDs for tracking tests
     order_ids = []
-    for test in [test1, test2, test3]:
-        if test['status'] == 'PASS' and 'order_id' in test['response_data']:
-            order_ids.append(test['response_data']['order_id'])
+    for test_name, order in SAMPLE_ORDERS:
+        record = run_test(test_name, "POST", "/api/v1/orders/create", data=order,
+                          validate_func=validate_order_created)
+        if record.status == 'PASS' and record.order_id:
+            order_ids.append(record.order_id)
     
     return order_ids
 
 def test_order_tracking(order_ids: List[str]):
     """Test order tracking"""
-    print_header("CATEGORY 13: ORDER TRACKING")
+    start_category("CATEGORY 13: ORDER TRACKING")
     
     if not order_ids:
         print(f"{Colors.YELLOW}⚠️  No orders to track (order creation failed){Colors.NC}")
         return
     
     for order_id in order_ids:
-        run_test(f"Track Order - {order_id}", "GET",
+        first = run_test(f"Track Order - {order_id}", "GET",
                 f"/api/v1/orders/{order_id}")
         
-        # Wait a bit and check again
-        print(f"{Colors.CYAN}  Waiting 3 seconds...{Colors.NC}")
-        time.sleep(3)
+        # Wait a bit and check again, unless both reads are carried forward
+        after_name = f"Track Order - {order_id} (after 3s)"
+        if not (rerun.enabled and first.carried_from and
+                rerun.reason(results.category, after_name, spec_hash("GET", f"/api/v1/orders/{order_id}")) == 'carried'):
+            print(f"{Colors.CYAN}  Waiting 3 seconds...{Colors.NC}")
+            time.sleep(3)
         
-        run_test(f"Track Order - {order_id} (after 3s)", "GET",
+        run_test(after_name, "GET",
                 f"/api/v1/orders/{order_id}")
 
+def build_request_plan() -> List[Tuple[str, str]]:
+    """Read-only (method, endpoint) requests from the suite's test data, for benchmarks"""
+    plan = [("GET", "/api/v1/cities")]
+    for city in CITIES:
+        plan.append(("GET", f"/api/v1/cuisines?city={city.replace(' ', '%20')}"))
+        plan.append(("GET", f"/api/v1/restaurants/search?city={city.replace(' ', '%20')}"))
+        for cuisine in CUISINES:
+            plan.append(("GET", f"/api/v1/restaurants/search?city={city.replace(' ', '%20')}&cuisine={cuisine}"))
+    for rest_id, _ in MENU_RESTAURANTS:
+        plan.append(("GET", f"/api/v1/restaurants/{rest_id}/menu"))
+    for query in DISH_QUERIES:
+        plan.append(("GET", f"/api/v1/search/intelligent?query={query.replace(' ', '%20')}"))
+    return plan
+
 # =============================================================================
 # MAIN TEST EXECUTION
 # =============================================================================
 
-def main():
+def write_results_file(path: str, output: Dict):
+    """Write output plus one line per test, streaming so large runs stay flat in memory"""
+    with open(path, 'w') as f:
+        f.write("{\n")
+        for key, value in output.items():
+            f.write(f'  {json.dumps(key)}: {json.dumps(value, indent=2).replace(chr(10), chr(10) + "  ")},\n')
+        f.write('  "tests": [')
+        for i, test_data in enumerate(results.test_dicts()):
+            f.write(("," if i else "") + "\n    " + json.dumps(test_data))
+        f.write("\n  ]\n}\n")
+
+def parse_args(argv: List[str] = None) -> argparse.Namespace:
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="AI Food Ordering API - Comprehensive Test Suite")
+    parser.add_argument("--deadline", action="append", default=[], metavar="ROUTE=SECONDS",
+                        help="Override a route's deadline, e.g. /api/v1/search/intelligent=10 "
+                             "(use 'default' as ROUTE for all other routes)")
+    parser.add_argument("--hedge", action="store_true",
+                        help=f"Hedge requests on {', '.join(sorted(HEDGE_ROUTES))} once they "
+                             f"exceed the route's observed p{HEDGE_PERCENTILE}")
+    parser.add_argument("--json-backend", choices=sorted(JSON_BACKENDS), default=JSON_BACKEND,
+                        help=f"JSON decoder for response bodies (default: {JSON_BACKEND})")
+    parser.add_argument("--lazy-json", action="store_true",
+                        help="Decode only the fields validators read (requires simdjson); "
+                             "stored response data is limited to those fields")
+    parser.add_argument("--payloads", choices=PayloadStore.MODES, default='memory',
+                        help="Where to keep response payloads: in the results file (memory), "
+                             f"streamed to {PAYLOADS_FILE} (file) or not at all (none)")
+    parser.add_argument("--export-dataset", metavar="DIR",
+                        help="Also append this run to a date-partitioned columnar dataset in DIR")
+    parser.add_argument("--export-format", choices=("parquet", "arrow"), default="parquet",
+                        help="File format for --export-dataset (default: parquet)")
+    parser.add_argument("--profile", action="store_true",
+                        help=f"Profile the client with cProfile and tracemalloc; writes {PROFILE_FILE} "
+                             f"and {PROFILE_SUMMARY_FILE} (adds overhead, so timings run slower)")
+    parser.add_argument("--profile-top", type=int, default=25, metavar="N",
+                        help="Functions and allocation sites to list with --profile (default: 25)")
+    parser.add_argument("--sample-interval", type=float, default=0.5, metavar="SECONDS",
+                        help="Client CPU/RSS/socket/lag sampling interval (default: 0.5)")
+    parser.add_argument("--no-sampler", action="store_true", help="Do not sample client resources")
+    parser.add_argument("--auto-throttle", action="store_true",
+                        help="Pause before requests while the client itself is saturated")
+    parser.add_argument("--rerun-from", metavar="RESULTS_FILE",
+                        help="Only rerun tests that failed, changed or are new since RESULTS_FILE; "
+                             "carry the other passing results forward")
+    parser.add_argument("--drift-sample", type=float, default=0.1, metavar="SHARE",
+                        help="With --rerun-from, share of unchanged passing tests to rerun anyway (default: 0.1)")
+    parser.add_argument("--trace", action="store_true",
+                        help=f"Export client spans (request, send_wait, read, decode, validate) "
+                             f"to {TRACES_FILE} as OTLP/JSON")
+    parser.add_argument("--transport", choices=TRANSPORTS,
+                        help="Send requests over a pooled client: http1 (requests.Session) or "
+                             "http2 (httpx, multiplexed); default opens a new connection per request")
+    parser.add_argument("--pool-size", type=int, default=POOL_SIZE,
+                        help=f"Connection pool size for --transport (default: {POOL_SIZE})")
+    return parser.parse_args(argv)
+
+def apply_deadlines(overrides: List[str]):
+    """Apply ROUTE=SECONDS deadline overrides"""
+    global DEFAULT_DEADLINE
+    for override in overrides:
+        route, sep, seconds = override.partition('=')
+        if not sep:
+            raise SystemExit(f"Invalid --deadline '{override}', expected ROUTE=SECONDS")
+        if route == 'default':
+            DEFAULT_DEADLINE = float(seconds)
+        else:
+            ENDPOINT_DEADLINES[route] = float(seconds)
+
+def main(argv: List[str] = None):
     """Run all tests"""
+    global JSON_BACKEND, LAZY_JSON, TRANSPORT, CLIENT
+    args = parse_args(argv)
+    apply_deadlines(args.deadline)
+    hedger.enabled = args.hedge
+    results.payloads.mode = args.payloads
+    sampler.interval = args.sample_interval
+    sampler.auto_throttle = args.auto_throttle
+    if args.rerun_from:
+        rerun.load(args.rerun_from, args.drift_sample)
+    tracer.enabled = args.trace
+    if args.transport:
+        try:
+            CLIENT = make_client(args.transport, args.pool_size)
+            TRANSPORT = args.transport
+        except ImportError as e:
+            print(f"{Colors.YELLOW}⚠️  {e}; using a new connection per request{Colors.NC}")
+    JSON_BACKEND = args.json_backend
+    if args.lazy_json and not simdjson:
+        print(f"{Colors.YELLOW}⚠️  --lazy-json needs simdjson (pip install pysimdjson); "
+              f"decoding eagerly with {JSON_BACKEND}{Colors.NC}")
+    LAZY_JSON = args.lazy_json and simdjson is not None
+    
     print(f"{Colors.BOLD}{Colors.MAGENTA}")
     print("=" * 70)
     print("AI FOOD ORDERING API - COMPREHENSIVE TEST SUITE".center(70))
@@ -519,8 +1170,24 @@ def main():
     print(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print(f"API Base: {API_BASE}")
     print(f"Results will be saved to: {RESULTS_FILE}")
+    print(f"Deadlines: default {DEFAULT_DEADLINE}s, " +
+          ", ".join(f"{route} {seconds}s" for route, seconds in ENDPOINT_DEADLINES.items()))
+    print(f"JSON Decoder: {json_decoder_label()}")
+    if TRANSPORT:
+        print(f"Transport: {TRANSPORT} (pool size {args.pool_size})")
+    if hedger.enabled:
+        print(f"Hedging: {', '.join(sorted(HEDGE_ROUTES))} after p{HEDGE_PERCENTILE} "
+              f"(warm-up {HEDGE_MIN_SAMPLES} samples)")
+    if rerun.enabled:
+        print(f"Incremental Re-run: from {rerun.source} ({len(rerun.previous)} previous tests, "
+              f"drift sample {rerun.sample_rate:.0%})")
     
     try:
+        if not args.no_sampler:
+            sampler.start()
+        if args.profile:
+            profiler.start()
+        
         # Run all test categories
         test_basic_endpoints()
         test_restaurant_search_by_city()
@@ -535,6 +1202,15 @@ def main():
         test_intelligent_search_edge_cases()
         order_ids = test_order_creation()
         test_order_tracking(order_ids)
+        sampler.stop()
+        
+        if args.profile:
+            profile_summary = profiler.finish(args.profile_top)
+            with open(PROFILE_SUMMARY_FILE, 'w') as f:
+                f.write(profile_summary)
+            print_header("CLIENT PROFILE", Colors.MAGENTA)
+            print(profile_summary.split("\nTop ", 1)[0])
+            print(f"{Colors.GREEN}✅ Profile saved to: {PROFILE_FILE} (pstats) and {PROFILE_SUMMARY_FILE}{Colors.NC}")
         
         # Print summary
         print_header("TEST SUMMARY", Colors.MAGENTA)
@@ -548,15 +1224,65 @@ def main():
         print(f"  Average: {Colors.CYAN}{summary['avg_response_time']}{Colors.NC}")
         print(f"  Min: {Colors.GREEN}{summary['min_response_time']}{Colors.NC}")
         print(f"  Max: {Colors.YELLOW}{summary['max_response_time']}{Colors.NC}")
+        print(f"\nJSON Decoding ({summary['json_backend']}):")
+        print(f"  Total: {Colors.CYAN}{summary['total_decode_time']}{Colors.NC}")
+        print(f"  Average: {Colors.CYAN}{summary['avg_decode_time']}{Colors.NC}")
+        
+        hedge_summary = hedger.get_summary() if hedger.enabled else None
+        if hedge_summary:
+            print(f"\nHedging:")
+            print(f"  Hedge Rate: {Colors.CYAN}{hedge_summary['hedge_rate']}{Colors.NC} "
+                  f"({hedge_summary['hedges_sent']}/{hedge_summary['hedged_requests']})")
+            print(f"  Hedge Wins: {Colors.GREEN}{hedge_summary['hedge_wins']}{Colors.NC}")
+            print(f"  Avg Latency Saved: {Colors.GREEN}{hedge_summary['avg_latency_saved']}{Colors.NC}")
+            for route, route_summary in hedge_summary['routes'].items():
+                print(f"  {route}: p95 {route_summary['p95']} (unhedged {route_summary['p95_unhedged']}), "
+                      f"p99 {route_summary['p99']} (unhedged {route_summary['p99_unhedged']})")
+        
+        rerun_summary = rerun.get_summary() if rerun.enabled else None
+        if rerun_summary:
+            print(f"\nIncremental Re-run:")
+            print(f"  Carried Forward: {Colors.CYAN}{rerun_summary['carried']}{Colors.NC}")
+            print(f"  Rerun: {rerun_summary['failed']} failed, {rerun_summary['changed']} changed, "
+                  f"{rerun_summary['new']} new, {rerun_summary['sample']} drift sample")
+        
+        transport_summary = dict(protocol_stats.get_summary(CLIENT), transport=TRANSPORT) if TRANSPORT else None
+        if transport_summary:
+            print(f"\nTransport ({TRANSPORT}):")
+            print(f"  Protocols: {Colors.CYAN}{transport_summary['http_versions']}{Colors.NC}")
+            print(f"  Connections: {transport_summary['connections']} "
+                  f"({transport_summary['requests_per_connection']} requests per connection)")
+        
+        resource_summary = sampler.get_summary() if not args.no_sampler else None
+        if resource_summary:
+            valid_color = Colors.GREEN if resource_summary['run_valid'] else Colors.RED
+            print(f"\nClient Resources ({resource_summary['samples']} samples):")
+            print(f"  CPU: avg {resource_summary['avg_cpu_percent']}%, max {resource_summary['max_cpu_percent']}% of one core")
+            print(f"  Max RSS: {resource_summary['max_rss_mb']} MB, Max Sockets: {resource_summary['max_sockets']}, "
+                  f"Max Scheduler Lag: {resource_summary['max_lag']}s")
+            print(f"  Requests Started While Saturated: {valid_color}{resource_summary['saturated_requests']} "
+                  f"({resource_summary['saturated_request_share']}){Colors.NC}, throttled {resource_summary['throttled_time']}")
+            if not resource_summary['run_valid']:
+                print(f"  {Colors.RED}⚠️  RUN INVALID: the load generator was saturated; latency numbers include client-side queueing{Colors.NC}")
         
         # Save results
-        with open(RESULTS_FILE, 'w') as f:
-            json.dump({
-                'summary': summary,
-                'tests': results.tests
-            }, f, indent=2)
+        output = {
+            'summary': summary
+        }
+        if hedge_summary:
+            output['hedging'] = hedge_summary
+        if rerun_summary:
+            output['rerun'] = rerun_summary
+        if transport_summary:
+            output['transport'] = transport_summary
+        if resource_summary:
+            output['resources'] = dict(resource_summary, timeline=sampler.timeline())
+        write_results_file(RESULTS_FILE, output)
+        results.payloads.close()
         
         print(f"\n{Colors.GREEN}✅ Results saved to: {RESULTS_FILE}{Colors.NC}")
+        if results.payloads.mode == 'file':
+            print(f"{Colors.GREEN}✅ Response payloads saved to: {results.payloads.path}{Colors.NC}")
         
         # Save summary to text file
         with open(SUMMARY_FILE, 'w') as f:
@@ -571,19 +1297,66 @@ def main():
             f.write(f"  Average: {summary['avg_response_time']}\n")
             f.write(f"  Min: {summary['min_response_time']}\n")
             f.write(f"  Max: {summary['max_response_time']}\n\n")
+            f.write(f"JSON Decoding ({summary['json_backend']}):\n")
+            f.write(f"  Total: {summary['total_decode_time']}\n")
+            f.write(f"  Average: {summary['avg_decode_time']}\n\n")
+            
+            if hedge_summary:
+                f.write(f"Hedging:\n")
+                f.write(f"  Hedge Rate: {hedge_summary['hedge_rate']}\n")
+                f.write(f"  Hedge Wins: {hedge_summary['hedge_wins']}\n")
+                f.write(f"  Avg Latency Saved: {hedge_summary['avg_latency_saved']}\n")
+                for route, route_summary in hedge_summary['routes'].items():
+                    f.write(f"  {route}: p95 {route_summary['p95']} (unhedged {route_summary['p95_unhedged']}), "
+                            f"p99 {route_summary['p99']} (unhedged {route_summary['p99_unhedged']})\n")
+                f.write("\n")
+            
+            if rerun_summary:
+                f.write(f"Incremental Re-run (from {rerun_summary['from']}):\n")
+                f.write(f"  Carried Forward: {rerun_summary['carried']}\n")
+                f.write(f"  Rerun: {rerun_summary['failed']} failed, {rerun_summary['changed']} changed, "
+                        f"{rerun_summary['new']} new, {rerun_summary['sample']} drift sample\n\n")
+            
+            if transport_summary:
+                f.write(f"Transport ({TRANSPORT}):\n")
+                f.write(f"  Protocols: {transport_summary['http_versions']}\n")
+                f.write(f"  Connections: {transport_summary['connections']}\n\n")
+            
+            if resource_summary:
+                f.write(f"Client Resources:\n")
+                f.write(f"  CPU: avg {resource_summary['avg_cpu_percent']}%, max {resource_summary['max_cpu_percent']}%\n")
+                f.write(f"  Max RSS: {resource_summary['max_rss_mb']} MB\n")
+                f.write(f"  Max Sockets: {resource_summary['max_sockets']}\n")
+                f.write(f"  Max Scheduler Lag: {resource_summary['max_lag']}s\n")
+                f.write(f"  Saturated Requests: {resource_summary['saturated_requests']} ({resource_summary['saturated_request_share']})\n")
+                f.write(f"  Run Valid: {'yes' if resource_summary['run_valid'] else 'NO - client saturated'}\n\n")
             
             # List failed tests
-            failed_tests = [t for t in results.tests if t['status'] == 'FAIL']
+            failed_tests = [t for t in results.tests if t.status == 'FAIL']
             if failed_tests:
                 f.write(f"\nFailed Tests ({len(failed_tests)}):\n")
                 f.write("-" * 70 + "\n")
                 for test in failed_tests:
-                    f.write(f"  {test['test_num']}. {test['test_name']}\n")
-                    f.write(f"     {test['method']} {test['endpoint']}\n")
-                    f.write(f"     HTTP {test['http_status']} - {test['response_time']:.3f}s\n\n")
+                    f.write(f"  {test.test_num}. {test.test_name}\n")
+                    f.write(f"     {test.method} {test.endpoint}\n")
+                    f.write(f"     HTTP {test.http_status} - {test.response_time:.3f}s\n\n")
         
         print(f"{Colors.GREEN}✅ Summary saved to: {SUMMARY_FILE}{Colors.NC}")
         
+        if tracer.enabled:
+            span_count = tracer.export(TRACES_FILE)
+            print(f"{Colors.GREEN}✅ {span_count} spans saved to: {TRACES_FILE} (OTLP/JSON){Colors.NC}")
+        
+        if args.export_dataset:
+            from results_export import export_run
+            try:
+                # Carried-forward rows already belong to the run that measured them
+                measured = (t for t in results.test_dicts() if t['carried_from'] is None)
+                path = export_run(measured, RUN_ID, args.export_dataset, args.export_format)
+                print(f"{Colors.GREEN}✅ Run exported to: {path}{Colors.NC}")
+            except ImportError as e:
+                print(f"{Colors.YELLOW}⚠️  Dataset export skipped: {e}{Colors.NC}")
+        
         # Final status
         if results.failed == 0:
             print(f"\n{Colors.GREEN}{Colors.BOLD}🎉 ALL TESTS PASSED!{Colors.NC}\n")
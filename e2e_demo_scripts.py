@@ -8,9 +8,19 @@ import requests
 import json
 import time
 from datetime import datetime
+from functools import wraps
 from typing import Dict, List
+from urllib.parse import urlsplit
+
+from tracing import SPAN_KIND_CLIENT, Tracer, new_span_id, new_trace_id, record_http, traceparent
 
 API_BASE = "https://ai-food-ordering-poc.vercel.app"
+TRACES_FILE = f"demo_traces_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+
+# Every demo is one journey trace; each API call in it is a child span
+tracer = Tracer("e2e-demo-scripts")
+tracer.enabled = True
+current_journey = {}
 
 class Colors:
     GREEN = '\033[0;32m'
@@ -49,10 +59,56 @@ def wait_with_message(seconds: int, message: str):
     print(f"{Colors.YELLOW}⏳ {message} ({seconds}s)...{Colors.NC}")
     time.sleep(seconds)
 
+def journey(name: str):
+    """Run a demo as one trace, so its API calls share a trace id in the server logs"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            trace_id, root_id = new_trace_id(), new_span_id()
+            current_journey.update(trace_id=trace_id, span_id=root_id)
+            start_time = time.time()
+            failed = True
+            try:
+                result = func(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                tracer.record(f"journey: {name}", trace_id, root_id, None, start_time, time.time(),
+                              error=failed)
+                current_journey.clear()
+                print(f"{Colors.CYAN}🔎 Trace ID: {trace_id}{Colors.NC}")
+        return wrapper
+    return decorator
+
+def api_request(method: str, endpoint: str, params: Dict = None, json: Dict = None) -> requests.Response:
+    """Call the API with a traceparent header that joins the current journey's trace"""
+    trace_id = current_journey.get('trace_id') or new_trace_id()
+    span_id = new_span_id()
+    start_time = time.time()
+    try:
+        response = requests.request(method, f"{API_BASE}{endpoint}", params=params, json=json,
+                                    headers={'traceparent': traceparent(trace_id, span_id)})
+    except Exception as e:
+        # No response to describe, so record the failed call with the exception instead
+        attributes = {
+            "http.request.method": method,
+            "url.full": f"{API_BASE}{endpoint}",
+            "error.type": type(e).__name__,
+            "exception.message": str(e),
+        }
+        tracer.record(f"{method} {urlsplit(endpoint).path}", trace_id, span_id, current_journey.get('span_id'),
+                      start_time, time.time(), attributes, kind=SPAN_KIND_CLIENT, error=True)
+        raise
+    record_http(tracer, trace_id, span_id, current_journey.get('span_id'), method, response.url,
+                start_time, time.time(), response.status_code, response.elapsed.total_seconds(),
+                len(response.content))
+    return response
+
 # =============================================================================
 # DEMO 1: Simple Order Flow (Standard API)
 # =============================================================================
 
+@journey("Simple Order Flow")
 def demo_1_simple_order_flow():
     """
     Demo 1: Simple Order Flow using Standard APIs
@@ -68,7 +124,7 @@ def demo_1_simple_order_flow():
     print_system_response("Let me show you available cities...")
     print_api_call("GET", "/api/v1/cities")
     
-    response = requests.get(f"{API_BASE}/api/v1/cities")
+    response = api_request("GET", "/api/v1/cities")
     cities = response.json()
     print_result({"cities": cities})
     
@@ -79,7 +135,7 @@ def demo_1_simple_order_flow():
     print_system_response(f"Great! Let me show you available cuisines in {selected_city}...")
     print_api_call("GET", f"/api/v1/cuisines?city={selected_city}")
     
-    response = requests.get(f"{API_BASE}/api/v1/cuisines?city={selected_city}")
+    response = api_request("GET", f"/api/v1/cuisines?city={selected_city}")
     cuisines = response.json()
     print_result({"cuisines": cuisines})
     
@@ -90,7 +146,7 @@ def demo_1_simple_order_flow():
     print_system_response(f"Here are the {selected_cuisine} restaurants in {selected_city}...")
     print_api_call("GET", f"/api/v1/restaurants/search?city={selected_city}&cuisine={selected_cuisine}")
     
-    response = requests.get(f"{API_BASE}/api/v1/restaurants/search?city={selected_city}&cuisine={selected_cuisine}")
+    response = api_request("GET", f"/api/v1/restaurants/search?city={selected_city}&cuisine={selected_cuisine}")
     restaurants = response.json()
     print_result({"restaurants": [{"id": r["id"], "name": r["name"], "rating": r["rating"]} for r in restaurants]})
     
@@ -101,7 +157,7 @@ def demo_1_simple_order_flow():
     print_system_response(f"Here's the menu for {selected_restaurant['name']}...")
     print_api_call("GET", f"/api/v1/restaurants/{selected_restaurant['id']}/menu")
     
-    response = requests.get(f"{API_BASE}/api/v1/restaurants/{selected_restaurant['id']}/menu")
+    response = api_request("GET", f"/api/v1/restaurants/{selected_restaurant['id']}/menu")
     menu = response.json()
     
     # Show simplified menu
@@ -141,7 +197,7 @@ def demo_1_simple_order_flow():
         "special_instructions": "Please ring doorbell"
     }
     
-    response = requests.post(f"{API_BASE}/api/v1/orders/create", json=order_data)
+    response = api_request("POST", "/api/v1/orders/create", json=order_data)
     order_result = response.json()
     print_result(order_result)
     
@@ -154,7 +210,7 @@ def demo_1_simple_order_flow():
             print_user_action(f"What's the status of my order? (Check #{i+1})")
             print_api_call("GET", f"/api/v1/orders/{order_id}")
             
-            response = requests.get(f"{API_BASE}/api/v1/orders/{order_id}")
+            response = api_request("GET", f"/api/v1/orders/{order_id}")
             order_status = response.json()
             print_result({
                 "order_id": order_status['order_id'],
@@ -171,6 +227,7 @@ def demo_1_simple_order_flow():
 # DEMO 2: Intelligent Search Flow
 # =============================================================================
 
+@journey("Intelligent Search")
 def demo_2_intelligent_search():
     """
     Demo 2: Intelligent Search Flow
@@ -187,8 +244,8 @@ def demo_2_intelligent_search():
     print_system_response("Let me find that for you...")
     print_api_call("GET", f"/api/v1/search/intelligent?query={query1}&location=New York")
     
-    response = requests.get(f"{API_BASE}/api/v1/search/intelligent", 
-                           params={"query": query1, "location": "New York"})
+    response = api_request("GET", "/api/v1/search/intelligent", 
+                          params={"query": query1, "location": "New York"})
     result1 = response.json()
     
     if result1.get('restaurants'):
@@ -205,8 +262,8 @@ def demo_2_intelligent_search():
     print_system_response("Searching for Italian restaurants with items under $20...")
     print_api_call("GET", f"/api/v1/search/intelligent?query={query2}")
     
-    response = requests.get(f"{API_BASE}/api/v1/search/intelligent", 
-                           params={"query": query2})
+    response = api_request("GET", "/api/v1/search/intelligent", 
+                          params={"query": query2})
     result2 = response.json()
     
     if result2.get('restaurants'):
@@ -223,8 +280,8 @@ def demo_2_intelligent_search():
     print_system_response("Finding spicy food with fast delivery...")
     print_api_call("GET", f"/api/v1/search/intelligent?query={query3}")
     
-    response = requests.get(f"{API_BASE}/api/v1/search/intelligent", 
-                           params={"query": query3})
+    response = api_request("GET", "/api/v1/search/intelligent", 
+                          params={"query": query3})
     result3 = response.json()
     
     if result3.get('restaurants'):
@@ -246,8 +303,8 @@ def demo_2_intelligent_search():
     print_system_response("Finding vegetarian Thai options that match your criteria...")
     print_api_call("GET", f"/api/v1/search/intelligent?query={query4}")
     
-    response = requests.get(f"{API_BASE}/api/v1/search/intelligent", 
-                           params={"query": query4})
+    response = api_request("GET", "/api/v1/search/intelligent", 
+                          params={"query": query4})
     result4 = response.json()
     
     if result4.get('restaurants'):
@@ -263,6 +320,7 @@ def demo_2_intelligent_search():
 # DEMO 3: Complete User Journey (Intelligent + Order + Track)
 # =============================================================================
 
+@journey("Complete User Journey")
 def demo_3_complete_journey():
     """
     Demo 3: Complete User Journey
@@ -279,8 +337,8 @@ def demo_3_complete_journey():
     print_system_response("Searching for sushi restaurants in LA with items under $20...")
     print_api_call("GET", f"/api/v1/search/intelligent?query={query}&location=Los Angeles")
     
-    response = requests.get(f"{API_BASE}/api/v1/search/intelligent", 
-                           params={"query": query, "location": "Los Angeles"})
+    response = api_request("GET", "/api/v1/search/intelligent", 
+                          params={"query": query, "location": "Los Angeles"})
     search_result = response.json()
     
     if not search_result.get('restaurants'):
@@ -302,7 +360,7 @@ def demo_3_complete_journey():
     print_user_action(f"Show me the full menu for {restaurant['name']}")
     print_api_call("GET", f"/api/v1/restaurants/{restaurant['id']}/menu")
     
-    response = requests.get(f"{API_BASE}/api/v1/restaurants/{restaurant['id']}/menu")
+    response = api_request("GET", f"/api/v1/restaurants/{restaurant['id']}/menu")
     menu = response.json()
     
     # Find items under $20
@@ -347,7 +405,7 @@ def demo_3_complete_journey():
             "special_instructions": "Extra wasabi please"
         }
         
-        response = requests.post(f"{API_BASE}/api/v1/orders/create", json=order_data)
+        response = api_request("POST", "/api/v1/orders/create", json=order_data)
         order_result = response.json()
         print_result(order_result)
         
@@ -364,7 +422,7 @@ def demo_3_complete_journey():
                 print_user_action(f"Check order status (Update #{i+1})")
                 print_api_call("GET", f"/api/v1/orders/{order_id}")
                 
-                response = requests.get(f"{API_BASE}/api/v1/orders/{order_id}")
+                response = api_request("GET", f"/api/v1/orders/{order_id}")
                 order_status = response.json()
                 
                 print_system_response(f"Order Status: {order_status['status']}")
@@ -382,6 +440,7 @@ def demo_3_complete_journey():
 # DEMO 4: Multi-City Cuisine Coverage
 # =============================================================================
 
+@journey("Multi-City Coverage")
 def demo_4_multi_city_coverage():
     """
     Demo 4: Show complete coverage across all cities
@@ -401,8 +460,8 @@ def demo_4_multi_city_coverage():
     coverage = {}
     for city in cities:
         print_api_call("GET", f"/api/v1/restaurants/search?city={city}&cuisine={test_cuisine}")
-        response = requests.get(f"{API_BASE}/api/v1/restaurants/search", 
-                               params={"city": city, "cuisine": test_cuisine})
+        response = api_request("GET", "/api/v1/restaurants/search", 
+                              params={"city": city, "cuisine": test_cuisine})
         restaurants = response.json()
         coverage[city] = {
             "count": len(restaurants),
@@ -417,8 +476,8 @@ def demo_4_multi_city_coverage():
     tikka_availability = {}
     for city in cities:
         print_api_call("GET", f"/api/v1/search/intelligent?query=Chicken Tikka Masala&location={city}")
-        response = requests.get(f"{API_BASE}/api/v1/search/intelligent",
-                               params={"query": "Chicken Tikka Masala", "location": city})
+        response = api_request("GET", "/api/v1/search/intelligent",
+                              params={"query": "Chicken Tikka Masala", "location": city})
         result = response.json()
         
         if result.get('restaurants'):
@@ -485,6 +544,11 @@ def main():
         import traceback
         traceback.print_exc()
         return 3
+    finally:
+        # Failed journeys are the ones worth tracing, so export whatever was recorded
+        if tracer.spans:
+            span_count = tracer.export(TRACES_FILE)
+            print(f"{Colors.GREEN}✅ {span_count} spans saved to: {TRACES_FILE} (OTLP/JSON){Colors.NC}\n")
 
 if __name__ == "__main__":
     import sys
@@ -0,0 +1,422 @@
+#!/usr/bin/env python3
+"""
+Fault-Injection Proxy for AI Food Ordering System
+A local HTTP proxy that degrades the network between the test scripts and
+API_BASE (or the local mock): added latency, bandwidth caps, dropped and
+truncated connections, and slow-loris (trickled) responses. HTTPS targets go
+through CONNECT tunnels, so faults apply to the encrypted byte stream exactly
+as a bad mobile network would; plain HTTP targets (the local mock) are
+forwarded one request per connection.
+
+serve: run the proxy with one profile and point any script at it
+       (HTTPS_PROXY/HTTP_PROXY=http://127.0.0.1:8899).
+bench: run the same request plan through every profile with urllib3 retries
+       and report how timeouts, retries and throughput degrade.
+
+Usage:
+    python3 fault_proxy.py bench --requests 40
+    python3 fault_proxy.py bench --profiles baseline,bangalore-4g --profiles-file my_profiles.json
+    python3 fault_proxy.py serve --profile slowloris
+"""
+
+import argparse
+import json
+import random
+import select
+import socket
+import socketserver
+import struct
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from comprehensive_test_suite import API_BASE, RUN_ID, Colors, percentile, print_header
+
+RESULTS_FILE = f"fault_proxy_{RUN_ID}.json"
+DEFAULT_PORT = 8899
+
+# Fault profiles; every key is optional:
+#   latency_ms, jitter_ms   added to each client->server flight (so to every round trip)
+#   bandwidth_kbps          cap on the server->client direction
+#   drop_rate               share of connections reset before anything is forwarded
+#   truncate_rate           share of connections reset part way through the response
+#   trickle_bytes, trickle_ms   slow-loris: send the response trickle_bytes at a time
+PROFILES = {
+    "baseline": {},
+    "bangalore-4g": {"latency_ms": 120, "jitter_ms": 60, "bandwidth_kbps": 4000},
+    "bangalore-3g": {"latency_ms": 300, "jitter_ms": 150, "bandwidth_kbps": 750, "drop_rate": 0.02},
+    "congested": {"latency_ms": 800, "jitter_ms": 400, "bandwidth_kbps": 250,
+                  "drop_rate": 0.05, "truncate_rate": 0.05},
+    "lossy": {"drop_rate": 0.15, "truncate_rate": 0.1},
+    "slowloris": {"trickle_bytes": 64, "trickle_ms": 250},
+}
+
+# Request plan for bench: (label, path)
+PLAN = [
+    ("cities", "/api/v1/cities"),
+    ("search", "/api/v1/restaurants/search?city=Bangalore"),
+    ("menu", "/api/v1/restaurants/rest_012/menu"),
+    ("intelligent_search", "/api/v1/search/intelligent?query=Biryani&location=Bangalore"),
+]
+
+# A client->server chunk arriving after this much idle time starts a new flight
+FLIGHT_GAP = 0.01
+BUFFER_SIZE = 16384
+
+def _reset(sock: socket.socket):
+    """Close with RST instead of FIN, like a dropped mobile connection"""
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack('ii', 1, 0))
+    except OSError:
+        pass
+    sock.close()
+
+class FaultProxyServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address: Tuple[str, int], profile: Dict):
+        super().__init__(address, FaultProxyHandler)
+        self.profile = profile
+        self.lock = threading.Lock()
+        self.counters = {"connections": 0, "dropped": 0, "truncated": 0}
+
+    def count(self, name: str):
+        with self.lock:
+            self.counters[name] += 1
+
+class FaultProxyHandler(socketserver.BaseRequestHandler):
+    """Handles one client connection: CONNECT tunnel or a single absolute-form request"""
+
+    def handle(self):
+        profile = self.server.profile
+        client = self.request
+        self.server.count("connections")
+        head, leftover = self._read_head(client)
+        if not head:
+            return
+        request_line, _, header_block = head.partition(b"\r\n")
+        try:
+            method, target, version = request_line.decode('latin-1').split(' ', 2)
+        except ValueError:
+            return
+
+        try:
+            if method == "CONNECT":
+                host, _, port = target.rpartition(':')
+                upstream = socket.create_connection((host, int(port)), timeout=10)
+                client.sendall(b"HTTP/1.1 200 Connection Established\r\n\r\n")
+                initial = leftover
+            else:
+                url = urlsplit(target)
+                upstream = socket.create_connection((url.hostname, url.port or 80), timeout=10)
+                path = (url.path or "/") + (f"?{url.query}" if url.query else "")
+                # One request per upstream connection keeps tunnels and targets simple
+                headers = [line for line in header_block.split(b"\r\n") if line and not
+                           line.lower().startswith((b"connection:", b"proxy-connection:", b"keep-alive:"))]
+                initial = (f"{method} {path} {version}\r\n".encode('latin-1') +
+                           b"\r\n".join(headers + [b"Connection: close"]) + b"\r\n\r\n" + leftover)
+        except (OSError, ValueError) as e:
+            client.sendall(f"HTTP/1.1 502 Bad Gateway\r\nContent-Length: {len(str(e))}\r\n\r\n{e}".encode())
+            return
+
+        if random.random() < profile.get("drop_rate", 0):
+            self.server.count("dropped")
+            _reset(client)
+            upstream.close()
+            return
+
+        upstream.settimeout(None)
+        uploader = threading.Thread(target=self._upload, args=(client, upstream, initial, profile), daemon=True)
+        uploader.start()
+        self._download(upstream, client, profile, close_after=method != "CONNECT")
+        uploader.join(timeout=1)
+
+    @staticmethod
+    def _read_head(sock: socket.socket) -> Tuple[bytes, bytes]:
+        """Read the request head; return it and any bytes read past it"""
+        data = b""
+        while b"\r\n\r\n" not in data:
+            chunk = sock.recv(BUFFER_SIZE)
+            if not chunk:
+                return b"", b""
+            data += chunk
+        head, _, leftover = data.partition(b"\r\n\r\n")
+        return head, leftover
+
+    @staticmethod
+    def _delay(profile: Dict):
+        latency = profile.get("latency_ms", 0) + random.uniform(0, profile.get("jitter_ms", 0))
+        if latency:
+            time.sleep(latency / 1000)
+
+    def _upload(self, client: socket.socket, upstream: socket.socket, initial: bytes, profile: Dict):
+        """Client -> server, delaying the start of every flight"""
+        try:
+            if initial:
+                self._delay(profile)
+                upstream.sendall(initial)
+            last = time.monotonic()
+            while True:
+                chunk = client.recv(BUFFER_SIZE)
+                if not chunk:
+                    upstream.shutdown(socket.SHUT_WR)
+                    return
+                if time.monotonic() - last >= FLIGHT_GAP:
+                    self._delay(profile)
+                upstream.sendall(chunk)
+                last = time.monotonic()
+        except OSError:
+            return
+
+    @staticmethod
+    def _close_response(head: bytes) -> bytes:
+        """Mark a response as the last on its connection so the client does not reuse it"""
+        lines = [line for line in head.split(b"\r\n")
+                 if not line.lower().startswith((b"connection:", b"keep-alive:"))]
+        return b"\r\n".join(lines[:1] + [b"Connection: close"] + lines[1:])
+
+    def _download(self, upstream: socket.socket, client: socket.socket, profile: Dict,
+                  close_after: bool = False):
+        """Server -> client with bandwidth cap, trickling and truncation"""
+        bytes_per_second = profile.get("bandwidth_kbps", 0) * 1000 / 8
+        trickle_bytes = profile.get("trickle_bytes", 0)
+        truncate_at = None
+        if random.random() < profile.get("truncate_rate", 0):
+            truncate_at = random.randint(1, 512)
+        sent = 0
+        pending = b""
+        try:
+            while True:
+                readable, _, _ = select.select([upstream], [], [], 60)
+                if not readable:
+                    break
+                chunk = upstream.recv(BUFFER_SIZE)
+                eof = not chunk
+                if eof:
+                    # Upstream closed, possibly mid-head: forward whatever was held back and stop
+                    chunk, pending, close_after = pending, b"", False
+                    if not chunk:
+                        break
+                if close_after:
+                    # Hold data back until the response head is complete, then rewrite it
+                    pending += chunk
+                    if b"\r\n\r\n" not in pending:
+                        continue
+                    head, _, body = pending.partition(b"\r\n\r\n")
+                    chunk, pending, close_after = self._close_response(head) + b"\r\n\r\n" + body, b"", False
+                while chunk:
+                    size = len(chunk)
+                    if trickle_bytes:
+                        size = trickle_bytes
+                    elif bytes_per_second:
+                        size = max(int(bytes_per_second / 20), 1)
+                    piece, chunk = chunk[:size], chunk[size:]
+                    if truncate_at is not None and sent + len(piece) >= truncate_at:
+                        client.sendall(piece[:truncate_at - sent])
+                        self.server.count("truncated")
+                        _reset(client)
+                        return
+                    client.sendall(piece)
+                    sent += len(piece)
+                    if trickle_bytes:
+                        time.sleep(profile.get("trickle_ms", 100) / 1000)
+                    elif bytes_per_second:
+                        time.sleep(len(piece) / bytes_per_second)
+                if eof:
+                    break
+            client.shutdown(socket.SHUT_WR)
+        except OSError:
+            pass
+        finally:
+            upstream.close()
+
+def start_proxy(profile: Dict, port: int = 0) -> FaultProxyServer:
+    """Start a proxy in a background thread (port 0 picks a free port)"""
+    server = FaultProxyServer(("127.0.0.1", port), profile)
+    threading.Thread(target=server.serve_forever, name="fault-proxy", daemon=True).start()
+    return server
+
+def load_profiles(path: Optional[str]) -> Dict[str, Dict]:
+    """Built-in profiles, extended or overridden by a JSON file of {name: profile}"""
+    profiles = dict(PROFILES)
+    if path:
+        with open(path) as f:
+            profiles.update(json.load(f))
+    return profiles
+
+def make_session(proxy_url: str, retries: int) -> requests.Session:
+    """Session routed through the proxy, retrying the way a production client would"""
+    session = requests.Session()
+    retry = Retry(total=retries, connect=retries, read=retries, status=retries, backoff_factor=0.2,
+                  status_forcelist=(502, 503, 504), allowed_methods=frozenset({"GET"}),
+                  raise_on_status=False)
+    adapter = HTTPAdapter(max_retries=retry, pool_maxsize=32)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.proxies = {"http": proxy_url, "https": proxy_url}
+    session.trust_env = False
+    return session
+
+def timed_get(session: requests.Session, url: str, timeout: Tuple[float, float], retries: int) -> Dict:
+    """One GET through the proxy; classify the outcome and count retries"""
+    start_time = time.perf_counter()
+    outcome = {"ok": False, "error": None, "retries": 0, "bytes": 0}
+    try:
+        response = session.get(url, timeout=timeout)
+        body = response.content
+        outcome["ok"] = response.status_code == 200
+        outcome["error"] = None if outcome["ok"] else f"HTTP {response.status_code}"
+        outcome["bytes"] = len(body)
+        history = getattr(getattr(response.raw, "retries", None), "history", ())
+        outcome["retries"] = len(history or ())
+    except requests.exceptions.Timeout:
+        outcome["error"], outcome["retries"] = "timeout", retries
+    except requests.exceptions.ConnectionError:
+        outcome["error"], outcome["retries"] = "connection", retries
+    except requests.exceptions.RequestException as e:
+        outcome["error"] = type(e).__name__
+    outcome["latency"] = time.perf_counter() - start_time
+    return outcome
+
+def run_profile(name: str, profile: Dict, api_base: str, count: int, concurrency: int,
+                timeout: Tuple[float, float], retries: int) -> Dict:
+    """Send count requests from PLAN through a proxy running profile"""
+    server = start_proxy(profile)
+    proxy_url = f"http://127.0.0.1:{server.server_address[1]}"
+    session = make_session(proxy_url, retries)
+    plan = [PLAN[i % len(PLAN)] for i in range(count)]
+    start_time = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            outcomes = list(pool.map(lambda step: dict(timed_get(session, f"{api_base}{step[1]}", timeout, retries),
+                                                       label=step[0]), plan))
+    finally:
+        elapsed = time.perf_counter() - start_time
+        session.close()
+        server.shutdown()
+        server.server_close()
+
+    ok = [o for o in outcomes if o["ok"]]
+    latencies = [o["latency"] for o in ok]
+    errors = {}
+    for o in outcomes:
+        if o["error"]:
+            errors[o["error"]] = errors.get(o["error"], 0) + 1
+    return {
+        "profile": profile,
+        "requests": len(outcomes),
+        "succeeded": len(ok),
+        "success_rate": len(ok) / len(outcomes) if outcomes else 0.0,
+        "errors": errors,
+        "timeouts": errors.get("timeout", 0),
+        "retries": sum(o["retries"] for o in outcomes),
+        "requests_retried": sum(1 for o in outcomes if o["retries"]),
+        # Read timeouts restart on every byte, so trickled responses can run far past them
+        "over_read_timeout": sum(1 for o in ok if o["latency"] > timeout[1]),
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "max": max(latencies) if latencies else None,
+        "throughput_rps": len(ok) / elapsed if elapsed else 0.0,
+        "throughput_kbps": sum(o["bytes"] for o in ok) * 8 / 1000 / elapsed if elapsed else 0.0,
+        "duration": elapsed,
+        "proxy": dict(server.counters),
+    }
+
+def print_report(report: Dict[str, Dict]):
+    print_header("FAULT PROFILE REPORT", Colors.MAGENTA)
+    print(f"  {'profile':16} {'ok':>6} {'timeouts':>8} {'retries':>8} {'>read_to':>8} "
+          f"{'p50':>8} {'p95':>8} {'req/s':>7} {'kbit/s':>8}")
+    for name, row in report.items():
+        color = Colors.GREEN if row["success_rate"] >= 0.99 else Colors.YELLOW if row["success_rate"] >= 0.9 else Colors.RED
+        p50 = f"{row['p50']:.3f}s" if row["p50"] is not None else "N/A"
+        p95 = f"{row['p95']:.3f}s" if row["p95"] is not None else "N/A"
+        print(f"  {name[:16]:16} {color}{row['success_rate']*100:5.1f}%{Colors.NC} {row['timeouts']:>8} "
+              f"{row['retries']:>8} {row['over_read_timeout']:>8} {p50:>8} {p95:>8} "
+              f"{row['throughput_rps']:>7.2f} {row['throughput_kbps']:>8.1f}")
+        other = {error: n for error, n in row["errors"].items() if error != "timeout"}
+        if other:
+            print(f"  {'':16} errors: {', '.join(f'{error} x{n}' for error, n in other.items())}")
+    print(f"\n  >read_to: successful requests that took longer than the read timeout "
+          f"(possible when bytes keep trickling in)")
+
+def main(argv: List[str] = None):
+    """Run the fault proxy or the fault profile benchmark"""
+    parser = argparse.ArgumentParser(description="Local fault-injection proxy for resilience testing")
+    parser.add_argument("--profiles-file", help="JSON file of {name: profile} adding to or overriding the built-ins")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    serve = subparsers.add_parser("serve", help="Run the proxy with one profile until interrupted")
+    serve.add_argument("--profile", default="bangalore-3g", help="Fault profile (default: bangalore-3g)")
+    serve.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Listen port (default: {DEFAULT_PORT})")
+
+    bench = subparsers.add_parser("bench", help="Run the request plan through each profile and compare")
+    bench.add_argument("--api-base", default=API_BASE, help=f"API base URL (default: {API_BASE})")
+    bench.add_argument("--profiles", help="Comma-separated profiles to run (default: all)")
+    bench.add_argument("--requests", type=int, default=40, help="Requests per profile (default: 40)")
+    bench.add_argument("--concurrency", type=int, default=4, help="Concurrent requests (default: 4)")
+    bench.add_argument("--connect-timeout", type=float, default=5, help="Connect timeout (default: 5)")
+    bench.add_argument("--read-timeout", type=float, default=10, help="Read timeout (default: 10)")
+    bench.add_argument("--retries", type=int, default=2, help="urllib3 retries per request (default: 2)")
+    args = parser.parse_args(argv)
+
+    profiles = load_profiles(args.profiles_file)
+    if args.command == "serve":
+        if args.profile not in profiles:
+            parser.error(f"Unknown profile '{args.profile}' (available: {', '.join(profiles)})")
+        server = FaultProxyServer(("127.0.0.1", args.port), profiles[args.profile])
+        print(f"{Colors.BOLD}{Colors.MAGENTA}Fault proxy '{args.profile}' on http://127.0.0.1:{args.port}{Colors.NC}")
+        print(f"  {json.dumps(profiles[args.profile])}")
+        print(f"  e.g. HTTPS_PROXY=http://127.0.0.1:{args.port} python3 comprehensive_test_suite.py")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print(f"\n{Colors.YELLOW}⚠️  Proxy stopped{Colors.NC} ({server.counters})")
+        return 0
+
+    names = args.profiles.split(",") if args.profiles else list(profiles)
+    unknown = [name for name in names if name not in profiles]
+    if unknown:
+        parser.error(f"Unknown profiles: {', '.join(unknown)} (available: {', '.join(profiles)})")
+    api_base = args.api_base.rstrip("/")
+    timeout = (args.connect_timeout, args.read_timeout)
+
+    print(f"{Colors.BOLD}{Colors.MAGENTA}")
+    print("=" * 70)
+    print("AI FOOD ORDERING - FAULT INJECTION BENCHMARK".center(70))
+    print("=" * 70)
+    print(f"{Colors.NC}")
+    print(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"API Base: {api_base}")
+    print(f"Timeouts: connect {timeout[0]}s, read {timeout[1]}s, {args.retries} retries")
+
+    report = {}
+    try:
+        for name in names:
+            print(f"\n{Colors.BLUE}Profile {name}: {json.dumps(profiles[name])}{Colors.NC}")
+            report[name] = run_profile(name, profiles[name], api_base, args.requests, args.concurrency,
+                                       timeout, args.retries)
+            row = report[name]
+            print(f"  {row['succeeded']}/{row['requests']} ok in {row['duration']:.1f}s, "
+                  f"{row['retries']} retries, proxy {row['proxy']}")
+    except KeyboardInterrupt:
+        print(f"\n{Colors.YELLOW}⚠️  Benchmark interrupted by user{Colors.NC}")
+        if not report:
+            return 2
+
+    print_report(report)
+    with open(RESULTS_FILE, 'w') as f:
+        json.dump({"api_base": api_base, "timeout": timeout, "retries": args.retries, "report": report}, f, indent=2)
+    print(f"\n{Colors.GREEN}✅ Results saved to: {RESULTS_FILE}{Colors.NC}\n")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
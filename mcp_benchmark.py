@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+MCP Tool-Call Overhead Benchmark for AI Food Ordering System
+Drives the same scenarios through the MCP server (api/mcp.js on Vercel, or
+server/mcp-server.js run locally) and through the REST API it wraps, and
+measures what each MCP tool adds on top of the direct REST call: the extra
+hop from the MCP function to the API plus the JSON-RPC re-serialization.
+
+Usage:
+    python3 mcp_benchmark.py                                   # Vercel /api/mcp
+    python3 mcp_benchmark.py --mcp-url http://localhost:8787/mcp --iterations 20
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from datetime import datetime
+from typing import Dict, List, Tuple
+from urllib.parse import urlencode
+
+import requests
+
+from comprehensive_test_suite import (API_BASE, DEFAULT_DEADLINE, RUN_ID, SAMPLE_ORDERS, Colors,
+                                      percentile, print_header, send_request)
+
+RESULTS_FILE = f"mcp_benchmark_{RUN_ID}.json"
+MCP_PROTOCOL_VERSION = "2025-06-18"
+
+# create_order (only with --include-orders) places the suite's first sample order
+SAMPLE_ORDER = SAMPLE_ORDERS[0][1]
+
+def scenarios(include_orders: bool) -> List[Tuple[str, str, Dict, str, str, Dict]]:
+    """(label, tool, arguments, REST method, REST endpoint, REST body) for each scenario"""
+    plan = [
+        ("get_cities", "get_cities", {}, "GET", "/api/v1/cities", None),
+        ("get_cuisines", "get_cuisines", {}, "GET", "/api/v1/cuisines", None),
+        ("search_restaurants (city)", "search_restaurants", {"city": "New York"},
+         "GET", "/api/v1/restaurants/search?" + urlencode({"city": "New York"}), None),
+        ("search_restaurants (city+cuisine)", "search_restaurants", {"city": "Bangalore", "cuisine": "Indian"},
+         "GET", "/api/v1/restaurants/search?" + urlencode({"city": "Bangalore", "cuisine": "Indian"}), None),
+        ("get_menu", "get_menu", {"restaurant_id": "rest_012"},
+         "GET", "/api/v1/restaurants/rest_012/menu", None),
+    ]
+    if include_orders:
+        plan.append(("create_order", "create_order", SAMPLE_ORDER, "POST", "/api/v1/orders/create", SAMPLE_ORDER))
+    return plan
+
+class MCPClient:
+    """Minimal JSON-RPC client for the stateless Streamable HTTP MCP transport"""
+
+    def __init__(self, url: str, timeout: float = DEFAULT_DEADLINE):
+        self.url = url
+        self.timeout = timeout
+        self._next_id = 0
+
+    def call(self, method: str, params: Dict = None) -> Tuple[Dict, float, int, int]:
+        """Send one JSON-RPC request and return (message, time, HTTP status, response bytes)"""
+        self._next_id += 1
+        payload = {"jsonrpc": "2.0", "id": self._next_id, "method": method, "params": params or {}}
+        headers = {
+            "Content-Type": "application/json",
+            "Accept": "application/json, text/event-stream",
+            "MCP-Protocol-Version": MCP_PROTOCOL_VERSION,
+        }
+        start_time = time.time()
+        try:
+            response = requests.post(self.url, json=payload, headers=headers, timeout=self.timeout)
+            body = response.content
+        except requests.exceptions.Timeout:
+            return {"error": {"message": "Request timeout"}}, time.time() - start_time, 504, 0
+        except Exception as e:
+            return {"error": {"message": str(e)}}, time.time() - start_time, 500, 0
+        response_time = time.time() - start_time
+        return self._parse(body, response.headers.get("Content-Type", "")), response_time, response.status_code, len(body)
+
+    @staticmethod
+    def _parse(body: bytes, content_type: str) -> Dict:
+        """Decode a JSON response, or the last data event of an SSE response"""
+        text = body.decode("utf-8", "replace")
+        try:
+            if content_type.startswith("text/event-stream"):
+                events = [line[5:].strip() for line in text.splitlines() if line.startswith("data:")]
+                return json.loads(events[-1]) if events else {"error": {"message": "Empty event stream"}}
+            return json.loads(text)
+        except ValueError:
+            return {"error": {"message": "Invalid JSON", "text": text[:200]}}
+
+    def initialize(self) -> Tuple[Dict, float, int, int]:
+        return self.call("initialize", {
+            "protocolVersion": MCP_PROTOCOL_VERSION,
+            "capabilities": {},
+            "clientInfo": {"name": "mcp-benchmark", "version": "1.0.0"},
+        })
+
+    def call_tool(self, name: str, arguments: Dict) -> Tuple[Dict, float, int, int]:
+        return self.call("tools/call", {"name": name, "arguments": arguments})
+
+def tool_failed(message: Dict, status_code: int) -> bool:
+    """True for HTTP errors, JSON-RPC errors and tool results flagged isError"""
+    return status_code != 200 or "error" in message or message.get("result", {}).get("isError", False)
+
+def run_benchmark(mcp_url: str, iterations: int, include_orders: bool) -> Dict:
+    """Interleave REST and MCP calls per scenario and collect paired timings"""
+    client = MCPClient(mcp_url)
+    print_header("MCP HANDSHAKE")
+    message, init_time, status_code, _ = client.initialize()
+    server_info = message.get("result", {}).get("serverInfo", {})
+    print(f"  initialize: HTTP {status_code} in {Colors.CYAN}{init_time:.3f}s{Colors.NC} "
+          f"({server_info.get('name', message.get('error', {}).get('message', 'unknown'))})")
+    message, list_time, status_code, _ = client.call("tools/list")
+    tools = [tool["name"] for tool in message.get("result", {}).get("tools", [])]
+    print(f"  tools/list: HTTP {status_code} in {Colors.CYAN}{list_time:.3f}s{Colors.NC} ({', '.join(tools) or 'none'})")
+
+    results = {"initialize_time": init_time, "tools_list_time": list_time, "scenarios": {}}
+    for label, tool, arguments, method, endpoint, body in scenarios(include_orders):
+        print_header(f"SCENARIO: {label}")
+        samples = {"rest": [], "mcp": [], "overhead": [], "rest_bytes": [], "mcp_bytes": [],
+                   "rest_errors": 0, "mcp_errors": 0}
+        for i in range(iterations):
+            # Randomize which path goes first so drift does not favour either
+            order = ["rest", "mcp"]
+            random.shuffle(order)
+            timings = {}
+            for path in order:
+                if path == "rest":
+                    start_time = time.time()
+                    status_code, raw, error = send_request(method, f"{API_BASE}{endpoint}", body)
+                    timings["rest"] = time.time() - start_time
+                    samples["rest_bytes"].append(len(raw))
+                    if error is not None or status_code != 200:
+                        samples["rest_errors"] += 1
+                else:
+                    message, timings["mcp"], status_code, size = client.call_tool(tool, arguments)
+                    samples["mcp_bytes"].append(size)
+                    if tool_failed(message, status_code):
+                        samples["mcp_errors"] += 1
+            samples["rest"].append(timings["rest"])
+            samples["mcp"].append(timings["mcp"])
+            samples["overhead"].append(timings["mcp"] - timings["rest"])
+            print(f"  #{i+1}: REST {timings['rest']:.3f}s  MCP {timings['mcp']:.3f}s  "
+                  f"overhead {Colors.CYAN}{timings['mcp'] - timings['rest']:+.3f}s{Colors.NC}")
+        results["scenarios"][label] = samples
+    return results
+
+def summarize(results: Dict) -> Dict:
+    """Per-scenario percentiles of REST, MCP and the paired overhead"""
+    summary = {}
+    for label, samples in results["scenarios"].items():
+        rest_bytes = sum(samples["rest_bytes"]) / max(len(samples["rest_bytes"]), 1)
+        mcp_bytes = sum(samples["mcp_bytes"]) / max(len(samples["mcp_bytes"]), 1)
+        summary[label] = {
+            "iterations": len(samples["rest"]),
+            "rest_p50": percentile(samples["rest"], 50),
+            "rest_p95": percentile(samples["rest"], 95),
+            "mcp_p50": percentile(samples["mcp"], 50),
+            "mcp_p95": percentile(samples["mcp"], 95),
+            "overhead_p50": percentile(samples["overhead"], 50),
+            "overhead_p95": percentile(samples["overhead"], 95),
+            "avg_rest_bytes": rest_bytes,
+            "avg_mcp_bytes": mcp_bytes,
+            "bytes_ratio": mcp_bytes / rest_bytes if rest_bytes else None,
+            "rest_errors": samples["rest_errors"],
+            "mcp_errors": samples["mcp_errors"],
+        }
+    return summary
+
+def print_summary(summary: Dict):
+    print_header("MCP OVERHEAD SUMMARY", Colors.MAGENTA)
+    print(f"  {'scenario':34} {'REST p50':>9} {'MCP p50':>9} {'+p50':>8} {'+p95':>8} {'bytes':>7} {'errors':>9}")
+    for label, row in summary.items():
+        ratio = f"{row['bytes_ratio']:.1f}x" if row['bytes_ratio'] else "N/A"
+        print(f"  {label[:34]:34} {row['rest_p50']:8.3f}s {row['mcp_p50']:8.3f}s "
+              f"{Colors.CYAN}{row['overhead_p50']:+7.3f}s{Colors.NC} {row['overhead_p95']:+7.3f}s "
+              f"{ratio:>7} {row['rest_errors']:>4}/{row['mcp_errors']:<4}")
+    print(f"\n  +p50/+p95: paired MCP minus REST latency; bytes: MCP response size vs REST; errors: REST/MCP")
+
+def main(argv: List[str] = None):
+    """Run the MCP overhead benchmark"""
+    global API_BASE
+    parser = argparse.ArgumentParser(description="Measure MCP tool-call overhead against direct REST calls")
+    parser.add_argument("--api-base", default=API_BASE, help=f"REST API base URL (default: {API_BASE})")
+    parser.add_argument("--mcp-url", help="MCP endpoint (default: <api-base>/api/mcp; local server: http://localhost:8787/mcp)")
+    parser.add_argument("--iterations", type=int, default=10, help="Paired calls per scenario (default: 10)")
+    parser.add_argument("--include-orders", action="store_true",
+                        help="Also benchmark create_order (creates real orders through both paths)")
+    args = parser.parse_args(argv)
+    API_BASE = args.api_base.rstrip("/")
+    mcp_url = args.mcp_url or f"{API_BASE}/api/mcp"
+
+    print(f"{Colors.BOLD}{Colors.MAGENTA}")
+    print("=" * 70)
+    print("AI FOOD ORDERING - MCP TOOL-CALL OVERHEAD BENCHMARK".center(70))
+    print("=" * 70)
+    print(f"{Colors.NC}")
+    print(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"REST API: {API_BASE}")
+    print(f"MCP Endpoint: {mcp_url}")
+
+    try:
+        results = run_benchmark(mcp_url, args.iterations, args.include_orders)
+    except KeyboardInterrupt:
+        print(f"\n{Colors.YELLOW}⚠️  Benchmark interrupted by user{Colors.NC}")
+        return 2
+
+    summary = summarize(results)
+    print_summary(summary)
+    with open(RESULTS_FILE, 'w') as f:
+        json.dump({"api_base": API_BASE, "mcp_url": mcp_url, "summary": summary, "raw": results}, f, indent=2)
+    print(f"\n{Colors.GREEN}✅ Results saved to: {RESULTS_FILE}{Colors.NC}\n")
+    return 1 if any(row["mcp_errors"] for row in summary.values()) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
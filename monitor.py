@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Synthetic Monitor for AI Food Ordering System
+Long-running counterpart to comprehensive_test_suite.py: keeps one pooled
+keep-alive session warm and runs a small set of critical checks on a
+schedule (cities, search, intelligent search, order create + track). Each
+check feeds rolling SLO windows held in memory; breaches and recoveries are
+written as alerts to a JSONL file and, optionally, POSTed to a webhook.
+
+Usage:
+    python3 monitor.py                                   # every 60s, alerts to monitor_alerts.jsonl
+    python3 monitor.py --interval 30 --webhook http://localhost:9000/alerts
+    python3 monitor.py --cycles 10 --skip-orders
+"""
+
+import argparse
+import copy
+import json
+import os
+import signal
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from comprehensive_test_suite import (API_BASE, DEFAULT_DEADLINE, SAMPLE_ORDERS, Colors, decode_body,
+                                      percentile, send_request, validate_has_restaurants,
+                                      validate_list_not_empty, validate_order_created)
+
+ALERTS_FILE = "monitor_alerts.jsonl"
+STATUS_FILE = "monitor_status.json"
+
+# (check name, method, endpoint, validator); order create + track is handled separately
+CHECKS = [
+    ("cities", "GET", "/api/v1/cities", validate_list_not_empty),
+    ("search", "GET", "/api/v1/restaurants/search?city=New%20York", validate_list_not_empty),
+    ("intelligent_search", "GET", "/api/v1/search/intelligent?query=Pizza", validate_has_restaurants),
+]
+
+# p95 latency objective per check (seconds) and the error rate every check must stay under
+SLO_LATENCY = {
+    "cities": 1.0,
+    "search": 2.0,
+    "intelligent_search": 10.0,
+    "order_create": 3.0,
+    "order_track": 2.0,
+}
+SLO_ERROR_RATE = 0.05
+
+# Rolling windows (name, seconds); a window needs MIN_SAMPLES before it can alert,
+# or as many as the check's cadence can fit in it if that is fewer
+WINDOWS = (("5m", 300), ("1h", 3600))
+MIN_SAMPLES = 3
+ORDER_CHECKS = ("order_create", "order_track")
+
+class RollingWindow:
+    """Check results from the last `seconds` seconds"""
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.samples = deque()  # (timestamp, ok, latency)
+
+    def add(self, timestamp: float, ok: bool, latency: float):
+        self.samples.append((timestamp, ok, latency))
+        self._trim(timestamp)
+
+    def _trim(self, now: float):
+        while self.samples and self.samples[0][0] < now - self.seconds:
+            self.samples.popleft()
+
+    def stats(self, now: float) -> Dict:
+        self._trim(now)
+        latencies = [latency for _, _, latency in self.samples]
+        errors = sum(1 for _, ok, _ in self.samples if not ok)
+        return {
+            "samples": len(latencies),
+            "errors": errors,
+            "error_rate": errors / len(latencies) if latencies else 0.0,
+            "p50": percentile(latencies, 50),
+            "p95": percentile(latencies, 95),
+        }
+
+class AlertSink:
+    """Append alerts to a JSONL file and optionally POST them to a webhook"""
+
+    def __init__(self, path: str, webhook: Optional[str], session: requests.Session):
+        self.path = path
+        self.webhook = webhook
+        self.session = session
+
+    def emit(self, alert: Dict):
+        with open(self.path, 'a') as f:
+            f.write(json.dumps(alert) + "\n")
+        if self.webhook:
+            status_code, _, error = send_request("POST", self.webhook, alert, timeout=10, session=self.session)
+            if error is not None or status_code >= 300:
+                print(f"{Colors.YELLOW}⚠️  Webhook delivery failed: {error or status_code}{Colors.NC}")
+
+class Monitor:
+    """Scheduled synthetic checks over one warm connection pool"""
+
+    def __init__(self, api_base: str, sink_path: str, webhook: Optional[str] = None,
+                 order_every: int = 5, status_path: Optional[str] = STATUS_FILE, interval: float = 60):
+        self.api_base = api_base
+        self.order_every = order_every
+        self.interval = interval
+        self.status_path = status_path
+        self.session = requests.Session()
+        # Checks run one after another, so a small pool keeps every connection reused
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=4)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.sink = AlertSink(sink_path, webhook, self.session)
+        self.windows = {}   # check -> {window name: RollingWindow}
+        self.firing = {}    # (check, window, kind) -> alert that is currently open
+        self.cycles = 0
+        self.stop_event = threading.Event()
+
+    def request(self, method: str, endpoint: str, data: Dict = None,
+                validate: Callable = None) -> Tuple[bool, float, object, str]:
+        """Run one request; return (ok, latency, response data, message)"""
+        start_time = time.perf_counter()
+        status_code, body, error = send_request(method, f"{self.api_base}{endpoint}", data,
+                                                DEFAULT_DEADLINE, session=self.session)
+        latency = time.perf_counter() - start_time
+        if error is not None:
+            return False, latency, error, error["error"]
+        response_data = decode_body(body)
+        if status_code != 200:
+            return False, latency, response_data, f"HTTP {status_code}"
+        if validate:
+            valid, message = validate(response_data)
+            return valid, latency, response_data, message
+        return True, latency, response_data, "Valid"
+
+    def record(self, check: str, ok: bool, latency: float, timestamp: float):
+        if check not in self.windows:
+            self.windows[check] = {name: RollingWindow(seconds) for name, seconds in WINDOWS}
+        for window in self.windows[check].values():
+            window.add(timestamp, ok, latency)
+
+    def warmup(self):
+        """Open the pooled connection before the first measured cycle"""
+        self.request("GET", "/api/v1/cities")
+
+    def run_cycle(self) -> List[Tuple[str, bool, float, str]]:
+        """Run every check once and return (check, ok, latency, message) per check"""
+        outcomes = []
+        for check, method, endpoint, validate in CHECKS:
+            ok, latency, _, message = self.request(method, endpoint, validate=validate)
+            outcomes.append((check, ok, latency, message))
+
+        if self.order_every and self.cycles % self.order_every == 0:
+            order = copy.deepcopy(SAMPLE_ORDERS[0][1])
+            order["special_instructions"] = "synthetic monitor"
+            ok, latency, response_data, message = self.request("POST", "/api/v1/orders/create", order,
+                                                               validate_order_created)
+            outcomes.append(("order_create", ok, latency, message))
+            if ok:
+                ok, latency, _, message = self.request("GET", f"/api/v1/orders/{response_data['order_id']}")
+                outcomes.append(("order_track", ok, latency, message))
+
+        now = time.time()
+        for check, ok, latency, _ in outcomes:
+            self.record(check, ok, latency, now)
+        self.cycles += 1
+        return outcomes
+
+    def min_samples(self, check: str, seconds: float) -> int:
+        """Samples a window needs before it can alert, given how often the check runs"""
+        cadence = self.interval * (self.order_every if check in ORDER_CHECKS else 1)
+        return max(1, min(MIN_SAMPLES, int(seconds // cadence) if cadence > 0 else MIN_SAMPLES))
+
+    def evaluate(self) -> List[Dict]:
+        """Open alerts for new SLO breaches and resolve recovered ones"""
+        now = time.time()
+        changes = []
+        for check, windows in self.windows.items():
+            for window_name, window in windows.items():
+                stats = window.stats(now)
+                if stats["samples"] < self.min_samples(check, window.seconds):
+                    continue
+                breaches = {
+                    "latency": stats["p95"] > SLO_LATENCY.get(check, DEFAULT_DEADLINE),
+                    "errors": stats["error_rate"] > SLO_ERROR_RATE,
+                }
+                for kind, breached in breaches.items():
+                    key = (check, window_name, kind)
+                    if breached == (key in self.firing):
+                        continue
+                    alert = {
+                        "time": datetime.now().isoformat(timespec='seconds'),
+                        "state": "firing" if breached else "resolved",
+                        "check": check,
+                        "window": window_name,
+                        "kind": kind,
+                        "p95": stats["p95"],
+                        "p95_objective": SLO_LATENCY.get(check, DEFAULT_DEADLINE),
+                        "error_rate": stats["error_rate"],
+                        "error_rate_objective": SLO_ERROR_RATE,
+                        "samples": stats["samples"],
+                    }
+                    if breached:
+                        self.firing[key] = alert
+                    else:
+                        del self.firing[key]
+                    self.sink.emit(alert)
+                    changes.append(alert)
+        return changes
+
+    def write_status(self):
+        """Atomically replace the status file with the current window statistics"""
+        if not self.status_path:
+            return
+        now = time.time()
+        status = {
+            "updated": datetime.now().isoformat(timespec='seconds'),
+            "cycles": self.cycles,
+            "firing": list(self.firing.values()),
+            "checks": {check: {name: window.stats(now) for name, window in windows.items()}
+                       for check, windows in self.windows.items()},
+        }
+        tmp_path = self.status_path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(status, f, indent=2)
+        os.replace(tmp_path, self.status_path)
+
+    def run(self, max_cycles: int = 0):
+        """Run cycles every interval seconds until stopped (or max_cycles is reached)"""
+        interval = self.interval
+        self.warmup()
+        next_run = time.monotonic()
+        while not self.stop_event.is_set():
+            outcomes = self.run_cycle()
+            print_cycle(outcomes)
+            for alert in self.evaluate():
+                print_alert(alert)
+            self.write_status()
+            if max_cycles and self.cycles >= max_cycles:
+                break
+            # Stay on the schedule; if a cycle overran, skip the ticks it missed
+            next_run += interval
+            now = time.monotonic()
+            if next_run < now:
+                next_run += interval * ((now - next_run) // interval + 1)
+            self.stop_event.wait(next_run - now)
+        self.session.close()
+
+def print_cycle(outcomes: List[Tuple[str, bool, float, str]]):
+    parts = []
+    for check, ok, latency, message in outcomes:
+        color = Colors.GREEN if ok else Colors.RED
+        parts.append(f"{check} {color}{latency:.3f}s{Colors.NC}" + ("" if ok else f" ({message})"))
+    print(f"[{datetime.now().strftime('%H:%M:%S')}] " + "  ".join(parts))
+
+def print_alert(alert: Dict):
+    if alert["state"] == "firing":
+        print(f"{Colors.RED}🚨 SLO BREACH: {alert['check']} {alert['kind']} over {alert['window']} "
+              f"(p95 {alert['p95']:.3f}s, errors {alert['error_rate']*100:.1f}%){Colors.NC}")
+    else:
+        print(f"{Colors.GREEN}✅ RESOLVED: {alert['check']} {alert['kind']} over {alert['window']}{Colors.NC}")
+
+def main(argv: List[str] = None):
+    """Run the synthetic monitor until interrupted"""
+    parser = argparse.ArgumentParser(description="Run critical checks on a schedule with rolling SLO alerts")
+    parser.add_argument("--api-base", default=API_BASE, help=f"API base URL (default: {API_BASE})")
+    parser.add_argument("--interval", type=float, default=60, help="Seconds between cycles (default: 60)")
+    parser.add_argument("--cycles", type=int, default=0, help="Stop after N cycles (default: run forever)")
+    parser.add_argument("--alerts-file", default=ALERTS_FILE, help=f"Alert log (default: {ALERTS_FILE})")
+    parser.add_argument("--webhook", help="Also POST each alert as JSON to this URL")
+    parser.add_argument("--status-file", default=STATUS_FILE,
+                        help=f"Rolling window snapshot rewritten every cycle (default: {STATUS_FILE})")
+    parser.add_argument("--order-every", type=int, default=5,
+                        help="Create and track an order every N cycles (default: 5)")
+    parser.add_argument("--skip-orders", action="store_true", help="Never create orders")
+    args = parser.parse_args(argv)
+
+    monitor = Monitor(args.api_base.rstrip("/"), args.alerts_file, args.webhook,
+                      0 if args.skip_orders else args.order_every, args.status_file, args.interval)
+    signal.signal(signal.SIGTERM, lambda signum, frame: monitor.stop_event.set())
+
+    print(f"{Colors.BOLD}{Colors.MAGENTA}AI FOOD ORDERING - SYNTHETIC MONITOR{Colors.NC}")
+    print(f"API Base: {monitor.api_base}  Interval: {args.interval}s  Alerts: {args.alerts_file}"
+          + (f" + {args.webhook}" if args.webhook else ""))
+    try:
+        monitor.run(args.cycles)
+    except KeyboardInterrupt:
+        print(f"\n{Colors.YELLOW}⚠️  Monitor stopped{Colors.NC}")
+    return 1 if monitor.firing else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,413 @@
+#!/usr/bin/env python3
+"""
+Order Write Benchmarks for AI Food Ordering System
+throughput:  creates orders from many concurrent workers, deliberately
+             retries a share of them under the same Idempotency-Key, and
+             reconciles every returned order_id against /api/v1/orders/{id}
+             to find duplicates and lost orders.
+consistency: measures read-your-writes lag - how long a new order takes to
+             be visible with the right items and total - while background
+             read load runs, counting stale and missing reads.
+
+Usage:
+    python3 order_benchmark.py throughput --orders 200 --workers 16 --retry-rate 0.25
+    python3 order_benchmark.py consistency --probes 50 --background-workers 8
+"""
+
+import argparse
+import copy
+import json
+import random
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from comprehensive_test_suite import (API_BASE, CITIES, DEFAULT_DEADLINE, RUN_ID, SAMPLE_ORDERS, Colors,
+                                      decode_body, percentile, print_header, send_request)
+
+RESULTS_FILE = f"order_benchmark_{RUN_ID}.json"
+CREATE_ENDPOINT = "/api/v1/orders/create"
+
+# Read-your-writes lag histogram bucket upper bounds (seconds)
+LAG_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0)
+
+def order_total(order: Dict) -> float:
+    """Expected total of an order body (items only)"""
+    return round(sum(item["price"] * item["quantity"] for item in order["items"]), 2)
+
+def new_order(marker: str) -> Dict:
+    """A copy of a random sample order tagged with a unique marker"""
+    order = copy.deepcopy(random.choice(SAMPLE_ORDERS)[1])
+    order["special_instructions"] = f"benchmark {marker}"
+    return order
+
+def create_order(order: Dict, idempotency_key: str) -> Tuple[Optional[str], float, int]:
+    """POST one order attempt; return (order_id, latency, status code)"""
+    start_time = time.time()
+    status_code, body, error = send_request("POST", f"{API_BASE}{CREATE_ENDPOINT}", order,
+                                            DEFAULT_DEADLINE, {"Idempotency-Key": idempotency_key})
+    latency = time.time() - start_time
+    response_data = error if error is not None else decode_body(body)
+    order_id = response_data.get("order_id") if isinstance(response_data, dict) else None
+    return order_id, latency, status_code
+
+def fetch_order(order_id: str) -> Tuple[int, Dict, float]:
+    """GET an order; return (status code, response data, latency)"""
+    start_time = time.time()
+    status_code, body, error = send_request("GET", f"{API_BASE}/api/v1/orders/{order_id}")
+    latency = time.time() - start_time
+    return status_code, error if error is not None else decode_body(body), latency
+
+def order_matches(order: Dict, response_data: Dict) -> Optional[bool]:
+    """True when a fetched order has the items and total that were submitted
+
+    None when the response carries neither items nor a total, so there is
+    nothing to verify.
+    """
+    if not isinstance(response_data, dict):
+        return False
+    items = response_data.get("items")
+    total = response_data.get("total_amount", response_data.get("total"))
+    if items is None and total is None:
+        return None
+    if items is not None:
+        sent = sorted((i["item_id"], i["quantity"]) for i in order["items"])
+        got = sorted((i.get("item_id"), i.get("quantity")) for i in items if isinstance(i, dict))
+        if sent != got:
+            return False
+    # The API may add tax/fees on top; the item subtotal must never be missing
+    return total is None or float(total) + 0.005 >= order_total(order)
+
+# =============================================================================
+# THROUGHPUT + IDEMPOTENCY
+# =============================================================================
+
+class WriteStats:
+    """Thread-safe collector for order attempts"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = []
+        self.attempts = 0
+        self.errors = 0
+        self.retries = 0
+        self.orders = {}  # idempotency key -> {'order': body, 'order_ids': [...]}
+
+    def record(self, key: str, order: Dict, order_id: Optional[str], latency: float,
+               status_code: int, retry: bool):
+        with self.lock:
+            self.attempts += 1
+            self.latencies.append(latency)
+            if retry:
+                self.retries += 1
+            entry = self.orders.setdefault(key, {"order": order, "order_ids": []})
+            if status_code == 200 and order_id:
+                entry["order_ids"].append(order_id)
+            else:
+                self.errors += 1
+
+def place_order(stats: WriteStats, retry_rate: float, max_retries: int):
+    """One logical order: create, retry on failure, and sometimes resend on purpose"""
+    key = str(uuid.uuid4())
+    order = new_order(key)
+    order_id = None
+    for attempt in range(max_retries + 1):
+        order_id, latency, status_code = create_order(order, key)
+        stats.record(key, order, order_id, latency, status_code, retry=attempt > 0)
+        if status_code == 200 and order_id:
+            break
+    # Simulate a client that never saw the response and retries anyway
+    if order_id and random.random() < retry_rate:
+        order_id, latency, status_code = create_order(order, key)
+        stats.record(key, order, order_id, latency, status_code, retry=True)
+
+def reconcile(stats: WriteStats, workers: int) -> Dict:
+    """Check every returned order_id against the tracking endpoint"""
+    duplicates = {key: sorted(set(entry["order_ids"])) for key, entry in stats.orders.items()
+                  if len(set(entry["order_ids"])) > 1}
+    owners = {}
+    for key, entry in stats.orders.items():
+        for order_id in set(entry["order_ids"]):
+            owners.setdefault(order_id, []).append(key)
+    collisions = {order_id: keys for order_id, keys in owners.items() if len(keys) > 1}
+
+    lost, mismatched, unverified = [], [], []
+    def check(order_id: str):
+        status_code, response_data, _ = fetch_order(order_id)
+        order = stats.orders[owners[order_id][0]]["order"]
+        if status_code == 404:
+            lost.append(order_id)
+            return
+        matched = order_matches(order, response_data) if status_code == 200 else False
+        if matched is None:
+            unverified.append(order_id)
+        elif not matched:
+            mismatched.append(order_id)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(check, owners))
+
+    return {
+        "logical_orders": len(stats.orders),
+        "never_created": sum(1 for entry in stats.orders.values() if not entry["order_ids"]),
+        "distinct_order_ids": len(owners),
+        "duplicate_orders": len(duplicates),
+        "duplicates": duplicates,
+        "id_collisions": collisions,
+        "lost_orders": sorted(lost),
+        "mismatched_orders": sorted(mismatched),
+        "unverified_orders": sorted(unverified),
+    }
+
+def run_throughput(args) -> Dict:
+    """Create orders from concurrent workers and reconcile them"""
+    stats = WriteStats()
+    print_header(f"ORDER WRITES: {args.orders} orders, {args.workers} workers")
+    start_time = time.time()
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        futures = [pool.submit(place_order, stats, args.retry_rate, args.max_retries)
+                   for _ in range(args.orders)]
+        for i, future in enumerate(futures, 1):
+            future.result()
+            if i % max(args.orders // 10, 1) == 0:
+                print(f"  {i}/{args.orders} orders placed")
+    elapsed = time.time() - start_time
+    created = sum(1 for entry in stats.orders.values() if entry["order_ids"])
+
+    print_header("RECONCILIATION")
+    reconciliation = reconcile(stats, args.workers)
+    summary = {
+        "orders_requested": args.orders,
+        "orders_created": created,
+        "attempts": stats.attempts,
+        "retries": stats.retries,
+        "errors": stats.errors,
+        "elapsed": elapsed,
+        "orders_per_sec": created / elapsed if elapsed else 0,
+        "attempts_per_sec": stats.attempts / elapsed if elapsed else 0,
+        **{f"p{p}": percentile(stats.latencies, p) for p in (50, 90, 95, 99)},
+        "max": max(stats.latencies) if stats.latencies else None,
+        **reconciliation,
+    }
+
+    print(f"Orders Created: {Colors.BOLD}{created}/{args.orders}{Colors.NC} in {elapsed:.2f}s")
+    print(f"Throughput: {Colors.CYAN}{summary['orders_per_sec']:.2f} orders/s{Colors.NC} "
+          f"({summary['attempts_per_sec']:.2f} attempts/s, {stats.retries} retries, {stats.errors} errors)")
+    if stats.latencies:
+        print(f"Latency: p50 {summary['p50']:.3f}s  p90 {summary['p90']:.3f}s  "
+              f"p95 {summary['p95']:.3f}s  p99 {summary['p99']:.3f}s  max {summary['max']:.3f}s")
+    problems = (reconciliation["duplicate_orders"], len(reconciliation["id_collisions"]),
+                len(reconciliation["lost_orders"]), len(reconciliation["mismatched_orders"]))
+    color = Colors.GREEN if not any(problems) else Colors.RED
+    print(f"Duplicates (retry created a second order): {color}{problems[0]}{Colors.NC}")
+    print(f"order_id collisions (two orders, one id): {color}{problems[1]}{Colors.NC}")
+    print(f"Lost (created but not found): {color}{problems[2]}{Colors.NC}")
+    print(f"Mismatched items/total: {color}{problems[3]}{Colors.NC}")
+    if reconciliation["unverified_orders"]:
+        print(f"{Colors.YELLOW}⚠️  Unverified (no items or total returned): "
+              f"{len(reconciliation['unverified_orders'])}{Colors.NC}")
+    summary["ok"] = not any(problems) and created == args.orders
+    return summary
+
+# =============================================================================
+# READ-YOUR-WRITES CONSISTENCY
+# =============================================================================
+
+def background_load(stop: threading.Event, counter: List[int], lock: threading.Lock):
+    """Keep read traffic flowing until stop is set"""
+    endpoints = ["/api/v1/cities"] + [
+        f"/api/v1/restaurants/search?city={city.replace(' ', '%20')}" for city in CITIES
+    ] + ["/api/v1/search/intelligent?query=Chicken%20Tikka%20Masala"]
+    while not stop.is_set():
+        send_request("GET", f"{API_BASE}{random.choice(endpoints)}")
+        with lock:
+            counter[0] += 1
+
+def probe_order(poll_interval: float, timeout: float, confirm_reads: int) -> Dict:
+    """Create one order and poll until it reads back correctly"""
+    key = str(uuid.uuid4())
+    order = new_order(key)
+    order_id, create_latency, status_code = create_order(order, key)
+    probe = {"order_id": order_id, "create_latency": create_latency, "lag": None, "read_rtt": None,
+             "reads": 0, "stale_reads": 0, "missing_reads": 0, "error_reads": 0, "unverified_reads": 0,
+             "regressions": 0}
+    if status_code != 200 or not order_id:
+        probe["create_failed"] = True
+        return probe
+
+    last_read = {}
+
+    def read() -> bool:
+        last_read["started"] = time.time()
+        status_code, response_data, last_read["rtt"] = fetch_order(order_id)
+        probe["reads"] += 1
+        if status_code == 404:
+            probe["missing_reads"] += 1
+            return False
+        if status_code != 200:
+            probe["error_reads"] += 1
+            return False
+        matched = order_matches(order, response_data)
+        if matched is False:
+            probe["stale_reads"] += 1
+            return False
+        if matched is None:
+            probe["unverified_reads"] += 1
+        return True
+
+    created_at = time.time()
+    while time.time() - created_at < timeout:
+        if read():
+            # Measured to when the successful read was sent, so its round trip is not counted as lag
+            probe["lag"] = max(last_read["started"] - created_at, 0.0)
+            probe["read_rtt"] = last_read["rtt"]
+            break
+        time.sleep(poll_interval)
+    # Once visible, an order must stay visible (another instance may not have it)
+    if probe["lag"] is not None:
+        for _ in range(confirm_reads):
+            if not read():
+                probe["regressions"] += 1
+    return probe
+
+def lag_histogram(lags: List[float], never: int) -> List[Tuple[str, int]]:
+    """Counts per LAG_BUCKETS bucket plus orders that never became visible"""
+    counts = [0] * len(LAG_BUCKETS)
+    overflow = 0
+    for lag in lags:
+        for i, bound in enumerate(LAG_BUCKETS):
+            if lag <= bound:
+                counts[i] += 1
+                break
+        else:
+            overflow += 1
+    rows = [(f"<= {bound*1000:.0f}ms" if bound < 1 else f"<= {bound:.0f}s", count)
+            for bound, count in zip(LAG_BUCKETS, counts)]
+    return rows + [(f"> {LAG_BUCKETS[-1]:.0f}s", overflow), ("never", never)]
+
+def run_consistency(args) -> Dict:
+    """Probe read-your-writes lag under concurrent read load"""
+    stop = threading.Event()
+    counter, lock = [0], threading.Lock()
+    load_threads = [threading.Thread(target=background_load, args=(stop, counter, lock), daemon=True)
+                    for _ in range(args.background_workers)]
+    print_header(f"READ-YOUR-WRITES: {args.probes} probes, {args.background_workers} background readers")
+    for thread in load_threads:
+        thread.start()
+
+    probes = []
+    start_time = time.time()
+    try:
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            futures = [pool.submit(probe_order, args.poll_interval, args.timeout, args.confirm_reads)
+                       for _ in range(args.probes)]
+            for i, future in enumerate(futures, 1):
+                probe = future.result()
+                probes.append(probe)
+                lag = f"{probe['lag']*1000:.1f}ms" if probe["lag"] is not None else "not visible"
+                print(f"  Probe #{i}: {probe['order_id'] or 'create failed'} -> {lag} "
+                      f"({probe['reads']} reads, {probe['stale_reads']} stale, {probe['missing_reads']} missing)")
+    finally:
+        stop.set()
+        for thread in load_threads:
+            thread.join()
+    elapsed = time.time() - start_time
+
+    created = [p for p in probes if not p.get("create_failed")]
+    lags = [p["lag"] for p in created if p["lag"] is not None]
+    never = len(created) - len(lags)
+    histogram = lag_histogram(lags, never)
+    summary = {
+        "probes": args.probes,
+        "create_failures": len(probes) - len(created),
+        "visible": len(lags),
+        "never_visible": never,
+        "reads": sum(p["reads"] for p in created),
+        "stale_reads": sum(p["stale_reads"] for p in created),
+        "missing_reads": sum(p["missing_reads"] for p in created),
+        "error_reads": sum(p["error_reads"] for p in created),
+        "unverified_reads": sum(p["unverified_reads"] for p in created),
+        "regressions": sum(p["regressions"] for p in created),
+        "background_requests": counter[0],
+        "background_rps": counter[0] / elapsed if elapsed else 0,
+        **{f"lag_p{p}": percentile(lags, p) for p in (50, 95, 99)},
+        "lag_max": max(lags) if lags else None,
+        "read_rtt_p50": percentile([p["read_rtt"] for p in created if p["read_rtt"] is not None], 50),
+        "histogram": dict(histogram),
+        "probe_details": probes,
+    }
+
+    print_header("READ-YOUR-WRITES SUMMARY", Colors.MAGENTA)
+    print(f"Visible: {Colors.BOLD}{len(lags)}/{len(created)}{Colors.NC} orders "
+          f"({summary['create_failures']} create failures)")
+    if lags:
+        print(f"Lag: p50 {summary['lag_p50']*1000:.1f}ms  p95 {summary['lag_p95']*1000:.1f}ms  "
+              f"p99 {summary['lag_p99']*1000:.1f}ms  max {summary['lag_max']*1000:.1f}ms  "
+              f"(read RTT p50 {summary['read_rtt_p50']*1000:.1f}ms, not included)")
+    bad = summary["stale_reads"] + summary["missing_reads"] + summary["regressions"]
+    color = Colors.GREEN if not bad and not never else Colors.RED
+    print(f"Reads: {summary['reads']}  stale: {color}{summary['stale_reads']}{Colors.NC}  "
+          f"missing: {color}{summary['missing_reads']}{Colors.NC}  errors: {summary['error_reads']}  "
+          f"regressions after visible: {color}{summary['regressions']}{Colors.NC}")
+    if summary["unverified_reads"]:
+        print(f"{Colors.YELLOW}⚠️  {summary['unverified_reads']} reads had no items or total to verify; "
+              f"they count as visible but unverified{Colors.NC}")
+    print(f"Background load: {counter[0]} requests ({summary['background_rps']:.1f} req/s)\n")
+    width = max(count for _, count in histogram) or 1
+    for label, count in histogram:
+        print(f"  {label:>9} {count:5d} {'#' * round(count / width * 40)}")
+    summary["ok"] = not bad and not never and not summary["create_failures"]
+    return summary
+
+# =============================================================================
+# MAIN
+# =============================================================================
+
+def main(argv: List[str] = None):
+    """Run an order benchmark"""
+    global API_BASE
+    parser = argparse.ArgumentParser(description="Order creation throughput and consistency benchmarks")
+    parser.add_argument("--api-base", default=API_BASE, help=f"API base URL (default: {API_BASE})")
+    commands = parser.add_subparsers(dest="command", required=True)
+    throughput = commands.add_parser("throughput", help="Concurrent writes with idempotent retries")
+    throughput.add_argument("--orders", type=int, default=100, help="Logical orders to create (default: 100)")
+    throughput.add_argument("--workers", type=int, default=10, help="Concurrent workers (default: 10)")
+    throughput.add_argument("--retry-rate", type=float, default=0.2,
+                            help="Share of orders resent on purpose with the same Idempotency-Key (default: 0.2)")
+    throughput.add_argument("--max-retries", type=int, default=2, help="Retries after a failed attempt (default: 2)")
+    consistency = commands.add_parser("consistency", help="Read-your-writes lag under concurrent load")
+    consistency.add_argument("--probes", type=int, default=30, help="Orders to create and probe (default: 30)")
+    consistency.add_argument("--concurrency", type=int, default=2, help="Probes in flight at once (default: 2)")
+    consistency.add_argument("--background-workers", type=int, default=4,
+                             help="Threads generating read load during the probe (default: 4)")
+    consistency.add_argument("--poll-interval", type=float, default=0.05, help="Seconds between reads (default: 0.05)")
+    consistency.add_argument("--timeout", type=float, default=10, help="Give up on an order after this many seconds (default: 10)")
+    consistency.add_argument("--confirm-reads", type=int, default=3,
+                             help="Extra reads after first visibility to catch regressions (default: 3)")
+    args = parser.parse_args(argv)
+    API_BASE = args.api_base.rstrip("/")
+
+    print(f"{Colors.BOLD}{Colors.MAGENTA}")
+    print("=" * 70)
+    print(f"AI FOOD ORDERING - ORDER {args.command.upper()} BENCHMARK".center(70))
+    print("=" * 70)
+    print(f"{Colors.NC}")
+    print(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"API Base: {API_BASE}")
+
+    try:
+        summary = run_throughput(args) if args.command == "throughput" else run_consistency(args)
+    except KeyboardInterrupt:
+        print(f"\n{Colors.YELLOW}⚠️  Benchmark interrupted by user{Colors.NC}")
+        return 2
+
+    with open(RESULTS_FILE, 'w') as f:
+        json.dump({"command": args.command, "api_base": API_BASE, "summary": summary}, f, indent=2)
+    print(f"\n{Colors.GREEN}✅ Results saved to: {RESULTS_FILE}{Colors.NC}\n")
+    return 0 if summary["ok"] else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
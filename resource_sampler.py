@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Load-Generator Resource Sampler for the AI Food Ordering Test Suite
+Samples the client process in a background thread - CPU, RSS, open sockets
+and scheduler lag (how late the sampler thread wakes up, the threaded
+equivalent of event-loop lag) - and flags when the load generator itself is
+saturated, so latency numbers measured during saturation are not trusted.
+
+Uses psutil when installed and /proc (Linux) otherwise.
+"""
+
+import os
+import resource
+import sys
+import threading
+import time
+from typing import Dict, List, Optional
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# Saturation thresholds: Python threads share one GIL, so one core is the ceiling
+CPU_SATURATION_PERCENT = 85.0
+LAG_SATURATION_SECONDS = 0.05
+# A run is invalid when more than this share of requests started while saturated
+INVALID_REQUEST_SHARE = 0.05
+
+def _rss_bytes() -> int:
+    """Resident set size of this process"""
+    if psutil:
+        return psutil.Process().memory_info().rss
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except OSError:
+        # Peak, not current, but better than nothing (KB on Linux, bytes on macOS)
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return max_rss * 1024 if sys.platform.startswith("linux") else max_rss
+
+def _open_sockets() -> Optional[int]:
+    """Number of sockets held by this process, or None if unknown"""
+    try:
+        fds = os.listdir('/proc/self/fd')
+    except OSError:
+        fds = None
+    if fds is not None:
+        sockets = 0
+        for fd in fds:
+            try:
+                sockets += os.readlink(f'/proc/self/fd/{fd}').startswith('socket:')
+            except OSError:
+                # Closed since the listing, e.g. the descriptor listdir itself used
+                continue
+        return sockets
+    if psutil:
+        try:
+            return len(psutil.Process().net_connections())
+        except (psutil.Error, AttributeError):
+            return None
+    return None
+
+class ResourceSampler:
+    """Background sampler with a saturation flag and optional throttle"""
+
+    def __init__(self, interval: float = 0.5, auto_throttle: bool = False):
+        self.interval = interval
+        self.auto_throttle = auto_throttle
+        self.samples = []  # dicts: t, cpu_percent, rss, sockets, lag, saturated
+        self.saturated = False
+        self.requests = 0
+        self.saturated_requests = 0
+        self.throttled_time = 0.0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="resource-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def _run(self):
+        last_wall = time.perf_counter()
+        last_cpu = time.process_time()
+        while True:
+            expected = time.perf_counter() + self.interval
+            if self._stop.wait(self.interval):
+                return
+            now = time.perf_counter()
+            cpu = time.process_time()
+            lag = max(now - expected, 0.0)
+            cpu_percent = (cpu - last_cpu) / (now - last_wall) * 100 if now > last_wall else 0.0
+            last_wall, last_cpu = now, cpu
+            saturated = cpu_percent >= CPU_SATURATION_PERCENT or lag >= LAG_SATURATION_SECONDS
+            sample = {
+                't': time.time(),
+                'cpu_percent': round(cpu_percent, 1),
+                'rss': _rss_bytes(),
+                'sockets': _open_sockets(),
+                'lag': round(lag, 4),
+                'saturated': saturated,
+            }
+            with self._lock:
+                self.samples.append(sample)
+                self.saturated = saturated
+
+    def before_request(self) -> bool:
+        """Count a request start; with auto-throttle, wait out saturation first
+
+        Returns True if the request starts while the client is saturated.
+        """
+        if self.auto_throttle and self.saturated:
+            start = time.perf_counter()
+            # Back off for up to a few sampling intervals to let the client drain
+            deadline = start + self.interval * 4
+            while self.saturated and time.perf_counter() < deadline:
+                time.sleep(self.interval / 4)
+            self.throttled_time += time.perf_counter() - start
+        with self._lock:
+            self.requests += 1
+            if self.saturated:
+                self.saturated_requests += 1
+            return self.saturated
+
+    def get_summary(self) -> Dict:
+        with self._lock:
+            samples = list(self.samples)
+            requests, saturated_requests = self.requests, self.saturated_requests
+        cpu = [s['cpu_percent'] for s in samples]
+        lag = [s['lag'] for s in samples]
+        sockets = [s['sockets'] for s in samples if s['sockets'] is not None]
+        share = saturated_requests / requests if requests else 0.0
+        return {
+            'samples': len(samples),
+            'interval': self.interval,
+            'avg_cpu_percent': round(sum(cpu) / len(cpu), 1) if cpu else None,
+            'max_cpu_percent': max(cpu) if cpu else None,
+            'max_rss_mb': round(max(s['rss'] for s in samples) / 2**20, 1) if samples else None,
+            'max_sockets': max(sockets) if sockets else None,
+            'max_lag': max(lag) if lag else None,
+            'saturated_samples': sum(1 for s in samples if s['saturated']),
+            'saturated_requests': saturated_requests,
+            'saturated_request_share': f"{share*100:.2f}%",
+            'throttled_time': f"{self.throttled_time:.2f}s",
+            'run_valid': share <= INVALID_REQUEST_SHARE,
+        }
+
+    def timeline(self) -> List[Dict]:
+        """All samples, for storing next to the request timings"""
+        with self._lock:
+            return list(self.samples)
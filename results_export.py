@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Columnar Results Export for the AI Food Ordering Test Suite
+Writes one row per request to an append-only dataset partitioned by date,
+so months of runs can be queried with Arrow/Parquet tooling (pyarrow,
+pandas, DuckDB, Polars) instead of parsing test_results_*.json files.
+
+Dataset layout:
+    <dataset>/date=YYYY-MM-DD/run_<run_id>.parquet   (or .arrow)
+
+Requires pyarrow (pip install pyarrow).
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List
+
+from comprehensive_test_suite import route_key
+
+# Rows are written in batches so million-request runs never sit in memory twice
+BATCH_SIZE = 50000
+
+def _require_pyarrow():
+    """Import pyarrow or explain how to get it"""
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("pyarrow is required for columnar export (pip install pyarrow)")
+    return pyarrow
+
+def schema():
+    """Arrow schema for one request row"""
+    pa = _require_pyarrow()
+    return pa.schema([
+        ('run_id', pa.string()),
+        ('test_num', pa.int32()),
+        ('test_name', pa.string()),
+        ('category', pa.string()),
+        ('method', pa.string()),
+        ('endpoint', pa.string()),
+        ('route', pa.string()),
+        ('status', pa.string()),
+        ('http_status', pa.int16()),
+        ('started_at', pa.timestamp('us', tz='UTC')),
+        ('response_time', pa.float64()),
+        ('decode_time', pa.float64()),
+        ('response_bytes', pa.int64()),
+        ('result_count', pa.int32()),
+    ])
+
+def to_row(test_data: Dict, run_id: str) -> Dict:
+    """Map a test dict (from a results file or TestResults) to a dataset row"""
+    started_at = test_data.get('started_at')
+    return {
+        'run_id': run_id,
+        'test_num': test_data.get('test_num'),
+        'test_name': test_data.get('test_name'),
+        'category': test_data.get('category'),
+        'method': test_data.get('method'),
+        'endpoint': test_data.get('endpoint'),
+        'route': route_key(test_data.get('endpoint', '')),
+        'status': test_data.get('status'),
+        'http_status': test_data.get('http_status'),
+        'started_at': datetime.fromtimestamp(started_at, timezone.utc) if started_at else None,
+        'response_time': test_data.get('response_time'),
+        'decode_time': test_data.get('decode_time'),
+        'response_bytes': test_data.get('response_bytes'),
+        'result_count': test_data.get('result_count'),
+    }
+
+def run_date(run_id: str) -> str:
+    """Partition date (YYYY-MM-DD) for a YYYYMMDD_HHMMSS run id"""
+    return datetime.strptime(run_id, '%Y%m%d_%H%M%S').strftime('%Y-%m-%d')
+
+def export_run(tests: Iterable[Dict], run_id: str, dataset_dir: str, fmt: str = 'parquet') -> str:
+    """Append one run to the dataset and return the file written
+
+    Files are never overwritten: exporting the same run id twice is an error.
+    """
+    pa = _require_pyarrow()
+    partition = os.path.join(dataset_dir, f"date={run_date(run_id)}")
+    os.makedirs(partition, exist_ok=True)
+    path = os.path.join(partition, f"run_{run_id}.{fmt}")
+    if os.path.exists(path):
+        raise FileExistsError(f"{path} already exists (dataset is append-only)")
+
+    row_schema = schema()
+    tmp_path = path + ".tmp"
+    if fmt == 'parquet':
+        writer = pa.parquet.ParquetWriter(tmp_path, row_schema, compression='zstd')
+    elif fmt == 'arrow':
+        writer = pa.ipc.new_file(tmp_path, row_schema)
+    else:
+        raise ValueError(f"Unsupported format: {fmt}")
+
+    with writer:
+        batch = []
+        for test_data in tests:
+            batch.append(to_row(test_data, run_id))
+            if len(batch) >= BATCH_SIZE:
+                writer.write_batch(pa.RecordBatch.from_pylist(batch, schema=row_schema))
+                batch = []
+        if batch:
+            writer.write_batch(pa.RecordBatch.from_pylist(batch, schema=row_schema))
+
+    # Readers of the dataset never see a half-written file
+    os.replace(tmp_path, path)
+    return path
+
+def run_id_from_path(path: str) -> str:
+    """Extract the YYYYMMDD_HHMMSS run id from a test_results_*.json file name"""
+    match = re.search(r'(\d{8}_\d{6})', os.path.basename(path))
+    if not match:
+        raise ValueError(f"Cannot find a run id (YYYYMMDD_HHMMSS) in {path}")
+    return match.group(1)
+
+def import_results_file(path: str, dataset_dir: str, fmt: str = 'parquet') -> str:
+    """Backfill the dataset from an existing test_results_*.json file"""
+    with open(path) as f:
+        tests = json.load(f)['tests']
+    return export_run(tests, run_id_from_path(path), dataset_dir, fmt)
+
+def read_dataset(dataset_dir: str):
+    """Load every run in the dataset as one pyarrow Table"""
+    pa = _require_pyarrow()
+    import pyarrow.dataset as ds
+    files = {'parquet': [], 'arrow': []}
+    for root, _, names in os.walk(dataset_dir):
+        for name in sorted(names):
+            fmt = name.rsplit('.', 1)[-1]
+            if fmt in files:
+                files[fmt].append(os.path.join(root, name))
+    tables = [ds.dataset(paths, format='ipc' if fmt == 'arrow' else fmt, schema=schema()).to_table()
+              for fmt, paths in files.items() if paths]
+    if not tables:
+        return schema().empty_table()
+    return pa.concat_tables(tables)
+
+def main(argv: List[str] = None):
+    """Backfill a dataset from existing results files"""
+    parser = argparse.ArgumentParser(description="Export test_results_*.json files to a columnar dataset")
+    parser.add_argument("results_files", nargs="+", help="test_results_YYYYMMDD_HHMMSS.json files")
+    parser.add_argument("--dataset", default="results_dataset", help="Dataset directory (default: results_dataset)")
+    parser.add_argument("--format", choices=("parquet", "arrow"), default="parquet")
+    args = parser.parse_args(argv)
+
+    failed = 0
+    for path in args.results_files:
+        try:
+            print(f"✅ {path} -> {import_results_file(path, args.dataset, args.format)}")
+        except (ValueError, KeyError, OSError) as e:
+            print(f"❌ {path}: {e}")
+            failed += 1
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,635 @@
+#!/usr/bin/env python3
+"""
+Vectorized Statistics Engine for AI Food Ordering Test Results
+Loads results (test_results_*.json files or a results_export dataset) into
+NumPy arrays and computes grouped percentiles, time-bucketed request and
+error rates, rolling windows and latency CDFs without per-sample Python loops.
+The heatmap command lays search latency out as a city × cuisine matrix and
+flags cells, cities and cuisines that are robust-z outliers.
+
+Usage:
+    python3 stats_report.py report test_results_*.json
+    python3 stats_report.py report --dataset results_dataset --bucket 300 --json report.json
+    python3 stats_report.py heatmap test_results_*.json --html heatmap.html
+    python3 stats_report.py heatmap --sample 5 --percentile 90
+
+Requires numpy (pip install numpy); --dataset also needs pyarrow.
+"""
+
+import argparse
+import html
+import json
+import random
+import sys
+import time
+import warnings
+from typing import Dict, List, Sequence
+from urllib.parse import parse_qs, urlencode
+
+import numpy as np
+import requests
+
+from comprehensive_test_suite import (API_BASE, CITIES, CUISINES, Colors, decode_body, print_header, route_key,
+                                      send_request)
+
+PERCENTILES = (50, 90, 95, 99)
+CDF_THRESHOLDS = (0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0)
+
+# =============================================================================
+# LOADING
+# =============================================================================
+
+def _encode(labels: Sequence) -> (np.ndarray, np.ndarray):
+    """Return (codes, names) so labels == names[codes]"""
+    names, codes = np.unique(np.asarray(labels, dtype=str), return_inverse=True)
+    return codes.astype(np.int32), names
+
+def load_results_files(paths: List[str]) -> Dict[str, np.ndarray]:
+    """Load test_results_*.json files into column arrays"""
+    endpoints, categories, statuses, run_ids = [], [], [], []
+    response_times, started_at, response_bytes = [], [], []
+    for path in paths:
+        with open(path) as f:
+            tests = json.load(f)['tests']
+        for test in tests:
+            if test.get('carried_from'):
+                # Measured in an earlier run; counting it again would skew the statistics
+                continue
+            endpoints.append(test['endpoint'])
+            categories.append(test.get('category') or '')
+            statuses.append(test['status'])
+            run_ids.append(path)
+            response_times.append(test['response_time'])
+            started_at.append(test.get('started_at') or np.nan)
+            response_bytes.append(test.get('response_bytes', -1))
+    return _columns([route_key(e) for e in endpoints], categories, statuses, run_ids,
+                    response_times, started_at, response_bytes)
+
+def load_dataset(dataset_dir: str) -> Dict[str, np.ndarray]:
+    """Load a results_export dataset into column arrays"""
+    from results_export import read_dataset
+    table = read_dataset(dataset_dir)
+    # Microseconds since the epoch; missing timestamps become NaN
+    started_at = table.column('started_at').cast('int64').to_numpy(zero_copy_only=False).astype(np.float64) / 1e6
+    return _columns(table.column('route').to_pylist(),
+                    [c or '' for c in table.column('category').to_pylist()],
+                    table.column('status').to_pylist(),
+                    table.column('run_id').to_pylist(),
+                    table.column('response_time').to_numpy(zero_copy_only=False),
+                    started_at,
+                    table.column('response_bytes').fill_null(-1).to_numpy(zero_copy_only=False))
+
+def _columns(routes, categories, statuses, run_ids, response_times, started_at, response_bytes) -> Dict[str, np.ndarray]:
+    route_codes, route_names = _encode(routes)
+    category_codes, category_names = _encode(categories)
+    run_codes, run_names = _encode(run_ids)
+    return {
+        'route': route_codes,
+        'route_names': route_names,
+        'category': category_codes,
+        'category_names': category_names,
+        'run': run_codes,
+        'run_names': run_names,
+        'failed': np.asarray(statuses) != 'PASS',
+        'response_time': np.asarray(response_times, dtype=np.float64),
+        'started_at': np.asarray(started_at, dtype=np.float64),
+        'response_bytes': np.asarray(response_bytes, dtype=np.int64),
+    }
+
+# =============================================================================
+# VECTORIZED STATISTICS
+# =============================================================================
+
+def grouped_percentiles(codes: np.ndarray, values: np.ndarray, n_groups: int,
+                        percentiles: Sequence[float] = PERCENTILES) -> Dict[str, np.ndarray]:
+    """Per-group count, mean and percentiles (linear interpolation) in one sort
+
+    Groups with no samples get NaN statistics.
+    """
+    order = np.lexsort((values, codes))
+    sorted_values = values[order]
+    counts = np.bincount(codes, minlength=n_groups)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    present = counts > 0
+    stats = {
+        'count': counts,
+        'mean': np.divide(np.bincount(codes, weights=values, minlength=n_groups), counts,
+                          out=np.full(n_groups, np.nan), where=present),
+    }
+    if not len(values):
+        stats.update({f'p{pct:g}': np.full(n_groups, np.nan) for pct in percentiles})
+        stats['max'] = np.full(n_groups, np.nan)
+        return stats
+    # Empty groups point past the end; clamp and mask them out afterwards
+    last = np.maximum(counts - 1, 0)
+    end = len(sorted_values) - 1
+    for pct in percentiles:
+        rank = last * pct / 100
+        lower = np.floor(rank).astype(np.int64)
+        upper = np.minimum(lower + 1, last)
+        lo_values = sorted_values[np.minimum(starts + lower, end)]
+        hi_values = sorted_values[np.minimum(starts + upper, end)]
+        stats[f'p{pct:g}'] = np.where(present, lo_values + (hi_values - lo_values) * (rank - lower), np.nan)
+    stats['max'] = np.where(present, sorted_values[np.minimum(starts + last, end)], np.nan)
+    return stats
+
+def error_rates(codes: np.ndarray, failed: np.ndarray, n_groups: int) -> np.ndarray:
+    """Fraction of failed requests per group"""
+    counts = np.bincount(codes, minlength=n_groups)
+    errors = np.bincount(codes, weights=failed.astype(np.float64), minlength=n_groups)
+    return np.divide(errors, counts, out=np.full(n_groups, np.nan), where=counts > 0)
+
+def time_buckets(started_at: np.ndarray, bucket_seconds: float) -> (np.ndarray, np.ndarray, float):
+    """Assign each timed sample to a fixed-width bucket
+
+    Returns (mask of timed samples, bucket index per timed sample, start time).
+    """
+    timed = ~np.isnan(started_at)
+    if not timed.any():
+        return timed, np.zeros(0, dtype=np.int64), np.nan
+    start = started_at[timed].min()
+    return timed, ((started_at[timed] - start) // bucket_seconds).astype(np.int64), start
+
+def rolling_mean(sums: np.ndarray, counts: np.ndarray, window: int) -> np.ndarray:
+    """Mean over the trailing window of buckets (sample weighted)"""
+    kernel = np.ones(window)
+    window_sums = np.convolve(sums, kernel)[:len(sums)]
+    window_counts = np.convolve(counts, kernel)[:len(counts)]
+    return np.divide(window_sums, window_counts, out=np.full(len(sums), np.nan), where=window_counts > 0)
+
+def time_series(columns: Dict[str, np.ndarray], bucket_seconds: float, window: int) -> Dict[str, np.ndarray]:
+    """Request rate, error rate, p95 and rolling mean latency per time bucket"""
+    timed, buckets, start = time_buckets(columns['started_at'], bucket_seconds)
+    if not len(buckets):
+        return {}
+    n_buckets = buckets.max() + 1
+    latencies = columns['response_time'][timed]
+    failed = columns['failed'][timed]
+    stats = grouped_percentiles(buckets, latencies, n_buckets, (95,))
+    counts = stats['count'].astype(np.float64)
+    return {
+        'bucket_start': start + np.arange(n_buckets) * bucket_seconds,
+        'requests': stats['count'],
+        'rps': counts / bucket_seconds,
+        'error_rate': error_rates(buckets, failed, n_buckets),
+        'p95': stats['p95'],
+        'rolling_mean': rolling_mean(np.bincount(buckets, weights=latencies, minlength=n_buckets),
+                                     counts, window),
+    }
+
+def latency_cdf(values: np.ndarray, thresholds: Sequence[float] = CDF_THRESHOLDS) -> Dict[str, np.ndarray]:
+    """Empirical CDF at fixed thresholds plus a quantile grid"""
+    ordered = np.sort(values)
+    quantiles = np.linspace(0, 1, 21)
+    return {
+        'thresholds': np.asarray(thresholds),
+        'fraction_at_or_below': np.searchsorted(ordered, thresholds, side='right') / max(len(ordered), 1),
+        'quantiles': quantiles,
+        'quantile_values': np.quantile(ordered, quantiles) if len(ordered) else np.full(len(quantiles), np.nan),
+    }
+
+# =============================================================================
+# REPORT
+# =============================================================================
+
+def _fmt(value: float) -> str:
+    return "     N/A" if np.isnan(value) else f"{value:7.3f}s"
+
+def _group_table(title: str, names: np.ndarray, codes: np.ndarray, columns: Dict[str, np.ndarray]) -> List[Dict]:
+    stats = grouped_percentiles(codes, columns['response_time'], len(names))
+    errors = error_rates(codes, columns['failed'], len(names))
+    print(f"{Colors.BOLD}{title}{Colors.NC}")
+    print(f"  {'':44} {'count':>7} {'errors':>7} " + " ".join(f"{'p' + str(p):>8}" for p in PERCENTILES) + f" {'max':>8}")
+    rows = []
+    for i, name in enumerate(names):
+        print(f"  {name[:44]:44} {stats['count'][i]:7d} {errors[i]*100:6.2f}% " +
+              " ".join(_fmt(stats[f'p{p}'][i]) for p in PERCENTILES) + f" {_fmt(stats['max'][i])}")
+        rows.append({'name': str(name), 'count': int(stats['count'][i]), 'error_rate': float(errors[i]),
+                     **{f'p{p}': float(stats[f'p{p}'][i]) for p in PERCENTILES},
+                     'max': float(stats['max'][i])})
+    print()
+    return rows
+
+def report(columns: Dict[str, np.ndarray], bucket_seconds: float, window: int) -> Dict:
+    """Print the full report and return it as JSON-serializable data"""
+    n = len(columns['response_time'])
+    print_header("LATENCY REPORT", Colors.MAGENTA)
+    print(f"Samples: {n}  Runs: {len(columns['run_names'])}  "
+          f"Error Rate: {columns['failed'].mean()*100 if n else 0:.2f}%\n")
+    output = {'samples': n, 'runs': [str(r) for r in columns['run_names']]}
+    if not n:
+        return output
+
+    output['overall'] = _group_table("Overall", np.array(['all requests']), np.zeros(n, dtype=np.int32), columns)[0]
+    output['routes'] = _group_table("By Route", columns['route_names'], columns['route'], columns)
+    if len(columns['category_names']) > 1 or columns['category_names'][0]:
+        output['categories'] = _group_table("By Category", columns['category_names'], columns['category'], columns)
+
+    series = time_series(columns, bucket_seconds, window)
+    if series:
+        print(f"{Colors.BOLD}Time Series ({bucket_seconds:g}s buckets, rolling mean over {window}){Colors.NC}")
+        print(f"  {'bucket start (UTC)':20} {'requests':>8} {'rps':>8} {'errors':>7} {'p95':>8} {'rolling':>8}")
+        for i in np.flatnonzero(series['requests']):
+            stamp = np.datetime64(int(series['bucket_start'][i]), 's')
+            print(f"  {str(stamp):20} {series['requests'][i]:8d} {series['rps'][i]:8.2f} "
+                  f"{series['error_rate'][i]*100:6.2f}% {_fmt(series['p95'][i])} {_fmt(series['rolling_mean'][i])}")
+        print()
+        output['time_series'] = {key: [None if np.isnan(v) else float(v) for v in values.astype(np.float64)]
+                                 for key, values in series.items()}
+    else:
+        print(f"{Colors.YELLOW}No start timestamps in these results; time series skipped{Colors.NC}\n")
+
+    cdf = latency_cdf(columns['response_time'])
+    print(f"{Colors.BOLD}Latency CDF{Colors.NC}")
+    for threshold, fraction in zip(cdf['thresholds'], cdf['fraction_at_or_below']):
+        print(f"  <= {threshold:6.2f}s  {fraction*100:6.2f}%  {'#' * int(fraction * 50)}")
+    print()
+    output['cdf'] = {key: values.tolist() for key, values in cdf.items()}
+    return output
+
+# =============================================================================
+# CITY × CUISINE HEATMAP
+# =============================================================================
+
+SEARCH_ROUTE = '/api/v1/restaurants/search'
+# Iglewicz-Hoaglin cut-off for the robust (median/MAD) z-score
+OUTLIER_Z = 3.5
+# A flagged cell must also differ from the median by both margins; with a
+# tight spread a z-score alone makes a few milliseconds look anomalous
+MIN_EFFECT = 0.25
+MIN_EFFECT_SECONDS = 0.020
+# Cells with fewer samples are shown but never flagged
+MIN_CELL_SAMPLES = 3
+SHADES = ' ░▒▓█'
+
+def _search_cell(endpoint: str):
+    """(city, cuisine) of a city + cuisine search endpoint, else None"""
+    path, _, query = endpoint.partition('?')
+    if path != SEARCH_ROUTE:
+        return None
+    params = parse_qs(query)
+    if 'city' not in params or 'cuisine' not in params:
+        return None
+    return params['city'][0], params['cuisine'][0]
+
+def _ordered_encode(labels: Sequence[str], preferred: Sequence[str]) -> (np.ndarray, np.ndarray):
+    """Like _encode, but keeps the suite's CITIES/CUISINES order first"""
+    seen = set(labels)
+    names = [name for name in preferred if name in seen] + sorted(seen - set(preferred))
+    index = {name: i for i, name in enumerate(names)}
+    return np.array([index[label] for label in labels], dtype=np.int32), np.array(names)
+
+def _search_columns(cells, response_times, result_counts, response_bytes, statuses) -> Dict[str, np.ndarray]:
+    city_codes, city_names = _ordered_encode([city for city, _ in cells], CITIES)
+    cuisine_codes, cuisine_names = _ordered_encode([cuisine for _, cuisine in cells], CUISINES)
+    return {
+        'city': city_codes,
+        'city_names': city_names,
+        'cuisine': cuisine_codes,
+        'cuisine_names': cuisine_names,
+        'response_time': np.asarray(response_times, dtype=np.float64),
+        'result_count': np.asarray([np.nan if c is None else c for c in result_counts], dtype=np.float64),
+        'response_bytes': np.asarray([np.nan if b is None or b < 0 else b for b in response_bytes], dtype=np.float64),
+        'failed': np.asarray(statuses) != 'PASS',
+    }
+
+def load_search_samples(paths: List[str] = None, dataset_dir: str = None) -> Dict[str, np.ndarray]:
+    """City + cuisine search samples from results files or a results_export dataset"""
+    if dataset_dir:
+        from results_export import read_dataset
+        import pyarrow.compute as pc
+        table = read_dataset(dataset_dir)
+        table = table.filter(pc.equal(table.column('route'), SEARCH_ROUTE))
+        tests = table.select(['endpoint', 'response_time', 'result_count', 'response_bytes', 'status']).to_pylist()
+    else:
+        tests = []
+        for path in paths:
+            with open(path) as f:
+                tests.extend(test for test in json.load(f)['tests'] if not test.get('carried_from'))
+    cells, response_times, result_counts, response_bytes, statuses = [], [], [], [], []
+    for test in tests:
+        cell = _search_cell(test['endpoint'])
+        if cell is None:
+            continue
+        cells.append(cell)
+        response_times.append(test['response_time'])
+        result_counts.append(test.get('result_count'))
+        response_bytes.append(test.get('response_bytes'))
+        statuses.append(test['status'])
+    return _search_columns(cells, response_times, result_counts, response_bytes, statuses)
+
+def sample_search(api_base: str, passes: int) -> Dict[str, np.ndarray]:
+    """Walk CITIES × CUISINES passes times, in a new random order each pass"""
+    session = requests.Session()
+    plan = [(city, cuisine) for city in CITIES for cuisine in CUISINES]
+    cells, response_times, result_counts, response_bytes, statuses = [], [], [], [], []
+    for pass_num in range(passes):
+        random.shuffle(plan)
+        print(f"  Pass {pass_num + 1}/{passes}: {len(plan)} searches")
+        for city, cuisine in plan:
+            url = f"{api_base}{SEARCH_ROUTE}?{urlencode({'city': city, 'cuisine': cuisine})}"
+            start_time = time.perf_counter()
+            status_code, body, error = send_request("GET", url, session=session)
+            response_times.append(time.perf_counter() - start_time)
+            data = error if error is not None else decode_body(body)
+            cells.append((city, cuisine))
+            result_counts.append(len(data) if isinstance(data, list) else None)
+            response_bytes.append(len(body))
+            statuses.append('PASS' if status_code == 200 and error is None else 'FAIL')
+    session.close()
+    return _search_columns(cells, response_times, result_counts, response_bytes, statuses)
+
+def robust_z(values: np.ndarray) -> np.ndarray:
+    """Robust z-score (x - median) / (1.4826 * MAD), ignoring NaN cells
+
+    Falls back to the mean absolute deviation when more than half the
+    cells share the median (MAD of 0).
+    """
+    finite = values[np.isfinite(values)]
+    if len(finite) < 3:
+        return np.full(values.shape, np.nan)
+    median = np.median(finite)
+    scale = 1.4826 * np.median(np.abs(finite - median))
+    if scale == 0:
+        scale = 1.2533 * np.mean(np.abs(finite - median))
+    if scale == 0:
+        return np.where(np.isfinite(values), 0.0, np.nan)
+    return (values - median) / scale
+
+def material(values: np.ndarray, min_relative: float, min_absolute: float = 0.0) -> np.ndarray:
+    """True where a value is at least both margins away from the median of the known values"""
+    finite = values[np.isfinite(values)]
+    if not len(finite):
+        return np.zeros(values.shape, dtype=bool)
+    median = np.median(finite)
+    with np.errstate(invalid='ignore'):
+        return np.abs(values - median) >= max(min_relative * median, min_absolute)
+
+def _rank_correlation(x: np.ndarray, y: np.ndarray) -> float:
+    """Spearman rank correlation over cells where both values are known"""
+    both = np.isfinite(x) & np.isfinite(y)
+    if both.sum() < 3:
+        return float('nan')
+    rx = np.argsort(np.argsort(x[both])).astype(np.float64)
+    ry = np.argsort(np.argsort(y[both])).astype(np.float64)
+    if rx.std() == 0 or ry.std() == 0:
+        return float('nan')
+    return float(np.corrcoef(rx, ry)[0, 1])
+
+def heatmap(columns: Dict[str, np.ndarray], pct: float = 95, threshold: float = OUTLIER_Z,
+            min_samples: int = MIN_CELL_SAMPLES) -> Dict:
+    """City × cuisine matrices of latency, result counts and payload size, with outliers
+
+    A cell is an outlier when it has at least min_samples samples, its robust
+    z-score exceeds threshold and it is MIN_EFFECT (and, for latency,
+    MIN_EFFECT_SECONDS) away from the median cell.
+    """
+    n_cities, n_cuisines = len(columns['city_names']), len(columns['cuisine_names'])
+    shape = (n_cities, n_cuisines)
+    cells = columns['city'].astype(np.int64) * n_cuisines + columns['cuisine']
+    n_cells = n_cities * n_cuisines
+    latency = grouped_percentiles(cells, columns['response_time'], n_cells, sorted({50, pct}))
+
+    def cell_median(values: np.ndarray) -> np.ndarray:
+        known = np.isfinite(values)
+        return grouped_percentiles(cells[known], values[known], n_cells, (50,))['p50'].reshape(shape)
+
+    matrix = latency[f'p{pct:g}'].reshape(shape)
+    results = cell_median(columns['result_count'])
+    sizes = cell_median(columns['response_bytes'])
+    counts = latency['count'].reshape(shape)
+    eligible = counts >= min_samples
+    judged = np.where(eligible, matrix, np.nan)
+    latency_z = robust_z(judged)
+    size_z = robust_z(np.where(eligible, sizes, np.nan))
+    # A whole city (or cuisine) being slow shows up in its median across cells
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN rows stay NaN
+        city_latency = np.nanmedian(judged, axis=1)
+        cuisine_latency = np.nanmedian(judged, axis=0)
+    city_z = robust_z(city_latency)
+    cuisine_z = robust_z(cuisine_latency)
+    slow_city = material(city_latency, MIN_EFFECT, MIN_EFFECT_SECONDS)
+    slow_cuisine = material(cuisine_latency, MIN_EFFECT, MIN_EFFECT_SECONDS)
+
+    outliers = []
+    flagged = (np.abs(np.nan_to_num(latency_z)) > threshold) & material(judged, MIN_EFFECT, MIN_EFFECT_SECONDS)
+    for i, j in zip(*np.nonzero(flagged)):
+        outliers.append({'city': str(columns['city_names'][i]), 'cuisine': str(columns['cuisine_names'][j]),
+                         'kind': 'slow' if latency_z[i, j] > 0 else 'fast',
+                         f'p{pct:g}': float(matrix[i, j]), 'z': float(latency_z[i, j]),
+                         'result_count': float(results[i, j]), 'response_bytes': float(sizes[i, j])})
+    large = (np.nan_to_num(size_z) > threshold) & material(np.where(eligible, sizes, np.nan), MIN_EFFECT)
+    for i, j in zip(*np.nonzero(large)):
+        outliers.append({'city': str(columns['city_names'][i]), 'cuisine': str(columns['cuisine_names'][j]),
+                         'kind': 'large payload', 'response_bytes': float(sizes[i, j]), 'z': float(size_z[i, j]),
+                         'result_count': float(results[i, j]), f'p{pct:g}': float(matrix[i, j])})
+    slow_cities = [str(name) for name, z, big in zip(columns['city_names'], city_z, slow_city)
+                   if np.isfinite(z) and z > threshold and big]
+    slow_cuisines = [str(name) for name, z, big in zip(columns['cuisine_names'], cuisine_z, slow_cuisine)
+                     if np.isfinite(z) and z > threshold and big]
+
+    return {
+        'percentile': pct,
+        'threshold': threshold,
+        'min_samples': min_samples,
+        'samples': int(len(cells)),
+        'cities': [str(name) for name in columns['city_names']],
+        'cuisines': [str(name) for name in columns['cuisine_names']],
+        'count': counts,
+        'latency': matrix,
+        'p50': latency['p50'].reshape(shape),
+        'result_count': results,
+        'response_bytes': sizes,
+        'error_rate': error_rates(cells, columns['failed'], n_cells).reshape(shape),
+        'latency_z': latency_z,
+        'city_z': city_z,
+        'cuisine_z': cuisine_z,
+        'outliers': outliers,
+        'slow_cities': slow_cities,
+        'slow_cuisines': slow_cuisines,
+        'latency_vs_size': _rank_correlation(matrix.ravel(), sizes.ravel()),
+        'failed': int(columns['failed'].sum()),
+    }
+
+def _json_ready(value):
+    """Arrays to lists and NaN to None, so the output is strict JSON"""
+    if isinstance(value, np.ndarray):
+        return _json_ready(value.tolist())
+    if isinstance(value, dict):
+        return {key: _json_ready(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_json_ready(item) for item in value]
+    if isinstance(value, (float, np.floating)):
+        return float(value) if np.isfinite(value) else None
+    if isinstance(value, np.integer):
+        return int(value)
+    return value
+
+def _shade(value: float, low: float, high: float) -> str:
+    if not np.isfinite(value):
+        return ' '
+    position = (value - low) / (high - low) if high > low else 0.0
+    return SHADES[min(int(position * len(SHADES)), len(SHADES) - 1)]
+
+def render_ascii(result: Dict):
+    """Print latency and result-count matrices with shading and outlier marks"""
+    pct = f"p{result['percentile']:g}"
+    matrix = result['latency']
+    finite = matrix[np.isfinite(matrix)]
+    low, high = (finite.min(), finite.max()) if len(finite) else (0.0, 0.0)
+    flagged = {(o['city'], o['cuisine']) for o in result['outliers'] if o['kind'] == 'slow'}
+    width = max(max((len(c) for c in result['cuisines']), default=0), 9)
+
+    print(f"{Colors.BOLD}Search {pct} latency (ms) — {result['samples']} samples, "
+          f"shade {SHADES[1:]} low→high, ! = outlier (|z| > {result['threshold']}){Colors.NC}")
+    print(f"  {'':16}" + "".join(f"{c[:width]:>{width + 1}}" for c in result['cuisines']) + f"{'city z':>9}")
+    for i, city in enumerate(result['cities']):
+        row = ""
+        for j, cuisine in enumerate(result['cuisines']):
+            value = matrix[i, j]
+            text = "N/A" if not np.isfinite(value) else f"{value * 1000:.0f}{_shade(value, low, high)}"
+            mark = "!" if (city, cuisine) in flagged else " "
+            cell = f"{text}{mark}".rjust(width + 1)
+            row += f"{Colors.RED}{cell}{Colors.NC}" if mark == "!" else cell
+        city_z = result['city_z'][i]
+        z_text = f"{city_z:+8.1f}" if np.isfinite(city_z) else "     N/A"
+        color = Colors.RED if city in result['slow_cities'] else ""
+        print(f"  {city[:16]:16}{row} {color}{z_text}{Colors.NC if color else ''}")
+    print()
+
+    print(f"{Colors.BOLD}Median result count{Colors.NC}")
+    print(f"  {'':16}" + "".join(f"{c[:width]:>{width + 1}}" for c in result['cuisines']))
+    for i, city in enumerate(result['cities']):
+        print(f"  {city[:16]:16}" + "".join(
+            f"{'N/A' if not np.isfinite(v) else f'{v:.0f}':>{width + 1}}" for v in result['result_count'][i]))
+    print()
+
+    rho = result['latency_vs_size']
+    print(f"Latency vs payload size (Spearman rho over cells): "
+          f"{'N/A' if not np.isfinite(rho) else f'{rho:+.2f}'}")
+    if result['slow_cities']:
+        print(f"{Colors.RED}Slow cities: {', '.join(result['slow_cities'])}{Colors.NC}")
+    if result['slow_cuisines']:
+        print(f"{Colors.RED}Slow cuisines: {', '.join(result['slow_cuisines'])}{Colors.NC}")
+    if result['outliers']:
+        print(f"{Colors.BOLD}Anomalous cells:{Colors.NC}")
+        for o in result['outliers']:
+            print(f"  {Colors.RED}{o['kind']:13}{Colors.NC} {o['city']} × {o['cuisine']}: "
+                  f"{pct} {o[pct]*1000:.0f}ms, {o['response_bytes']:.0f} bytes, "
+                  f"{o['result_count']:.0f} results (z {o['z']:+.1f})")
+    else:
+        print(f"{Colors.GREEN}No anomalous cells{Colors.NC}")
+    unjudged = int(np.sum(result['count'] < result['min_samples']))
+    if unjudged:
+        print(f"{Colors.YELLOW}{unjudged} cells have fewer than {result['min_samples']} samples and were not judged "
+              f"(use --sample or more results files){Colors.NC}")
+    print()
+
+def render_html(result: Dict, path: str):
+    """Write a self-contained HTML heatmap"""
+    pct = f"p{result['percentile']:g}"
+    matrix = result['latency']
+    finite = matrix[np.isfinite(matrix)]
+    low, high = (finite.min(), finite.max()) if len(finite) else (0.0, 0.0)
+    flagged = {(o['city'], o['cuisine']) for o in result['outliers']}
+
+    def cell(i: int, j: int) -> str:
+        value = matrix[i, j]
+        if not np.isfinite(value):
+            return '<td class="empty">N/A</td>'
+        position = (value - low) / (high - low) if high > low else 0.0
+        title = (f"{result['cities'][i]} × {result['cuisines'][j]}: {pct} {value*1000:.0f}ms, "
+                 f"p50 {result['p50'][i, j]*1000:.0f}ms, {result['count'][i, j]} samples, "
+                 f"{result['result_count'][i, j]:.0f} results, {result['response_bytes'][i, j]:.0f} bytes, "
+                 f"z {result['latency_z'][i, j]:+.1f}")
+        outlier = ' class="outlier"' if (result['cities'][i], result['cuisines'][j]) in flagged else ''
+        return (f'<td{outlier} style="background:hsl({120 - 120 * position:.0f},70%,65%)" '
+                f'title="{html.escape(title)}">{value*1000:.0f}<small>{result["result_count"][i, j]:.0f} results'
+                f'</small></td>')
+
+    rows = "\n".join(f"<tr><th>{html.escape(city)}</th>" + "".join(cell(i, j) for j in range(len(result['cuisines'])))
+                     + "</tr>" for i, city in enumerate(result['cities']))
+    outliers = "".join(f"<li><b>{html.escape(o['kind'])}</b> {html.escape(o['city'])} × {html.escape(o['cuisine'])}: "
+                       f"{pct} {o[pct]*1000:.0f}ms, {o['response_bytes']:.0f} bytes (z {o['z']:+.1f})</li>"
+                       for o in result['outliers']) or "<li>None</li>"
+    with open(path, 'w') as f:
+        f.write(f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Search latency heatmap</title>
+<style>
+body {{ font-family: system-ui, sans-serif; margin: 2em; }}
+table {{ border-collapse: collapse; }}
+th, td {{ padding: 6px 10px; text-align: center; border: 1px solid #fff; }}
+td small {{ display: block; font-size: 0.7em; color: #333; }}
+td.outlier {{ outline: 3px solid #b00; outline-offset: -3px; font-weight: bold; }}
+td.empty {{ background: #eee; color: #999; }}
+</style></head><body>
+<h1>City × cuisine search {pct} latency (ms)</h1>
+<p>{result['samples']} samples; green = fastest cell, red = slowest; outlined cells have |robust z| &gt; {result['threshold']}, differ from the median cell by at least {MIN_EFFECT:.0%} and have {result['min_samples']}+ samples.</p>
+<table>
+<tr><th></th>{"".join(f"<th>{html.escape(c)}</th>" for c in result['cuisines'])}</tr>
+{rows}
+</table>
+<h2>Anomalous cells</h2>
+<ul>{outliers}</ul>
+<p>Slow cities: {html.escape(', '.join(result['slow_cities']) or 'none')}.
+Slow cuisines: {html.escape(', '.join(result['slow_cuisines']) or 'none')}.</p>
+</body></html>
+""")
+
+def main(argv: List[str] = None):
+    """Run the report or heatmap command"""
+    parser = argparse.ArgumentParser(description="Vectorized statistics for test results")
+    commands = parser.add_subparsers(dest="command", required=True)
+    report_parser = commands.add_parser("report", help="Grouped percentiles, rates and CDFs")
+    report_parser.add_argument("results_files", nargs="*", help="test_results_*.json files")
+    report_parser.add_argument("--dataset", help="results_export dataset directory")
+    report_parser.add_argument("--bucket", type=float, default=60, help="Time bucket width in seconds (default: 60)")
+    report_parser.add_argument("--window", type=int, default=5, help="Rolling window in buckets (default: 5)")
+    report_parser.add_argument("--json", metavar="FILE", help="Also write the report as JSON")
+    heatmap_parser = commands.add_parser("heatmap", help="City × cuisine search latency heatmap with outliers")
+    heatmap_parser.add_argument("results_files", nargs="*", help="test_results_*.json files")
+    heatmap_parser.add_argument("--dataset", help="results_export dataset directory")
+    heatmap_parser.add_argument("--sample", type=int, metavar="PASSES",
+                                help="Measure live instead: walk every city × cuisine search PASSES times")
+    heatmap_parser.add_argument("--api-base", default=API_BASE, help=f"API base URL for --sample (default: {API_BASE})")
+    heatmap_parser.add_argument("--percentile", type=float, default=95, help="Latency percentile per cell (default: 95)")
+    heatmap_parser.add_argument("--threshold", type=float, default=OUTLIER_Z,
+                                help=f"Robust z-score that marks an outlier (default: {OUTLIER_Z})")
+    heatmap_parser.add_argument("--min-samples", type=int, default=MIN_CELL_SAMPLES,
+                                help=f"Samples a cell needs before it can be flagged (default: {MIN_CELL_SAMPLES})")
+    heatmap_parser.add_argument("--html", metavar="FILE", help="Also write an HTML heatmap")
+    heatmap_parser.add_argument("--json", metavar="FILE", help="Also write the matrices as JSON")
+    args = parser.parse_args(argv)
+
+    sources = sum(bool(source) for source in (args.dataset, args.results_files, getattr(args, 'sample', None)))
+    if sources != 1:
+        parser.error("give one of results files, --dataset or --sample" if args.command == "heatmap"
+                     else "give either results files or --dataset")
+    if args.command == "heatmap":
+        if args.sample:
+            print_header("SAMPLING CITY × CUISINE SEARCH", Colors.CYAN)
+            columns = sample_search(args.api_base.rstrip("/"), args.sample)
+        else:
+            columns = load_search_samples(args.results_files, args.dataset)
+        if not len(columns['response_time']):
+            print(f"{Colors.YELLOW}No city + cuisine search samples found{Colors.NC}")
+            return 1
+        print_header("CITY × CUISINE HEATMAP", Colors.MAGENTA)
+        result = heatmap(columns, args.percentile, args.threshold, args.min_samples)
+        render_ascii(result)
+        if args.html:
+            render_html(result, args.html)
+            print(f"{Colors.GREEN}✅ Heatmap saved to: {args.html}{Colors.NC}")
+        output = _json_ready(result)
+    else:
+        columns = load_dataset(args.dataset) if args.dataset else load_results_files(args.results_files)
+        output = report(columns, args.bucket, args.window)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(output, f, indent=2)
+        print(f"{Colors.GREEN}✅ Report saved to: {args.json}{Colors.NC}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Client-Side Tracing for the AI Food Ordering Test Scripts
+Generates W3C Trace Context (traceparent) headers so a request in
+test_results_*.json can be matched with the Vercel function and MCP server
+logs, and collects client spans in OTLP/JSON form. The exported file uses
+the OTLP trace export layout (resourceSpans -> scopeSpans -> spans), so
+OpenTelemetry Collector file receivers and Jaeger/Tempo importers read it.
+"""
+
+import json
+import os
+import threading
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+# OTLP span kinds and status codes
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_CLIENT = 3
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+def new_trace_id() -> str:
+    return os.urandom(16).hex()
+
+def new_span_id() -> str:
+    return os.urandom(8).hex()
+
+def traceparent(trace_id: str, span_id: str) -> str:
+    """W3C traceparent header value for a sampled span"""
+    return f"00-{trace_id}-{span_id}-01"
+
+def _attribute(key: str, value) -> Dict:
+    """OTLP typed attribute"""
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+class Tracer:
+    """Collects finished spans and writes them as one OTLP/JSON export"""
+
+    def __init__(self, service_name: str):
+        self.service_name = service_name
+        self.enabled = False
+        self.spans = []
+        self._lock = threading.Lock()
+
+    def record(self, name: str, trace_id: str, span_id: str, parent_id: Optional[str],
+               start: float, end: float, attributes: Dict = None,
+               kind: int = SPAN_KIND_INTERNAL, error: bool = False):
+        """Record a finished span; start and end are time.time() seconds"""
+        if not self.enabled:
+            return
+        span = {
+            "traceId": trace_id,
+            "spanId": span_id,
+            "name": name,
+            "kind": kind,
+            "startTimeUnixNano": str(int(start * 1e9)),
+            "endTimeUnixNano": str(int(end * 1e9)),
+            "attributes": [_attribute(key, value) for key, value in (attributes or {}).items()
+                           if value is not None],
+            "status": {"code": STATUS_ERROR if error else STATUS_OK},
+        }
+        if parent_id:
+            span["parentSpanId"] = parent_id
+        with self._lock:
+            self.spans.append(span)
+
+    def export(self, path: str) -> int:
+        """Write all spans to an OTLP/JSON file and return how many were written"""
+        with self._lock:
+            spans = list(self.spans)
+        export = {"resourceSpans": [{
+            "resource": {"attributes": [_attribute("service.name", self.service_name)]},
+            "scopeSpans": [{"scope": {"name": "ai-food-ordering.client"}, "spans": spans}],
+        }]}
+        with open(path, 'w') as f:
+            json.dump(export, f)
+        return len(spans)
+
+def record_http(tracer: Tracer, trace_id: str, span_id: str, parent_id: Optional[str], method: str,
+                url: str, start: float, end: float, status_code: int, elapsed: Optional[float],
+                response_bytes: int, error: bool = False):
+    """Record a client HTTP span, split into send_wait and read when elapsed is known
+
+    requests does not expose connect or send timing separately: elapsed runs
+    from sending the request until the response headers are parsed, so the
+    send_wait child covers connect + send + server wait, and read covers the
+    body download.
+    """
+    attributes = {
+        "http.request.method": method,
+        "url.full": url,
+        "http.response.status_code": status_code,
+        "http.response.body.size": response_bytes,
+    }
+    tracer.record(f"{method} {urlsplit(url).path}", trace_id, span_id, parent_id, start, end,
+                  attributes, kind=SPAN_KIND_CLIENT, error=error or status_code >= 400)
+    if elapsed is not None and start + elapsed <= end:
+        tracer.record("send_wait", trace_id, new_span_id(), span_id, start, start + elapsed)
+        tracer.record("read", trace_id, new_span_id(), span_id, start + elapsed, end)
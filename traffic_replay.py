@@ -0,0 +1,442 @@
+#!/usr/bin/env python3
+"""
+Production Traffic Replay for AI Food Ordering System
+Streams access logs (JSONL or common/combined log format, optionally
+gzipped), maps each line onto an /api/v1/* request and replays it against
+a target base URL, keeping the original inter-arrival times divided by a
+speed-up factor. Lines are read, scheduled and sent one at a time through a
+bounded queue and latencies go into fixed-size histograms, so memory stays
+constant however large the log is.
+
+Only GETs are replayed unless --allow-writes is given; POSTs additionally
+need the request body in the JSONL line ("body").
+
+Usage:
+    python3 traffic_replay.py access.log --api-base http://localhost:8000
+    python3 traffic_replay.py friday.jsonl.gz --speed 3 --start 2026-10-16T18:00 --end 2026-10-16T21:00
+    python3 traffic_replay.py access.log --dry-run                  # traffic mix only, nothing sent
+"""
+
+import argparse
+import gzip
+import json
+import math
+import queue
+import re
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from comprehensive_test_suite import API_BASE, DEFAULT_DEADLINE, RUN_ID, Colors, print_header, route_key, send_request
+from transports import make_client
+
+RESULTS_FILE = f"traffic_replay_{RUN_ID}.json"
+
+# host ident user [10/Oct/2026:13:55:36 +0000] "GET /path HTTP/1.1" status size ...
+CLF_PATTERN = re.compile(r'^\S+ \S+ \S+ \[([^\]]+)\] "(\S+) (\S+)(?: [^"]*)?" (\d{3}|-) (\S+)')
+CLF_TIME_FORMAT = '%d/%b/%Y:%H:%M:%S %z'
+
+# Keys tried, in order, for each field of a JSONL log line
+JSONL_KEYS = {
+    'timestamp': ('timestamp', 'time', 'ts', '@timestamp', 'date'),
+    'method': ('method', 'request_method', 'http_method'),
+    'path': ('path', 'url', 'uri', 'request_uri', 'request_path'),
+}
+
+# Unversioned paths some logs record, mapped onto the /api/v1 routes
+API_PREFIX = '/api/v1'
+UNVERSIONED_ROUTES = ('/cities', '/cuisines', '/restaurants', '/search', '/orders')
+
+# Route templates reported on their own; any other path (ids, scanner noise)
+# shares OTHER_ROUTE so the number of stats rows stays bounded
+KNOWN_ROUTES = frozenset({
+    '/api/v1/cities',
+    '/api/v1/cuisines',
+    '/api/v1/restaurants/search',
+    '/api/v1/restaurants/{id}/menu',
+    '/api/v1/search/intelligent',
+    '/api/v1/orders/create',
+    '/api/v1/orders/{id}',
+})
+OTHER_ROUTE = 'other'
+
+# =============================================================================
+# LOG INGESTION
+# =============================================================================
+
+def open_log(path: str):
+    """Open a log for streaming text reads; '-' is stdin and *.gz is decompressed"""
+    if path == '-':
+        return sys.stdin
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8', errors='replace')
+    return open(path, encoding='utf-8', errors='replace')
+
+def parse_timestamp(value) -> Optional[float]:
+    """Epoch seconds from epoch s/ms numbers, ISO 8601 or CLF time strings"""
+    if isinstance(value, (int, float)):
+        return value / 1000 if value > 1e11 else float(value)
+    if not isinstance(value, str):
+        return None
+    try:
+        return parse_timestamp(float(value))
+    except ValueError:
+        pass
+    for parse in (lambda v: datetime.fromisoformat(v.replace('Z', '+00:00')),
+                  lambda v: datetime.strptime(v, CLF_TIME_FORMAT)):
+        try:
+            parsed = parse(value)
+        except ValueError:
+            continue
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return parsed.timestamp()
+    return None
+
+def api_path(raw: str) -> Optional[str]:
+    """Map a logged URL or path onto an /api/v1/* path (with query), else None"""
+    parts = urlsplit(raw)
+    path = parts.path or '/'
+    if not path.startswith(API_PREFIX + '/'):
+        if not path.startswith(UNVERSIONED_ROUTES):
+            return None
+        path = API_PREFIX + path
+    return f"{path}?{parts.query}" if parts.query else path
+
+def replay_route(path: str) -> str:
+    """Route template to aggregate a replayed path under"""
+    route = route_key(path)
+    return route if route in KNOWN_ROUTES else OTHER_ROUTE
+
+def _first(record: Dict, field: str):
+    for key in JSONL_KEYS[field]:
+        if record.get(key) is not None:
+            return record[key]
+    return None
+
+def parse_line(line: str, fmt: str) -> Tuple[Optional[Dict], str]:
+    """Parse one log line into an event, or (None, skip reason)"""
+    line = line.strip()
+    if not line:
+        return None, 'blank'
+    if fmt == 'auto':
+        fmt = 'jsonl' if line.startswith('{') else 'clf'
+    if fmt == 'jsonl':
+        try:
+            record = json.loads(line)
+        except ValueError:
+            return None, 'unparseable'
+        request = record.get('request') if isinstance(record.get('request'), dict) else record
+        timestamp = parse_timestamp(_first(record, 'timestamp'))
+        method = _first(request, 'method')
+        raw_path = _first(request, 'path')
+        body = request.get('body')
+        if isinstance(body, str):
+            try:
+                body = json.loads(body)
+            except ValueError:
+                body = None
+    else:
+        match = CLF_PATTERN.match(line)
+        if not match:
+            return None, 'unparseable'
+        timestamp = parse_timestamp(match.group(1))
+        method, raw_path, body = match.group(2), match.group(3), None
+    if timestamp is None:
+        return None, 'no timestamp'
+    if not method or not raw_path:
+        return None, 'unparseable'
+    path = api_path(raw_path)
+    if path is None:
+        return None, 'not /api/v1'
+    return {'timestamp': timestamp, 'method': method.upper(), 'path': path, 'body': body}, ''
+
+def read_events(paths: List[str], fmt: str, skipped: Dict[str, int], start: float = None,
+                end: float = None, allow_writes: bool = False) -> Iterator[Dict]:
+    """Stream replayable events from the logs, counting skipped lines by reason"""
+    for path in paths:
+        with open_log(path) as f:
+            for line in f:
+                event, reason = parse_line(line, fmt)
+                if event is not None:
+                    if start is not None and event['timestamp'] < start:
+                        reason = 'outside window'
+                    elif end is not None and event['timestamp'] >= end:
+                        reason = 'outside window'
+                    elif event['method'] not in ('GET', 'POST'):
+                        reason = f"method {event['method']}"
+                    elif event['method'] == 'POST' and not allow_writes:
+                        reason = 'write (use --allow-writes)'
+                    elif event['method'] == 'POST' and event['body'] is None:
+                        reason = 'POST without body'
+                if reason:
+                    skipped[reason] = skipped.get(reason, 0) + 1
+                    continue
+                yield event
+
+# =============================================================================
+# AGGREGATION
+# =============================================================================
+
+class LatencyHistogram:
+    """Log-bucketed latencies (about 2% resolution, 0.1ms to 10min) in constant memory"""
+
+    MIN_VALUE = 1e-4
+    GROWTH = 1.02
+    BUCKETS = int(math.log(600 / MIN_VALUE, GROWTH)) + 2
+
+    def __init__(self):
+        self.counts = [0] * self.BUCKETS
+        self.total = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def add(self, value: float):
+        index = 0 if value <= self.MIN_VALUE else int(math.log(value / self.MIN_VALUE, self.GROWTH)) + 1
+        self.counts[min(index, self.BUCKETS - 1)] += 1
+        self.total += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """Upper edge of the bucket holding the pct-th percentile"""
+        if not self.total:
+            return None
+        rank = math.ceil(self.total * pct / 100) or 1
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(self.MIN_VALUE * self.GROWTH ** index, self.max)
+        return self.max
+
+class ReplayStats:
+    """Per-route outcomes and latency, plus how far dispatch fell behind schedule"""
+
+    OUTCOMES = ('ok', 'client_error', 'server_error', 'timeout', 'error')
+
+    def __init__(self):
+        self.routes = {}
+        self.lag = LatencyHistogram()
+        self._lock = threading.Lock()
+
+    def observe(self, route: str, outcome: str, latency: float):
+        with self._lock:
+            row = self.routes.get(route)
+            if row is None:
+                row = self.routes[route] = {'latency': LatencyHistogram(),
+                                            **{name: 0 for name in self.OUTCOMES}}
+            row[outcome] += 1
+            if outcome in ('ok', 'client_error'):
+                row['latency'].add(latency)
+
+    def observe_lag(self, lag: float):
+        with self._lock:
+            self.lag.add(max(lag, 0.0))
+
+    def get_summary(self) -> Dict:
+        with self._lock:
+            routes = {}
+            for route, row in sorted(self.routes.items(), key=lambda item: -sum(item[1][o] for o in self.OUTCOMES)):
+                histogram = row['latency']
+                routes[route] = {
+                    'requests': sum(row[outcome] for outcome in self.OUTCOMES),
+                    **{outcome: row[outcome] for outcome in self.OUTCOMES},
+                    'p50': histogram.percentile(50),
+                    'p95': histogram.percentile(95),
+                    'p99': histogram.percentile(99),
+                    'max': histogram.max if histogram.total else None,
+                }
+            return {
+                'routes': routes,
+                'schedule_lag': {'p50': self.lag.percentile(50), 'p95': self.lag.percentile(95),
+                                 'p99': self.lag.percentile(99), 'max': self.lag.max if self.lag.total else None},
+            }
+
+# =============================================================================
+# REPLAY
+# =============================================================================
+
+def outcome_for(status_code: int, error: Optional[Dict]) -> str:
+    if error is not None:
+        return 'timeout' if status_code == 504 else 'error'
+    if status_code >= 500:
+        return 'server_error'
+    if status_code >= 400:
+        # Replayed order ids and the like may simply not exist on the target
+        return 'client_error'
+    return 'ok'
+
+def replay(events: Iterator[Dict], api_base: str, speed: float, workers: int, timeout: float,
+           stats: ReplayStats, limit: int = None) -> Dict:
+    """Send events on their original schedule / speed through a bounded worker pool"""
+    client = make_client('http1', workers)
+    work = queue.Queue(maxsize=workers * 4)
+    progress = {'sent': 0, 'first_timestamp': None, 'last_timestamp': None}
+
+    def worker():
+        while True:
+            event = work.get()
+            if event is None:
+                return
+            start_time = time.perf_counter()
+            status_code, _, error = send_request(event['method'], f"{api_base}{event['path']}", event['body'],
+                                                 timeout=timeout, session=client)
+            stats.observe(replay_route(event['path']), outcome_for(status_code, error),
+                          time.perf_counter() - start_time)
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+    wall_start = time.perf_counter()
+    try:
+        for event in events:
+            if progress['first_timestamp'] is None:
+                progress['first_timestamp'] = event['timestamp']
+            # Out-of-order lines go out immediately rather than waiting
+            due = wall_start + max(event['timestamp'] - progress['first_timestamp'], 0.0) / speed
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            # put() blocks when workers fall behind, which shows up as schedule lag
+            work.put(event)
+            stats.observe_lag(time.perf_counter() - due)
+            progress['sent'] += 1
+            progress['last_timestamp'] = event['timestamp']
+            if progress['sent'] % 1000 == 0:
+                print(f"  {progress['sent']} requests replayed "
+                      f"({time.perf_counter() - wall_start:.0f}s, {work.qsize()} queued)")
+            if limit and progress['sent'] >= limit:
+                break
+    except KeyboardInterrupt:
+        print(f"\n{Colors.YELLOW}⚠️  Replay interrupted by user; waiting for queued requests{Colors.NC}")
+    finally:
+        for _ in threads:
+            work.put(None)
+        for thread in threads:
+            thread.join()
+        client.close()
+    progress['wall_time'] = time.perf_counter() - wall_start
+    return progress
+
+def dry_run(events: Iterator[Dict], limit: int = None) -> Dict:
+    """Count the traffic mix and original rate without sending anything"""
+    mix = {}
+    progress = {'sent': 0, 'first_timestamp': None, 'last_timestamp': None}
+    for event in events:
+        if progress['first_timestamp'] is None:
+            progress['first_timestamp'] = event['timestamp']
+        progress['last_timestamp'] = event['timestamp']
+        key = f"{event['method']} {replay_route(event['path'])}"
+        mix[key] = mix.get(key, 0) + 1
+        progress['sent'] += 1
+        if limit and progress['sent'] >= limit:
+            break
+    progress['mix'] = dict(sorted(mix.items(), key=lambda item: -item[1]))
+    return progress
+
+def _seconds(value) -> str:
+    return f"{value:.3f}s" if value is not None else "N/A"
+
+def print_report(progress: Dict, summary: Dict, skipped: Dict[str, int], speed: float):
+    print_header("TRAFFIC REPLAY REPORT", Colors.MAGENTA)
+    span = (progress['last_timestamp'] or 0) - (progress['first_timestamp'] or 0)
+    print(f"Requests: {progress['sent']} covering {span:.0f}s of logged traffic")
+    if span > 0:
+        print(f"Original rate: {progress['sent'] / span:.1f} req/s -> target at {speed:g}x: "
+              f"{progress['sent'] / span * speed:.1f} req/s")
+    if progress.get('wall_time'):
+        print(f"Achieved rate: {progress['sent'] / progress['wall_time']:.1f} req/s "
+              f"over {progress['wall_time']:.1f}s")
+    if skipped:
+        print(f"Skipped lines: " + ", ".join(f"{reason} {count}" for reason, count in
+                                             sorted(skipped.items(), key=lambda item: -item[1])))
+    if 'mix' in progress:
+        print(f"\n{Colors.BOLD}Traffic mix:{Colors.NC}")
+        for key, count in progress['mix'].items():
+            print(f"  {count:>8}  {key}")
+        return
+    lag = summary['schedule_lag']
+    color = Colors.YELLOW if (lag['p95'] or 0) > 1.0 else ""
+    print(f"{color}Schedule lag: p50 {_seconds(lag['p50'])}, p95 {_seconds(lag['p95'])}, "
+          f"max {_seconds(lag['max'])}{Colors.NC if color else ''}")
+    if color:
+        print(f"{Colors.YELLOW}⚠️  Dispatch fell behind the log's timing; raise --workers or lower --speed{Colors.NC}")
+    print(f"\n  {'route':34} {'requests':>8} {'4xx':>6} {'5xx':>6} {'timeout':>7} {'error':>6} "
+          f"{'p50':>8} {'p95':>8} {'p99':>8}")
+    for route, row in summary['routes'].items():
+        failed = row['server_error'] + row['timeout'] + row['error']
+        color = Colors.RED if failed else ""
+        print(f"  {color}{route[:34]:34}{Colors.NC if color else ''} {row['requests']:>8} {row['client_error']:>6} "
+              f"{row['server_error']:>6} {row['timeout']:>7} {row['error']:>6} "
+              f"{_seconds(row['p50']):>8} {_seconds(row['p95']):>8} {_seconds(row['p99']):>8}")
+
+def _time_arg(value: str) -> float:
+    timestamp = parse_timestamp(value)
+    if timestamp is None:
+        raise argparse.ArgumentTypeError(f"not a timestamp: {value}")
+    return timestamp
+
+def main(argv: List[str] = None):
+    """Replay access logs against the target API"""
+    parser = argparse.ArgumentParser(description="Replay production access logs with their original timing")
+    parser.add_argument("logs", nargs="+", help="Access log files (JSONL or common log format, .gz ok, - for stdin)")
+    parser.add_argument("--format", choices=("auto", "jsonl", "clf"), default="auto",
+                        help="Log format (default: auto, per line)")
+    parser.add_argument("--api-base", default=API_BASE, help=f"Target base URL (default: {API_BASE})")
+    parser.add_argument("--speed", type=float, default=1.0, help="Speed-up factor for inter-arrival times (default: 1)")
+    parser.add_argument("--start", type=_time_arg, help="Replay only lines at or after this time (ISO 8601 or epoch)")
+    parser.add_argument("--end", type=_time_arg, help="Replay only lines before this time")
+    parser.add_argument("--limit", type=int, help="Stop after this many requests")
+    parser.add_argument("--workers", type=int, default=32, help="Concurrent requests in flight (default: 32)")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_DEADLINE,
+                        help=f"Per-request timeout (default: {DEFAULT_DEADLINE})")
+    parser.add_argument("--allow-writes", action="store_true",
+                        help="Also replay POSTs that have a logged body (creates orders on the target)")
+    parser.add_argument("--dry-run", action="store_true", help="Parse the logs and print the traffic mix only")
+    args = parser.parse_args(argv)
+    if args.speed <= 0:
+        parser.error("--speed must be positive")
+
+    api_base = args.api_base.rstrip("/")
+    skipped = {}
+    events = read_events(args.logs, args.format, skipped, args.start, args.end, args.allow_writes)
+
+    print(f"{Colors.BOLD}{Colors.MAGENTA}")
+    print("=" * 70)
+    print("AI FOOD ORDERING - TRAFFIC REPLAY".center(70))
+    print("=" * 70)
+    print(f"{Colors.NC}")
+    print(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"Logs: {', '.join(args.logs)}")
+    if not args.dry_run:
+        print(f"Target: {api_base} at {args.speed:g}x, {args.workers} workers")
+
+    stats = ReplayStats()
+    progress = None
+    try:
+        if args.dry_run:
+            progress = dry_run(events, args.limit)
+        else:
+            progress = replay(events, api_base, args.speed, args.workers, args.timeout, stats, args.limit)
+    except KeyboardInterrupt:
+        print(f"\n{Colors.YELLOW}⚠️  Replay interrupted by user{Colors.NC}")
+    if progress is None:
+        return 2
+
+    summary = stats.get_summary()
+    print_report(progress, summary, skipped, args.speed)
+    if args.dry_run:
+        return 0
+    with open(RESULTS_FILE, 'w') as f:
+        json.dump({"api_base": api_base, "logs": args.logs, "speed": args.speed, "workers": args.workers,
+                   "progress": progress, "skipped": skipped, **summary}, f, indent=2)
+    print(f"\n{Colors.GREEN}✅ Results saved to: {RESULTS_FILE}{Colors.NC}\n")
+    failed = sum(row['server_error'] + row['timeout'] + row['error'] for row in summary['routes'].values())
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
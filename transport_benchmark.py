@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+HTTP/1.1 vs HTTP/2 Transport Benchmark for AI Food Ordering System
+Runs the suite's read-only request plan concurrently over each transport
+(a pooled requests.Session for HTTP/1.1, a multiplexed httpx client for
+HTTP/2), alternating the order each round, and reports latency,
+throughput, connections opened and the protocol actually negotiated.
+
+Usage:
+    python3 transport_benchmark.py                          # both transports, 3 rounds
+    python3 transport_benchmark.py --concurrency 64 --rounds 5 --repeat 2
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+from comprehensive_test_suite import (API_BASE, DEFAULT_DEADLINE, RUN_ID, Colors, build_request_plan,
+                                      percentile, print_header)
+from transports import TIMEOUT_ERRORS, TRANSPORTS, ProtocolStats, make_client
+
+RESULTS_FILE = f"transport_benchmark_{RUN_ID}.json"
+
+def timed_get(client, url: str, timeout: float, stats: ProtocolStats) -> Tuple[float, str, int]:
+    """GET url; return (latency, outcome, response bytes) where outcome is ok/http_error/timeout/error"""
+    start_time = time.perf_counter()
+    try:
+        response = client.get(url, timeout=timeout)
+        body = response.content
+        stats.observe(response)
+        outcome = "ok" if response.status_code == 200 else "http_error"
+        return time.perf_counter() - start_time, outcome, len(body)
+    except TIMEOUT_ERRORS:
+        return time.perf_counter() - start_time, "timeout", 0
+    except Exception:
+        return time.perf_counter() - start_time, "error", 0
+
+def run_transport(transport: str, api_base: str, plan: List[Tuple[str, str]], concurrency: int,
+                  pool_size: int, timeout: float) -> Dict:
+    """Run the whole plan once over a fresh client, so connection setup is part of the cost"""
+    client = make_client(transport, pool_size)
+    stats = ProtocolStats()
+    start_time = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            samples = list(pool.map(lambda step: timed_get(client, f"{api_base}{step[1]}", timeout, stats), plan))
+        wall_time = time.perf_counter() - start_time
+        protocol = stats.get_summary(client)
+    finally:
+        client.close()
+    outcomes = {}
+    for _, outcome, _ in samples:
+        outcomes[outcome] = outcomes.get(outcome, 0) + 1
+    return {
+        "latencies": [latency for latency, outcome, _ in samples if outcome == "ok"],
+        "outcomes": outcomes,
+        "bytes": sum(size for _, _, size in samples),
+        "wall_time": wall_time,
+        "protocol": protocol,
+    }
+
+def summarize(runs: Dict[str, List[Dict]]) -> Dict[str, Dict]:
+    """Pool every round per transport"""
+    summary = {}
+    for transport, transport_runs in runs.items():
+        latencies = [latency for run in transport_runs for latency in run["latencies"]]
+        requests_sent = sum(sum(run["outcomes"].values()) for run in transport_runs)
+        wall_time = sum(run["wall_time"] for run in transport_runs)
+        versions = {}
+        for run in transport_runs:
+            for version, count in run["protocol"]["http_versions"].items():
+                versions[version] = versions.get(version, 0) + count
+        connections = [run["protocol"]["connections"] for run in transport_runs
+                       if run["protocol"]["connections"] is not None]
+        summary[transport] = {
+            "rounds": len(transport_runs),
+            "requests": requests_sent,
+            "errors": requests_sent - len(latencies),
+            "p50": percentile(latencies, 50),
+            "p95": percentile(latencies, 95),
+            "p99": percentile(latencies, 99),
+            "throughput_rps": requests_sent / wall_time if wall_time else 0.0,
+            "avg_wall_time": wall_time / len(transport_runs),
+            "http_versions": versions,
+            "avg_connections": sum(connections) / len(connections) if connections else None,
+        }
+    return summary
+
+def _seconds(value) -> str:
+    return f"{value:.3f}s" if value is not None else "N/A"
+
+def print_report(summary: Dict[str, Dict]):
+    print_header("TRANSPORT A/B REPORT", Colors.MAGENTA)
+    print(f"  {'transport':10} {'protocols':24} {'conns':>6} {'p50':>8} {'p95':>8} {'p99':>8} {'req/s':>8} {'errors':>7}")
+    for transport, row in summary.items():
+        versions = ", ".join(f"{version} x{count}" for version, count in row["http_versions"].items()) or "none"
+        conns = f"{row['avg_connections']:.1f}" if row["avg_connections"] is not None else "N/A"
+        print(f"  {transport:10} {versions[:24]:24} {conns:>6} {_seconds(row['p50']):>8} {_seconds(row['p95']):>8} "
+              f"{_seconds(row['p99']):>8} {row['throughput_rps']:>8.1f} {row['errors']:>7}")
+    if "http1" in summary and "http2" in summary:
+        h1, h2 = summary["http1"], summary["http2"]
+        print(f"\n  http2 vs http1:")
+        for key in ("p50", "p95", "p99"):
+            if h1[key] and h2[key] is not None:
+                print(f"    {key}: {(h2[key] - h1[key]) / h1[key] * 100:+.1f}%")
+        if h1["throughput_rps"]:
+            print(f"    throughput: {(h2['throughput_rps'] - h1['throughput_rps']) / h1['throughput_rps'] * 100:+.1f}%")
+        if "HTTP/2" not in h2["http_versions"]:
+            print(f"  {Colors.YELLOW}⚠️  HTTP/2 was not negotiated (plain http or no ALPN); "
+                  f"both runs used HTTP/1.1{Colors.NC}")
+
+def main(argv: List[str] = None):
+    """Compare HTTP/1.1 and HTTP/2 transports on the same request plan"""
+    parser = argparse.ArgumentParser(description="A/B benchmark of the HTTP/1.1 and HTTP/2 transports")
+    parser.add_argument("--api-base", default=API_BASE, help=f"API base URL (default: {API_BASE})")
+    parser.add_argument("--transports", default=",".join(TRANSPORTS),
+                        help=f"Comma-separated transports to compare (default: {','.join(TRANSPORTS)})")
+    parser.add_argument("--rounds", type=int, default=3, help="Runs of the plan per transport (default: 3)")
+    parser.add_argument("--repeat", type=int, default=1, help="Copies of the request plan per run (default: 1)")
+    parser.add_argument("--concurrency", type=int, default=32, help="Concurrent requests (default: 32)")
+    parser.add_argument("--pool-size", type=int, default=32, help="HTTP/1.1 pool size (default: 32)")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_DEADLINE,
+                        help=f"Per-request timeout (default: {DEFAULT_DEADLINE})")
+    args = parser.parse_args(argv)
+
+    api_base = args.api_base.rstrip("/")
+    transports = []
+    for transport in args.transports.split(","):
+        try:
+            make_client(transport).close()
+            transports.append(transport)
+        except (ImportError, ValueError) as e:
+            print(f"{Colors.YELLOW}⚠️  Skipping {transport}: {e}{Colors.NC}")
+    if not transports:
+        return 1
+    plan = build_request_plan() * args.repeat
+
+    print(f"{Colors.BOLD}{Colors.MAGENTA}")
+    print("=" * 70)
+    print("AI FOOD ORDERING - TRANSPORT A/B BENCHMARK".center(70))
+    print("=" * 70)
+    print(f"{Colors.NC}")
+    print(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"API Base: {api_base}")
+    print(f"Plan: {len(plan)} requests x {args.rounds} rounds, concurrency {args.concurrency}")
+
+    runs = {transport: [] for transport in transports}
+    try:
+        for round_num in range(args.rounds):
+            # Alternate which transport goes first so drift does not favour either
+            order = list(transports)
+            random.shuffle(order)
+            for transport in order:
+                run = run_transport(transport, api_base, plan, args.concurrency, args.pool_size, args.timeout)
+                runs[transport].append(run)
+                print(f"  Round {round_num + 1} {transport:6}: {run['wall_time']:.2f}s, "
+                      f"{run['protocol']['http_versions']}, {run['protocol']['connections']} connections, "
+                      f"outcomes {run['outcomes']}")
+    except KeyboardInterrupt:
+        print(f"\n{Colors.YELLOW}⚠️  Benchmark interrupted by user{Colors.NC}")
+        if not any(runs.values()):
+            return 2
+
+    summary = summarize({transport: transport_runs for transport, transport_runs in runs.items() if transport_runs})
+    print_report(summary)
+    with open(RESULTS_FILE, 'w') as f:
+        json.dump({"api_base": api_base, "plan_size": len(plan), "concurrency": args.concurrency,
+                   "summary": summary, "runs": runs}, f, indent=2)
+    print(f"\n{Colors.GREEN}✅ Results saved to: {RESULTS_FILE}{Colors.NC}\n")
+    return 1 if any(row["errors"] for row in summary.values()) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+HTTP Transports for the AI Food Ordering Test Scripts
+http1: a pooled requests.Session (HTTP/1.1, one request per connection at a time)
+http2: an httpx.Client with HTTP/2 enabled, multiplexing concurrent requests
+       as streams over a few connections (pip install 'httpx[http2]')
+
+Both clients expose get/post(url, json=..., headers=..., timeout=...) and
+responses with status_code, content and elapsed, so send_request() can use
+either one. HTTP/2 is negotiated with ALPN, so plain-http targets such as
+the local mock fall back to HTTP/1.1; ProtocolStats shows what was used.
+"""
+
+import threading
+import time
+from typing import Dict, Tuple
+
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+TRANSPORTS = ('http1', 'http2')
+
+# Exceptions send_request() reports as timeouts, whichever client raised them
+TIMEOUT_ERRORS = (requests.exceptions.Timeout,) + ((httpx.TimeoutException,) if httpx else ())
+
+BODY_CHUNK = 64 * 1024
+
+class DeadlineExceeded(Exception):
+    """The request's total time budget ran out"""
+
+def make_client(transport: str, pool_size: int = 10):
+    """Build a pooled client for 'http1' or 'http2'"""
+    if transport == 'http1':
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+    if transport == 'http2':
+        if httpx is None:
+            raise ImportError("The http2 transport needs httpx with HTTP/2 support (pip install 'httpx[http2]')")
+        # A few connections are enough: each carries many concurrent streams
+        limits = httpx.Limits(max_connections=max(pool_size // 8, 2),
+                              max_keepalive_connections=max(pool_size // 8, 2))
+        return httpx.Client(http2=True, limits=limits)
+    raise ValueError(f"Unknown transport: {transport}")
+
+def fetch(client, method: str, url: str, json: Dict = None, headers: Dict = None,
+          budget: float = 120) -> Tuple[object, bytes]:
+    """Send a request and read its whole body within budget seconds of wall time
+
+    Client timeouts only bound connecting and each gap between bytes, so a
+    slowly streamed body could run far past them. The body is read one
+    socket read at a time on the calling thread, each limited to what is
+    left of the budget. Raises DeadlineExceeded when it runs out.
+    """
+    deadline = time.perf_counter() + budget
+    if httpx is not None and isinstance(client, httpx.Client):
+        with client.stream(method, url, json=json, headers=headers, timeout=budget) as response:
+            chunks = []
+            for chunk in response.iter_bytes():
+                if time.perf_counter() >= deadline:
+                    raise DeadlineExceeded()
+                chunks.append(chunk)
+        return response, b"".join(chunks)
+
+    # total= caps connect plus the wait for the response head
+    response = client.request(method, url, json=json, headers=headers, stream=True,
+                              timeout=urllib3.Timeout(total=budget))
+    sock = getattr(getattr(response.raw, 'connection', None), 'sock', None)
+    chunks = []
+    try:
+        while True:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                raise DeadlineExceeded()
+            if sock is not None:
+                sock.settimeout(remaining)
+            try:
+                chunk = response.raw.read1(BODY_CHUNK, decode_content=True)
+            except Exception:
+                if time.perf_counter() >= deadline:
+                    raise DeadlineExceeded()
+                raise
+            if not chunk:
+                break
+            chunks.append(chunk)
+    except BaseException:
+        # Drop the half-read connection instead of returning it to the pool
+        response.close()
+        raise
+    response.raw.release_conn()
+    return response, b"".join(chunks)
+
+def http_version(response) -> str:
+    """Protocol a response was received over, e.g. 'HTTP/1.1' or 'HTTP/2'"""
+    if httpx is not None and isinstance(response, httpx.Response):
+        return response.http_version
+    version = getattr(getattr(response, 'raw', None), 'version', None)
+    return {10: 'HTTP/1.0', 11: 'HTTP/1.1', 20: 'HTTP/2'}.get(version, 'unknown')
+
+class ProtocolStats:
+    """Counts responses per protocol version and the connections they arrived on"""
+
+    def __init__(self):
+        self.versions = {}
+        self._streams = set()  # httpx network streams seen (one per connection)
+        self._lock = threading.Lock()
+
+    def observe(self, response):
+        version = http_version(response)
+        stream = getattr(response, 'extensions', {}).get('network_stream')
+        with self._lock:
+            self.versions[version] = self.versions.get(version, 0) + 1
+            if stream is not None:
+                self._streams.add(stream)
+
+    def get_summary(self, client) -> Dict:
+        """Protocol counts plus the number of connections the client opened"""
+        connections = None
+        if isinstance(client, requests.Session):
+            connections = 0
+            # The same adapter is usually mounted for both http:// and https://
+            adapters = {id(adapter): adapter for adapter in client.adapters.values()}
+            for adapter in adapters.values():
+                manager = adapter.poolmanager
+                for key in manager.pools.keys():
+                    connections += manager.pools[key].num_connections
+        elif self._streams:
+            connections = len(self._streams)
+        with self._lock:
+            requests_seen = sum(self.versions.values())
+            return {
+                'requests': requests_seen,
+                'http_versions': dict(self.versions),
+                'connections': connections,
+                'requests_per_connection': round(requests_seen / connections, 1) if connections else None,
+            }